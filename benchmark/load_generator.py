@@ -0,0 +1,373 @@
+"""
+Closed-loop load generator and latency harness for the scoring path.
+
+Each of --concurrency workers sends a request, waits for the answer and sends the
+next one. With --rate the workers instead take request slots from one shared
+schedule (rate requests/sec), and latency is measured from the scheduled time, so
+a stalled server shows up as queueing delay instead of silently lowering the load.
+
+Targets:
+    inprocess  ScoringModel.predict on a DataFrame, as the scoring server's micro-batcher calls it:
+               batches of at most --compiled-max-rows rows use the compiled ensemble exported
+               beside the model, if any (--compiled-max-rows 0 measures sklearn alone)
+    http       POST /predict of a running scoring server, JSON or the binary columnar body
+
+Batch sizes follow --batch-size: "fixed:N", "uniform:LOW:HIGH", "choice:1,8,64" or
+"lognormal:MEDIAN:SIGMA". Latency goes into a fixed-memory histogram (2% buckets),
+RSS of this process (and of --server-pid) is sampled throughout, and the report
+holds throughput, p50/p95/p99/max, the latency distribution, a per-interval
+timeline and the RSS growth rate.
+
+    python -m benchmark.load_generator --target inprocess --concurrency 4 --batch-size choice:1,16,256
+    python -m benchmark.load_generator --target inprocess --compiled-max-rows 0 --output sklearn.json
+    python -m benchmark.load_generator --target inprocess --compare sklearn.json
+    python -m benchmark.load_generator --target http --url http://127.0.0.1:8080/predict --binary --rate 500
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import http.client
+from urllib.parse import urlparse
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from networksecurity.constants.training_pipeline import (
+    TARGET_COLUMN,
+    DATA_INGESTION_SOURCE_PATH,
+    MODEL_TRAINER_COMPILED_MODEL_NAME,
+    SCORING_SERVER_COMPILED_MODEL_MAX_ROWS
+)
+from networksecurity.entity.config_entity import TrainingPipelineConfigEntity, PredictionPipelineConfigEntity
+from networksecurity.pipeline.scoring_server import (
+    LatencyHistogram,
+    ScoringModel,
+    BINARY_HEADER,
+    BINARY_CONTENT_TYPE
+)
+from networksecurity.utils.model_metric.compiled_ensemble import CompiledEnsemble
+from networksecurity.utils.main_utils import read_dataframe, load_obj
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+def read_rss_mb(pid: int = None) -> float:
+    """Resident set size of a process (this one by default) from /proc/<pid>/statm."""
+    try:
+        with open(f"/proc/{pid or 'self'}/statm") as file:
+            return int(file.read().split()[1]) * _PAGE_SIZE / 2 ** 20
+    except (OSError, ValueError, IndexError):
+        return float("nan")
+
+
+def batch_size_sampler(spec: str):
+    """Returns f(rng) -> batch size for a --batch-size spec."""
+    kind, _, params = spec.partition(":")
+    if kind == "fixed":
+        size = int(params)
+        return lambda rng: size
+    if kind == "uniform":
+        low, high = (int(value) for value in params.split(":"))
+        return lambda rng: int(rng.integers(low, high + 1))
+    if kind == "choice":
+        sizes = [int(value) for value in params.split(",")]
+        return lambda rng: sizes[rng.integers(len(sizes))]
+    if kind == "lognormal":
+        median, sigma = (float(value) for value in params.split(":"))
+        return lambda rng: max(1, int(round(rng.lognormal(np.log(median), sigma))))
+    raise ValueError(f"Unknown batch size distribution '{spec}'")
+
+
+class InProcessTarget:
+    """Calls ScoringModel.predict the way the scoring server's micro-batcher does."""
+
+    def __init__(self, scoring_model: ScoringModel, feature_columns: list):
+        self.scoring_model = scoring_model
+        self.feature_columns = feature_columns
+
+    def send(self, features: np.ndarray) -> None:
+        self.scoring_model.predict(pd.DataFrame(features, columns=self.feature_columns))
+
+
+class HttpTarget:
+    """POSTs to a scoring endpoint over one keep-alive connection per worker thread."""
+
+    def __init__(self, url: str, binary: bool = False, timeout: float = 30.0):
+        parsed = urlparse(url)
+        self.host, self.port, self.path = parsed.hostname, parsed.port or 80, parsed.path or "/predict"
+        self.binary = binary
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self) -> http.client.HTTPConnection:
+        if getattr(self._local, "connection", None) is None:
+            self._local.connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        return self._local.connection
+
+    def send(self, features: np.ndarray) -> None:
+        if self.binary:
+            columns = np.ascontiguousarray(features.T, dtype=np.int8)
+            body = BINARY_HEADER.pack(len(features), features.shape[1]) + columns.tobytes()
+            headers = {"Content-Type": BINARY_CONTENT_TYPE}
+        else:
+            body = json.dumps({"instances": features.tolist()}).encode("utf-8")
+            headers = {"Content-Type": "application/json"}
+        connection = self._connection()
+        try:
+            connection.request("POST", self.path, body=body, headers=headers)
+            response = connection.getresponse()
+            response.read()
+        except (http.client.HTTPException, OSError):
+            # The next request reconnects
+            connection.close()
+            self._local.connection = None
+            raise
+        if response.status != 200:
+            raise RuntimeError(f"HTTP {response.status}")
+
+
+class LoadGenerator:
+    def __init__(self, target, features: np.ndarray, concurrency: int, batch_size_spec: str, rate: float = 0.0,
+                 duration_seconds: float = 30.0, warmup_seconds: float = 2.0, interval_seconds: float = 1.0,
+                 server_pid: int = None, seed: int = 42):
+        self.target = target
+        self.features = features
+        self.concurrency = concurrency
+        self.batch_size_spec = batch_size_spec
+        self.sample_batch_size = batch_size_sampler(batch_size_spec)
+        self.rate = rate
+        self.duration_seconds = duration_seconds
+        self.warmup_seconds = warmup_seconds
+        self.interval_seconds = interval_seconds
+        self.server_pid = server_pid
+        self.seed = seed
+
+        self.latency_histogram = LatencyHistogram(growth=1.02)
+        self._interval_histogram = LatencyHistogram(growth=1.02)
+        self._lock = threading.Lock()
+        self._requests = self._rows = self._errors = 0
+        self._error_types = {}
+        self._next_slot = 0
+        self._measuring = False
+        self._stop_event = threading.Event()
+
+    def _take_slot(self, start_time: float) -> float:
+        with self._lock:
+            slot = self._next_slot
+            self._next_slot += 1
+        return start_time + slot / self.rate
+
+    def _worker(self, worker_index: int, start_time: float) -> None:
+        rng = np.random.default_rng(self.seed + worker_index)
+        n_pool = len(self.features)
+        while not self._stop_event.is_set():
+            batch_size = min(self.sample_batch_size(rng), n_pool)
+            offset = int(rng.integers(0, n_pool - batch_size + 1))
+            batch = self.features[offset:offset + batch_size]
+            if self.rate > 0:
+                scheduled_time = self._take_slot(start_time)
+                delay = scheduled_time - time.perf_counter()
+                if delay > 0 and self._stop_event.wait(delay):
+                    return
+            else:
+                scheduled_time = time.perf_counter()
+            try:
+                self.target.send(batch)
+                failed = None
+            except Exception as e:
+                failed = type(e).__name__
+            latency = time.perf_counter() - scheduled_time
+            if not self._measuring:
+                continue
+            with self._lock:
+                if failed is None:
+                    self._requests += 1
+                    self._rows += batch_size
+                else:
+                    self._errors += 1
+                    self._error_types[failed] = self._error_types.get(failed, 0) + 1
+            if failed is None:
+                self.latency_histogram.record(latency)
+                self._interval_histogram.record(latency)
+
+    @staticmethod
+    def _rss_growth_mb_per_minute(samples: list) -> float:
+        if len(samples) < 2:
+            return 0.0
+        elapsed = np.array([sample[0] for sample in samples])
+        rss = np.array([sample[1] for sample in samples])
+        return float(np.polyfit(elapsed, rss, 1)[0] * 60.0)
+
+    def run(self) -> dict:
+        start_time = time.perf_counter()
+        workers = [threading.Thread(target=self._worker, args=(index, start_time), name=f"load-{index}", daemon=True)
+                   for index in range(self.concurrency)]
+        for worker in workers:
+            worker.start()
+
+        # Warm-up traffic (caches, lazy imports, connection setup) is not measured
+        time.sleep(self.warmup_seconds)
+        self.latency_histogram = LatencyHistogram(growth=1.02)
+        self._interval_histogram = LatencyHistogram(growth=1.02)
+        self._measuring = True
+        measure_start = time.perf_counter()
+        timeline, rss_samples, server_rss_samples = [], [], []
+        last_requests = last_rows = 0
+        while True:
+            remaining = measure_start + self.duration_seconds - time.perf_counter()
+            if remaining <= 0:
+                break
+            time.sleep(min(self.interval_seconds, remaining))
+            elapsed = time.perf_counter() - measure_start
+            with self._lock:
+                requests, rows = self._requests, self._rows
+                interval_histogram, self._interval_histogram = self._interval_histogram, LatencyHistogram(growth=1.02)
+            rss_samples.append((elapsed, read_rss_mb()))
+            if self.server_pid:
+                server_rss_samples.append((elapsed, read_rss_mb(self.server_pid)))
+            timeline.append({
+                "elapsed_seconds": round(elapsed, 3),
+                "requests_per_second": (requests - last_requests) / self.interval_seconds,
+                "rows_per_second": (rows - last_rows) / self.interval_seconds,
+                "p99_ms": interval_histogram.percentile(0.99) * 1000.0,
+                "rss_mb": rss_samples[-1][1],
+            })
+            last_requests, last_rows = requests, rows
+
+        self._stop_event.set()
+        for worker in workers:
+            worker.join()
+        measured_seconds = time.perf_counter() - measure_start
+
+        report = {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "target": type(self.target).__name__,
+            "concurrency": self.concurrency,
+            "batch_size": self.batch_size_spec,
+            "rate": self.rate or None,
+            "duration_seconds": round(measured_seconds, 3),
+            "requests": self._requests,
+            "rows": self._rows,
+            "errors": self._errors,
+            "error_types": self._error_types,
+            "requests_per_second": self._requests / measured_seconds,
+            "rows_per_second": self._rows / measured_seconds,
+            "latency_ms": {
+                "p50": self.latency_histogram.percentile(0.50) * 1000.0,
+                "p95": self.latency_histogram.percentile(0.95) * 1000.0,
+                "p99": self.latency_histogram.percentile(0.99) * 1000.0,
+                "max": self.latency_histogram.summary()["max_ms"],
+            },
+            "latency_distribution_ms": self.latency_histogram.distribution(),
+            "model_routing": (self.target.scoring_model.summary()
+                              if isinstance(self.target, InProcessTarget) else None),
+            "memory": {
+                "rss_start_mb": rss_samples[0][1] if rss_samples else None,
+                "rss_end_mb": rss_samples[-1][1] if rss_samples else None,
+                "rss_max_mb": max(sample[1] for sample in rss_samples) if rss_samples else None,
+                "rss_growth_mb_per_minute": self._rss_growth_mb_per_minute(rss_samples),
+            },
+            "timeline": timeline,
+        }
+        if self.server_pid:
+            report["server_memory"] = {
+                "rss_start_mb": server_rss_samples[0][1] if server_rss_samples else None,
+                "rss_end_mb": server_rss_samples[-1][1] if server_rss_samples else None,
+                "rss_growth_mb_per_minute": self._rss_growth_mb_per_minute(server_rss_samples),
+            }
+        return report
+
+
+def print_report(report: dict, previous: dict = None) -> None:
+    latency = report["latency_ms"]
+    print(f"{report['target']} x{report['concurrency']} batch={report['batch_size']} rate={report['rate']}: "
+          f"{report['requests_per_second']:,.0f} req/s, {report['rows_per_second']:,.0f} rows/s, "
+          f"{report['errors']} errors")
+    print(f"latency ms  p50 {latency['p50']:.3f}  p95 {latency['p95']:.3f}  p99 {latency['p99']:.3f}  "
+          f"max {latency['max']:.3f}")
+    print(f"RSS {report['memory']['rss_start_mb']:.0f} -> {report['memory']['rss_end_mb']:.0f} MB "
+          f"({report['memory']['rss_growth_mb_per_minute']:+.2f} MB/min)")
+    if report.get("model_routing"):
+        routing = report["model_routing"]
+        print(f"model routing (compiled up to {routing['compiled_model_max_rows']} rows): "
+              f"{routing['batches']['compiled']} compiled, {routing['batches']['sklearn']} sklearn batches")
+    if previous is not None:
+        # Ratios below 1 are improvements for latency, above 1 for throughput
+        changes = {f"{name} latency": latency[name] / max(previous["latency_ms"][name], 1e-9)
+                   for name in ("p50", "p95", "p99", "max")}
+        changes["throughput"] = report["requests_per_second"] / max(previous["requests_per_second"], 1e-9)
+        print("vs previous: " + ", ".join(f"{name} {ratio:.2f}x" for name, ratio in changes.items()))
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Closed-loop load generator for the scoring path.")
+    parser.add_argument("--target", choices=["inprocess", "http"], default="inprocess")
+    parser.add_argument("--model", default=None, help="NetworkModel pickle for --target inprocess")
+    parser.add_argument("--compiled-model", default=None,
+                        help="CompiledEnsemble .npz for --target inprocess; defaults to the one beside --model")
+    parser.add_argument("--compiled-max-rows", type=int, default=SCORING_SERVER_COMPILED_MODEL_MAX_ROWS,
+                        help="Largest batch scored by the compiled ensemble; 0 always uses the sklearn model")
+    parser.add_argument("--url", default="http://127.0.0.1:8080/predict", help="Scoring endpoint for --target http")
+    parser.add_argument("--binary", action="store_true", help="Send the binary columnar body instead of JSON")
+    parser.add_argument("--data", default=DATA_INGESTION_SOURCE_PATH, help="CSV or feature store of request rows")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--batch-size", default="choice:1,8,64")
+    parser.add_argument("--rate", type=float, default=0.0, help="Total requests/sec; 0 runs flat out")
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--interval", type=float, default=1.0, help="Timeline and RSS sampling interval")
+    parser.add_argument("--server-pid", type=int, default=None, help="Also sample this process's RSS")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Report JSON")
+    parser.add_argument("--compare", default=None, help="Earlier report JSON to compare latency and throughput with")
+    args = parser.parse_args(argv)
+
+    frame = read_dataframe(args.data)
+    features = frame.drop(columns=[TARGET_COLUMN], errors="ignore")
+    if args.target == "inprocess":
+        model_file_path = args.model or PredictionPipelineConfigEntity(
+            training_pipeline_config=TrainingPipelineConfigEntity()
+        ).trained_model_file_path
+        compiled_model_file_path = args.compiled_model or os.path.join(
+            os.path.dirname(model_file_path), MODEL_TRAINER_COMPILED_MODEL_NAME
+        )
+        compiled_model = None
+        if args.compiled_max_rows > 0 and os.path.exists(compiled_model_file_path):
+            compiled_model = CompiledEnsemble.load(compiled_model_file_path)
+        scoring_model = ScoringModel(load_obj(model_file_path), compiled_model, args.compiled_max_rows)
+        target = InProcessTarget(scoring_model, features.columns.tolist())
+    else:
+        target = HttpTarget(args.url, binary=args.binary)
+
+    report = LoadGenerator(
+        target=target,
+        features=features.to_numpy(dtype=np.float64),
+        concurrency=args.concurrency,
+        batch_size_spec=args.batch_size,
+        rate=args.rate,
+        duration_seconds=args.duration,
+        warmup_seconds=args.warmup,
+        interval_seconds=args.interval,
+        server_pid=args.server_pid,
+        seed=args.seed
+    ).run()
+
+    previous = None
+    if args.compare:
+        with open(args.compare) as file:
+            previous = json.load(file)
+    print_report(report, previous)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"Report saved at {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
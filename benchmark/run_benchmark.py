@@ -0,0 +1,285 @@
+"""
+Pipeline benchmark on synthetic data.
+
+For every scale, generates a schema-conformant dataset (reused across runs when
+the generation parameters match), then runs data ingestion, validation,
+transformation, model training and NetworkModel.predict over a drifted scoring
+set, recording wall/CPU time, peak RSS, rows/sec and I/O per stage with the
+pipeline's StageProfiler. Results are compared with a stored baseline; any stage
+slower or larger than its baseline by more than the tolerance fails the run.
+
+    python -m benchmark.run_benchmark --rows 10k 100k 1M
+    python -m benchmark.run_benchmark --rows 10k 100k --update-baseline
+
+Run it from the project root. Each scale runs in <workdir>/rows_<n>, which holds
+a copy of config/ because the stages resolve it relative to the working directory.
+"""
+import os
+import sys
+import json
+import shutil
+import logging
+import argparse
+import platform
+import tempfile
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.linear_model import LogisticRegression
+from sklearn.ensemble import RandomForestClassifier
+
+from networksecurity.constants.training_pipeline import (
+    SCHEMA_FILE_PATH,
+    TARGET_COLUMN,
+    PREDICTION_CHUNK_SIZE,
+    DATA_INGESTION_SOURCE_PATH
+)
+from networksecurity.entity.config_entity import (
+    TrainingPipelineConfigEntity,
+    DataIngestionConfigEntity,
+    DataValidationConfigEntity,
+    DataTransformationConfigEntity,
+    ModelTrainerConfigEntity
+)
+from networksecurity.components.data_ingestion import DataIngestion
+from networksecurity.components.data_validation import DataValidation
+from networksecurity.components.data_tranformation import DataTransformation
+from networksecurity.components.model_trainer import ModelTrainer
+from networksecurity.logger.customlogger import LOGGER_NAME
+from networksecurity.utils.feature_store import FeatureStoreReader
+from networksecurity.utils.main_utils import load_obj
+from networksecurity.utils.profiler import StageProfiler
+from benchmark.synthetic_data import SyntheticDataGenerator
+
+DEFAULT_BASELINE_FILE_PATH = os.path.join("benchmark", "baseline.json")
+DEFAULT_WORK_DIR = os.path.join(tempfile.gettempdir(), "networksecurity_benchmark")
+# Metrics kept per stage in the results and compared against the baseline
+_STAGE_METRICS = ("wall_seconds", "cpu_seconds", "peak_rss_mb", "rows", "rows_per_second",
+                  "read_bytes", "write_bytes")
+_SCALE_SUFFIXES = {"k": 1_000, "m": 1_000_000}
+
+
+def parse_rows(value: str) -> int:
+    """'10k', '1M', '2.5m' or '10000' -> row count."""
+    suffix = value[-1].lower()
+    if suffix in _SCALE_SUFFIXES:
+        return int(float(value[:-1]) * _SCALE_SUFFIXES[suffix])
+    return int(value)
+
+
+class BenchmarkModelTrainer(ModelTrainer):
+    """
+    ModelTrainer with a fixed, small model set, so training time tracks the training
+    code and data size rather than whatever the production grids currently hold.
+    """
+
+    @staticmethod
+    def get_models() -> dict:
+        return {
+            "Random Forest": RandomForestClassifier(random_state=42),
+            "Logistic Regression": LogisticRegression(max_iter=1000),
+        }
+
+    @staticmethod
+    def get_param_grids() -> dict:
+        return {
+            "Random Forest": {"n_estimators": [32], "max_depth": [16]},
+            "Logistic Regression": {"C": [1.0]},
+        }
+
+
+def _dataset_path(data_dir: str, name: str, n_rows: int, args, extension: str, drift: float) -> str:
+    # The file name carries every generation parameter, so a matching file is safe to reuse
+    return os.path.join(data_dir, f"{name}_{n_rows}_d{drift}_c{args.drift_columns}_m{args.missing_rate}"
+                                  f"_s{args.seed}{extension}")
+
+
+def run_scale(n_rows: int, generator: SyntheticDataGenerator, args) -> dict:
+    """Runs every stage on an n_rows dataset inside its own working directory; returns per-stage metrics."""
+    scale_dir = os.path.abspath(os.path.join(args.workdir, f"rows_{n_rows}"))
+    data_dir = os.path.abspath(os.path.join(args.workdir, "data"))
+    # Stale artifacts (e.g. a streaming ingestion state) would change what the stages do
+    shutil.rmtree(os.path.join(scale_dir, "artifacts"), ignore_errors=True)
+    os.makedirs(os.path.join(scale_dir, os.path.dirname(SCHEMA_FILE_PATH)), exist_ok=True)
+    shutil.copy(SCHEMA_FILE_PATH, os.path.join(scale_dir, SCHEMA_FILE_PATH))
+
+    profiler = StageProfiler()
+    source_file_path = _dataset_path(data_dir, "train", n_rows, args, ".csv", 0.0)
+    scoring_file_path = _dataset_path(data_dir, "score", n_rows, args, ".nsfs", args.drift)
+    with profiler.span("generate_data", rows=2 * n_rows):
+        if not os.path.exists(source_file_path):
+            generator.write(source_file_path, n_rows, missing_rate=args.missing_rate)
+        if not os.path.exists(scoring_file_path):
+            generator.write(scoring_file_path, n_rows, drift=args.drift, drift_columns=args.drift_columns,
+                            missing_rate=args.missing_rate, seed_offset=1)
+
+    previous_dir = os.getcwd()
+    os.chdir(scale_dir)
+    try:
+        training_pipeline_config = TrainingPipelineConfigEntity()
+        data_ingestion_config = DataIngestionConfigEntity(training_pipeline_config=training_pipeline_config)
+        data_ingestion_config.source_data_file_path = source_file_path
+        data_ingestion_config.ingestion_mode = args.ingestion_mode
+        with profiler.span("data_ingestion", rows=n_rows):
+            data_ingestion_artifact = DataIngestion(data_ingestion_config).initiate_data_ingestion()
+
+        with profiler.span("data_validation", rows=n_rows):
+            data_validation_artifact = DataValidation(
+                data_validation_config=DataValidationConfigEntity(training_pipeline_config=training_pipeline_config),
+                data_ingestion_artifact=data_ingestion_artifact
+            ).initiate_data_validation()
+
+        with profiler.span("data_transformation", rows=n_rows):
+            data_transformation_artifact = DataTransformation(
+                data_transformation_config=DataTransformationConfigEntity(
+                    training_pipeline_config=training_pipeline_config
+                ),
+                data_validation_artifact=data_validation_artifact
+            ).initiate_data_transformation()
+
+        model_trainer_config = ModelTrainerConfigEntity(training_pipeline_config=training_pipeline_config)
+        model_trainer_config.search_mode = "grid"
+        with profiler.span("model_trainer", rows=n_rows) as span:
+            model_trainer_artifact = BenchmarkModelTrainer(
+                model_trainer_config=model_trainer_config,
+                data_transformation_artifact=data_transformation_artifact
+            ).initiate_model_trainer()
+            span["test_f1_score"] = float(model_trainer_artifact.test_metric_artifact.f1_score)
+
+        with profiler.span("predict", rows=n_rows):
+            network_model = load_obj(model_trainer_artifact.trained_model_file_path)
+            reader = FeatureStoreReader(scoring_file_path)
+            feature_columns = [column for column in reader.columns if column != TARGET_COLUMN]
+            for batch in reader.iter_batches(columns=feature_columns, batch_size=PREDICTION_CHUNK_SIZE):
+                network_model.predict(batch)
+    finally:
+        os.chdir(previous_dir)
+
+    return {
+        span["name"]: {metric: span.get(metric) for metric in _STAGE_METRICS + ("test_f1_score",)
+                       if span.get(metric) is not None}
+        for span in profiler.spans
+    }
+
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "scikit-learn": sklearn.__version__,
+    }
+
+
+def compare_with_baseline(results: dict, baseline: dict, tolerance: float, memory_tolerance: float,
+                          min_seconds: float) -> list:
+    """
+    Stage regressions as messages. A stage regresses when its wall time exceeds
+    baseline * (1 + tolerance) + min_seconds (the absolute slack keeps sub-second
+    stages from failing on noise) or its peak RSS exceeds baseline * (1 + memory_tolerance).
+    Data generation is reported but never gated.
+    """
+    regressions = []
+    for scale, stages in results["scales"].items():
+        baseline_stages = baseline.get("scales", {}).get(scale)
+        if baseline_stages is None:
+            print(f"⚠️ No baseline for {scale} rows; not compared.")
+            continue
+        for stage, metrics in stages.items():
+            baseline_metrics = baseline_stages.get(stage)
+            if baseline_metrics is None or stage == "generate_data":
+                continue
+            wall_limit = baseline_metrics["wall_seconds"] * (1 + tolerance) + min_seconds
+            memory_limit = baseline_metrics["peak_rss_mb"] * (1 + memory_tolerance)
+            status = "ok"
+            if metrics["wall_seconds"] > wall_limit:
+                status = "SLOWER"
+                regressions.append(f"{scale} rows / {stage}: {metrics['wall_seconds']:.2f}s vs baseline "
+                                   f"{baseline_metrics['wall_seconds']:.2f}s (limit {wall_limit:.2f}s)")
+            if metrics["peak_rss_mb"] > memory_limit:
+                status = "LARGER" if status == "ok" else status + "+LARGER"
+                regressions.append(f"{scale} rows / {stage}: peak RSS {metrics['peak_rss_mb']:.0f} MB vs baseline "
+                                   f"{baseline_metrics['peak_rss_mb']:.0f} MB (limit {memory_limit:.0f} MB)")
+            print(f"{scale:>10} {stage:<22} {baseline_metrics['wall_seconds']:>9.2f}s {metrics['wall_seconds']:>9.2f}s "
+                  f"{metrics['wall_seconds'] / max(baseline_metrics['wall_seconds'], 1e-9):>6.2f}x "
+                  f"{metrics['peak_rss_mb']:>8.0f} MB  {status}")
+    return regressions
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the training pipeline on synthetic data.")
+    parser.add_argument("--rows", nargs="+", default=["10k", "100k"], help="Scales, e.g. 10k 100k 1M 10M")
+    parser.add_argument("--drift", type=float, default=0.3, help="Drift strength of the scoring set, 0..1")
+    parser.add_argument("--drift-columns", type=int, default=5, help="Number of features the drift applies to")
+    parser.add_argument("--missing-rate", type=float, default=0.001, help="Fraction of feature cells left empty")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--ingestion-mode", choices=["batch", "streaming"], default="batch")
+    parser.add_argument("--reference", default=DATA_INGESTION_SOURCE_PATH,
+                        help="CSV whose value frequencies the generator fits")
+    parser.add_argument("--workdir", default=DEFAULT_WORK_DIR)
+    parser.add_argument("--output", default=None, help="Results JSON (default: <workdir>/results_<timestamp>.json)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_FILE_PATH)
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative wall-time increase")
+    parser.add_argument("--memory-tolerance", type=float, default=0.25, help="Allowed relative peak RSS increase")
+    parser.add_argument("--min-seconds", type=float, default=0.5, help="Absolute wall-time slack per stage")
+    parser.add_argument("--verbose", action="store_true", help="Keep the pipeline's INFO logging")
+    args = parser.parse_args(argv)
+
+    if not args.verbose:
+        logging.getLogger(LOGGER_NAME).setLevel(logging.WARNING)
+    generator = SyntheticDataGenerator(SCHEMA_FILE_PATH, reference_file_path=args.reference, seed=args.seed)
+    results = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "environment": environment(),
+        "parameters": {"drift": args.drift, "drift_columns": args.drift_columns, "missing_rate": args.missing_rate,
+                       "seed": args.seed, "ingestion_mode": args.ingestion_mode},
+        "scales": {},
+    }
+    for n_rows in sorted(parse_rows(value) for value in args.rows):
+        print(f"▶ Benchmarking {n_rows:,} rows...")
+        results["scales"][str(n_rows)] = run_scale(n_rows, generator, args)
+        for stage, metrics in results["scales"][str(n_rows)].items():
+            print(f"   {stage:<22} {metrics['wall_seconds']:>9.2f}s  {metrics['peak_rss_mb']:>8.0f} MB  "
+                  f"{metrics.get('rows_per_second') or 0:>12,.0f} rows/s")
+
+    output_file_path = args.output or os.path.join(
+        args.workdir, f"results_{datetime.now().strftime('%Y%m%d%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output_file_path)), exist_ok=True)
+    with open(output_file_path, "w") as file:
+        json.dump(results, file, indent=2)
+    print(f"Results saved at {output_file_path}")
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        shutil.copy(output_file_path, args.baseline)
+        print(f"Baseline updated at {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"⚠️ No baseline at {args.baseline}; run with --update-baseline on a reference machine to create one.")
+        return 0
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    if baseline.get("environment", {}).get("cpu_count") != results["environment"]["cpu_count"]:
+        print(f"⚠️ Baseline was recorded on {baseline.get('environment', {}).get('cpu_count')} CPUs, "
+              f"this machine has {results['environment']['cpu_count']}; timings may not be comparable.")
+    if baseline.get("parameters") != results["parameters"]:
+        print("⚠️ Baseline was recorded with different generation parameters.")
+    regressions = compare_with_baseline(results, baseline, args.tolerance, args.memory_tolerance, args.min_seconds)
+    if regressions:
+        print("\n🛑 PERFORMANCE REGRESSION against the baseline:")
+        for regression in regressions:
+            print(f"   - {regression}")
+        return 1
+    print("✅ No regressions against the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
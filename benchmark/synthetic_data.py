@@ -0,0 +1,98 @@
+"""
+Schema-conformant synthetic datasets for the benchmark suite.
+
+Column names and order come from config/schema.yaml. Each feature's values are
+drawn from its class-conditional value frequencies, fitted on a reference CSV
+(the real phishing data by default), so labels stay learnable at any scale;
+without a reference every feature is uniform over {-1, 0, 1}.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from networksecurity.constants.training_pipeline import TARGET_COLUMN, FEATURE_STORE_FILE_EXTENSION
+from networksecurity.utils.main_utils import read_yaml_file
+from networksecurity.utils.feature_store import FeatureStoreWriter
+
+# Rows generated and written per block, which bounds generator memory at any scale
+GENERATION_BLOCK_ROWS = 1_000_000
+_DEFAULT_DOMAIN = np.array([-1, 0, 1], dtype=np.int8)
+
+
+class SyntheticDataGenerator:
+    """
+    Samples rows column by column: the label from its prior, then every feature by
+    inverse-CDF lookup in the cumulative value frequencies of the row's class.
+
+    drift in [0, 1] moves the first drift_columns features towards their mirrored
+    distribution (value probabilities reversed), the kind of shift the drift
+    monitor and validation should flag. missing_rate blanks feature cells at random.
+    """
+
+    def __init__(self, schema_file_path: str, reference_file_path: str = None, seed: int = 42):
+        schema = read_yaml_file(schema_file_path)
+        self.columns = [list(col_dict.keys())[0] for col_dict in schema["columns"]]
+        self.feature_columns = [column for column in self.columns if column != TARGET_COLUMN]
+        self.seed = seed
+        self.labels = np.array([-1, 1], dtype=np.int8)
+        self.label_prior = np.array([0.5, 0.5])
+        self.domains = {column: _DEFAULT_DOMAIN for column in self.feature_columns}
+        # (n_labels, n_values) value probabilities of each feature per class
+        self.probabilities = {column: np.full((2, len(_DEFAULT_DOMAIN)), 1 / len(_DEFAULT_DOMAIN))
+                              for column in self.feature_columns}
+        if reference_file_path and os.path.exists(reference_file_path):
+            self._fit(pd.read_csv(reference_file_path, usecols=self.columns))
+
+    def _fit(self, reference: pd.DataFrame) -> None:
+        target = reference[TARGET_COLUMN].to_numpy()
+        self.labels = np.unique(target).astype(np.int8)
+        self.label_prior = np.array([(target == label).mean() for label in self.labels])
+        for column in self.feature_columns:
+            values = reference[column].to_numpy()
+            domain = np.unique(values).astype(np.int8)
+            # Laplace smoothing keeps every observed value possible in both classes
+            counts = np.array([[np.sum((target == label) & (values == value)) + 1 for value in domain]
+                               for label in self.labels], dtype=np.float64)
+            self.domains[column] = domain
+            self.probabilities[column] = counts / counts.sum(axis=1, keepdims=True)
+
+    def _sample_block(self, rng: np.random.Generator, n_rows: int, drift: float, drift_columns: int,
+                      missing_rate: float) -> pd.DataFrame:
+        label_index = rng.choice(len(self.labels), size=n_rows, p=self.label_prior)
+        data = {}
+        for position, column in enumerate(self.feature_columns):
+            probabilities = self.probabilities[column]
+            if drift > 0 and position < drift_columns:
+                probabilities = (1 - drift) * probabilities + drift * probabilities[:, ::-1]
+            cumulative = np.cumsum(probabilities, axis=1)
+            cumulative[:, -1] = 1.0
+            uniform = rng.random(n_rows)
+            value_index = (uniform[:, np.newaxis] > cumulative[label_index]).sum(axis=1)
+            values = self.domains[column][value_index]
+            if missing_rate > 0:
+                values = values.astype(np.float32)
+                values[rng.random(n_rows) < missing_rate] = np.nan
+            data[column] = values
+        data[TARGET_COLUMN] = self.labels[label_index]
+        return pd.DataFrame(data, columns=self.columns, copy=False)
+
+    def iter_blocks(self, n_rows: int, drift: float = 0.0, drift_columns: int = 5, missing_rate: float = 0.0,
+                    seed_offset: int = 0):
+        rng = np.random.default_rng(self.seed + seed_offset)
+        for start in range(0, n_rows, GENERATION_BLOCK_ROWS):
+            yield self._sample_block(rng, min(GENERATION_BLOCK_ROWS, n_rows - start), drift, drift_columns,
+                                     missing_rate)
+
+    def write(self, file_path: str, n_rows: int, **kwargs) -> str:
+        """Writes n_rows as CSV (the ingestion source format) or, for feature store paths, as a feature store."""
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        if file_path.endswith(FEATURE_STORE_FILE_EXTENSION):
+            with FeatureStoreWriter(file_path, columns=self.columns) as writer:
+                for block in self.iter_blocks(n_rows, **kwargs):
+                    writer.write(block)
+            return file_path
+        with open(file_path, "w", newline="") as file:
+            for index, block in enumerate(self.iter_blocks(n_rows, **kwargs)):
+                block.to_csv(file, header=index == 0, index=False)
+        return file_path
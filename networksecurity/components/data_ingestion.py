@@ -1,5 +1,11 @@
 import os 
+import io
+import csv
 import sys
+import json
+import hashlib
+from contextlib import contextmanager
+from datetime import datetime, timedelta
 import numpy as np
 import pandas as pd
 from typing import List
@@ -7,15 +13,46 @@ from networksecurity.exception.exception import CustomException
 from networksecurity.logger.customlogger import Custom_Logger
 from networksecurity.entity.config_entity import DataIngestionConfigEntity
 from networksecurity.entity.artifact_entity import DataIngestionArtifact
-from networksecurity.entity.artifact_entity import DataIngestionArtifact
+from networksecurity.utils.main_utils import read_dataframe, write_dataframe, read_yaml_file
+from networksecurity.utils.feature_store import FeatureStoreReader, FeatureStoreWriter
+from networksecurity.constants.training_pipeline import (
+    SCHEMA_FILE_PATH,
+    FEATURE_STORE_COMPRESSION,
+    FEATURE_STORE_ROW_GROUP_SIZE
+)
 from sklearn.model_selection import train_test_split
 
 # from dotenv import load_dotenv
 # load_dotenv()
 
+# Rows are assigned to the test split when their content hash falls in the first
+# test_size share of this many buckets
+_SPLIT_HASH_BUCKETS = 10_000
+# Bytes of the source hashed at the start and just before the resume offset
+_SOURCE_DIGEST_WINDOW = 64 * 1024
+
+
+class _ByteRangeReader(io.RawIOBase):
+    """Read-only view of the next `remaining` bytes of an open binary file."""
+
+    def __init__(self, file, remaining: int):
+        self._file = file
+        self._remaining = remaining
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._file.read(min(len(buffer), self._remaining))
+        buffer[:len(data)] = data
+        self._remaining -= len(data)
+        return len(data)
+
 class DataIngestion:
-    def __init__(self, data_ingestion_config: DataIngestionConfigEntity):
+    def __init__(self, data_ingestion_config: DataIngestionConfigEntity, mongo_client=None):
         self.data_ingestion_config = data_ingestion_config
+        # Defaults to the shared client from configuration.mongodb_connection when the source is mongodb
+        self.mongo_client = mongo_client
         self.logger = Custom_Logger().get_logger()
 
     def export_data_into_feature_store(self) -> pd.DataFrame:
@@ -27,10 +64,11 @@ class DataIngestion:
             df: pd.DataFrame = pd.read_csv(self.data_ingestion_config.source_data_file_path)
             self.logger.info(f"Data read from {self.data_ingestion_config.source_data_file_path} successfully.")
 
-            df.to_csv(self.data_ingestion_config.feature_store_file_path, index=False)
+            write_dataframe(self.data_ingestion_config.feature_store_file_path, df)
             self.logger.info(f"Data exported to feature store at {self.data_ingestion_config.feature_store_file_path}.")
 
-            return df
+            # Continue from the int8 feature store instead of the int64 CSV frame
+            return read_dataframe(self.data_ingestion_config.feature_store_file_path)
 
         except Exception as e:
             raise CustomException(e, sys)
@@ -50,8 +88,8 @@ class DataIngestion:
             os.makedirs(os.path.dirname(self.data_ingestion_config.training_file_path), exist_ok=True)
             os.makedirs(os.path.dirname(self.data_ingestion_config.testing_file_path), exist_ok=True)
 
-            train_df.to_csv(self.data_ingestion_config.training_file_path, index=False)
-            test_df.to_csv(self.data_ingestion_config.testing_file_path, index=False)
+            write_dataframe(self.data_ingestion_config.training_file_path, train_df)
+            write_dataframe(self.data_ingestion_config.testing_file_path, test_df)
             self.logger.info(f"Training data saved to {self.data_ingestion_config.training_file_path}.")
             self.logger.info(f"Testing data saved to {self.data_ingestion_config.testing_file_path}.")
 
@@ -59,12 +97,293 @@ class DataIngestion:
             raise CustomException(e, sys)
 
 
+    def is_test_row(self, chunk: pd.DataFrame) -> np.ndarray:
+        """Stable train/test assignment from each row's content, independent of its position."""
+        # Hash float64 values so a chunk that happens to contain NaN hashes its integers the same way
+        row_hashes = pd.util.hash_pandas_object(chunk.astype(np.float64), index=False).to_numpy()
+        test_buckets = int(self.data_ingestion_config.train_test_split_ratio * _SPLIT_HASH_BUCKETS)
+        return (row_hashes % _SPLIT_HASH_BUCKETS) < test_buckets
+
+    @staticmethod
+    def _source_digest(file, offset: int) -> str:
+        """Hashes the source head and the bytes just before offset to detect rewritten (not appended) files."""
+        digest = hashlib.sha256()
+        file.seek(0)
+        digest.update(file.read(min(offset, _SOURCE_DIGEST_WINDOW)))
+        file.seek(max(offset - _SOURCE_DIGEST_WINDOW, 0))
+        digest.update(file.read(offset - file.tell()))
+        return digest.hexdigest()
+
+    @staticmethod
+    def _complete_lines_end(file, start: int, size: int, n_columns: int) -> int:
+        """
+        End offset of the complete lines in [start, size). A last line without a trailing
+        newline counts as complete when it has all n_columns fields (a file saved without a
+        final newline); otherwise it is taken to be still being written and left for later.
+        """
+        lines_end = start
+        end = size
+        while end > start:
+            block_start = max(end - _SOURCE_DIGEST_WINDOW, start)
+            file.seek(block_start)
+            newline_index = file.read(end - block_start).rfind(b"\n")
+            if newline_index != -1:
+                lines_end = block_start + newline_index + 1
+                break
+            end = block_start
+        if lines_end < size:
+            file.seek(lines_end)
+            last_line = file.read(size - lines_end).decode("utf-8", errors="replace")
+            if last_line.strip() and len(next(csv.reader([last_line]))) == n_columns:
+                return size
+        return lines_end
+
+    def _outputs_match_state(self, state: dict) -> bool:
+        """True when the feature store and train/test files hold exactly the rows the state recorded."""
+        output_rows = {
+            "feature_store_rows": self.data_ingestion_config.feature_store_file_path,
+            "train_rows": self.data_ingestion_config.training_file_path,
+            "test_rows": self.data_ingestion_config.testing_file_path,
+        }
+        for key, file_path in output_rows.items():
+            try:
+                if FeatureStoreReader(file_path).n_rows != state[key]:
+                    raise ValueError(f"{file_path} does not match the ingestion state")
+            except Exception:
+                self.logger.info(f"Ingested output {file_path} is missing or incomplete; re-ingesting from the start.")
+                return False
+        return True
+
+    @staticmethod
+    def _save_state(state_file_path: str, state: dict) -> None:
+        # Write then rename, and only once every output has its footer written
+        with open(f"{state_file_path}.tmp", "w") as state_file:
+            json.dump(state, state_file, indent=2)
+        os.replace(f"{state_file_path}.tmp", state_file_path)
+
+    def _discard_states(self, keep: str = None) -> None:
+        """Removes incremental states of other sources; their offsets do not describe the new outputs."""
+        for state_file_path in (self.data_ingestion_config.ingestion_state_file_path,
+                                self.data_ingestion_config.mongo_state_file_path):
+            if state_file_path != keep and os.path.exists(state_file_path):
+                os.remove(state_file_path)
+
+    @contextmanager
+    def _open_split_writers(self, columns: list, mode: str):
+        writer_options = {"columns": columns, "compression": FEATURE_STORE_COMPRESSION,
+                          "row_group_size": FEATURE_STORE_ROW_GROUP_SIZE, "mode": mode}
+        with FeatureStoreWriter(self.data_ingestion_config.feature_store_file_path, **writer_options) as store_writer, \
+                FeatureStoreWriter(self.data_ingestion_config.training_file_path, **writer_options) as train_writer, \
+                FeatureStoreWriter(self.data_ingestion_config.testing_file_path, **writer_options) as test_writer:
+            yield store_writer, train_writer, test_writer
+
+    def _append_split_chunk(self, writers: tuple, chunk: pd.DataFrame, state: dict) -> None:
+        store_writer, train_writer, test_writer = writers
+        is_test = self.is_test_row(chunk)
+        store_writer.write(chunk)
+        train_writer.write(chunk[~is_test])
+        test_writer.write(chunk[is_test])
+        state["feature_store_rows"] += len(chunk)
+        state["train_rows"] += int((~is_test).sum())
+        state["test_rows"] += int(is_test.sum())
+
+    def _load_ingestion_state(self, file, header: bytes) -> dict:
+        """Returns the saved state if the source only grew and the outputs still match it, else None."""
+        state_file_path = self.data_ingestion_config.ingestion_state_file_path
+        if not os.path.exists(state_file_path):
+            return None
+        with open(state_file_path, "r") as state_file:
+            state = json.load(state_file)
+        file.seek(0, os.SEEK_END)
+        if (state.get("header") != header.decode("utf-8") or state["offset"] > file.tell()
+                or state["source_digest"] != self._source_digest(file, state["offset"])):
+            self.logger.info("Source file was rewritten since the last ingestion; re-ingesting from the start.")
+            return None
+        return state if self._outputs_match_state(state) else None
+
+    def stream_data_into_feature_store(self) -> None:
+        """
+        Streams the source CSV in chunk_size pieces, appending every row to the feature
+        store and to train or test by its row hash. Only bytes after the offset recorded
+        in the ingestion state are read, so a rerun after an append processes the tail.
+        A last line without a trailing newline is ingested if it has every column, and is
+        otherwise left (with a warning) for the run after its writer finishes it.
+        """
+        try:
+            source_path = self.data_ingestion_config.source_data_file_path
+            with open(source_path, "rb") as file:
+                header = file.readline()
+                columns = pd.read_csv(io.BytesIO(header), nrows=0).columns.tolist()
+                state = self._load_ingestion_state(file, header)
+                if state is None:
+                    state = {"header": header.decode("utf-8"), "offset": len(header),
+                             "feature_store_rows": 0, "train_rows": 0, "test_rows": 0}
+                    mode = "w"
+                else:
+                    mode = "a"
+
+                file.seek(0, os.SEEK_END)
+                size = file.tell()
+                end = self._complete_lines_end(file, state["offset"], size, n_columns=len(columns))
+                if end < size:
+                    self.logger.warning(f"⚠️ Leaving the incomplete last line of {source_path} ({size - end} bytes) "
+                                        f"unread until it is finished.")
+                self.logger.info(f"Streaming {end - state['offset']} new bytes of {source_path} "
+                                 f"from offset {state['offset']} (mode '{mode}').")
+
+                file.seek(state["offset"])
+                chunks = pd.read_csv(io.BufferedReader(_ByteRangeReader(file, end - state["offset"])),
+                                     header=None, names=columns, chunksize=self.data_ingestion_config.chunk_size)
+                with self._open_split_writers(columns, mode) as writers:
+                    for chunk in chunks:
+                        self._append_split_chunk(writers, chunk, state)
+
+                state["offset"] = end
+                state["source_digest"] = self._source_digest(file, end)
+
+            self._save_state(self.data_ingestion_config.ingestion_state_file_path, state)
+            self._discard_states(keep=self.data_ingestion_config.ingestion_state_file_path)
+            self.logger.info(f"Streaming ingestion done: {state['train_rows']} train / {state['test_rows']} test rows "
+                             f"in total, source offset {state['offset']}.")
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def _load_mongo_state(self) -> dict:
+        """Returns the saved watermark state if it is for the same collection and the outputs match it."""
+        state_file_path = self.data_ingestion_config.mongo_state_file_path
+        if not os.path.exists(state_file_path):
+            return None
+        with open(state_file_path, "r") as state_file:
+            state = json.load(state_file)
+        source = (self.data_ingestion_config.mongo_database_name, self.data_ingestion_config.mongo_collection_name,
+                  self.data_ingestion_config.mongo_watermark_field)
+        if (state["database"], state["collection"], state["watermark_field"]) != source:
+            self.logger.info("Mongo source or watermark field changed; re-ingesting the whole collection.")
+            return None
+        return state if self._outputs_match_state(state) else None
+
+    @staticmethod
+    def _watermark_window_start(watermark, lag_seconds: float):
+        """The watermark value lag_seconds earlier: ObjectIds by their timestamp, datetimes, or numbers."""
+        from bson import ObjectId
+        if isinstance(watermark, ObjectId):
+            return ObjectId.from_datetime(watermark.generation_time - timedelta(seconds=lag_seconds))
+        if isinstance(watermark, datetime):
+            return watermark - timedelta(seconds=lag_seconds)
+        if isinstance(watermark, (int, float)):
+            return watermark - lag_seconds
+        raise TypeError(f"Unsupported watermark type {type(watermark).__name__} for a watermark lag")
+
+    def stream_mongodb_into_feature_store(self) -> None:
+        """
+        Pulls documents added since the last run from the MongoDB collection, in
+        ascending watermark order through a projected, large-batch cursor, and appends
+        them to the feature store and train/test like the CSV streaming source.
+
+        Watermark values do not arrive in order: concurrent writers (the bulk loader's
+        threads, separate loader processes) can commit a document after one with a larger
+        _id has been read. Each run therefore re-reads mongo_watermark_lag_seconds behind
+        the watermark and drops the documents it already ingested, whose _ids the state
+        keeps for that window. A document is ingested exactly once as long as it commits
+        within the lag of the largest watermark read before it; one committing later is
+        missed, so the lag must exceed the writers' commit delay and clock skew. A lag of
+        0 reads strictly after the watermark.
+        """
+        try:
+            from bson import json_util
+            from networksecurity.configuration.mongodb_connection import get_mongo_client
+
+            config = self.data_ingestion_config
+            columns = [list(col_dict.keys())[0] for col_dict in read_yaml_file(SCHEMA_FILE_PATH)["columns"]]
+            watermark_field = config.mongo_watermark_field
+            lag_seconds = config.mongo_watermark_lag_seconds
+            state = self._load_mongo_state()
+            if state is None:
+                state = {"database": config.mongo_database_name, "collection": config.mongo_collection_name,
+                         "watermark_field": watermark_field, "watermark": None,
+                         "feature_store_rows": 0, "train_rows": 0, "test_rows": 0}
+                mode = "w"
+            else:
+                mode = "a"
+            # {_id: watermark} of the documents ingested within the lag window, as extended JSON
+            window_ids = state.setdefault("window_ids", {})
+
+            # The watermark is stored as extended JSON so ObjectId and datetime values round-trip
+            watermark = None if state["watermark"] is None else json_util.loads(state["watermark"])
+            if watermark is None:
+                query = {}
+            elif lag_seconds > 0:
+                query = {watermark_field: {"$gte": self._watermark_window_start(watermark, lag_seconds)}}
+            else:
+                query = {watermark_field: {"$gt": watermark}}
+            projection = {column: 1 for column in columns}
+            projection[watermark_field] = 1
+            projection["_id"] = 1
+            client = self.mongo_client if self.mongo_client is not None else get_mongo_client()
+            cursor = (client[config.mongo_database_name][config.mongo_collection_name]
+                      .find(query, projection)
+                      .sort(watermark_field, 1)
+                      .batch_size(config.mongo_batch_size))
+            self.logger.info(f"Pulling {config.mongo_database_name}.{config.mongo_collection_name} "
+                             f"documents with {watermark_field} > {state['watermark']} "
+                             f"(re-reading {lag_seconds}s behind it, mode '{mode}').")
+
+            def append(documents: list) -> None:
+                nonlocal watermark
+                self._append_split_chunk(writers, pd.DataFrame(documents, columns=columns), state)
+                for document in documents:
+                    window_ids[json_util.dumps(document["_id"])] = json_util.dumps(document[watermark_field])
+                # Late documents can sit below the watermark; it only moves forward
+                if watermark is None or documents[-1][watermark_field] > watermark:
+                    watermark = documents[-1][watermark_field]
+
+            new_documents = skipped_documents = 0
+            with self._open_split_writers(columns, mode) as writers:
+                documents = []
+                for document in cursor:
+                    if json_util.dumps(document["_id"]) in window_ids:
+                        skipped_documents += 1
+                        continue
+                    documents.append(document)
+                    if len(documents) == config.chunk_size:
+                        append(documents)
+                        new_documents += len(documents)
+                        documents = []
+                if documents:
+                    append(documents)
+                    new_documents += len(documents)
+
+            if watermark is not None:
+                state["watermark"] = json_util.dumps(watermark)
+                if lag_seconds > 0:
+                    window_start = self._watermark_window_start(watermark, lag_seconds)
+                    state["window_ids"] = {document_id: document_watermark
+                                           for document_id, document_watermark in window_ids.items()
+                                           if json_util.loads(document_watermark) >= window_start}
+                else:
+                    state["window_ids"] = {}
+
+            self._save_state(config.mongo_state_file_path, state)
+            self._discard_states(keep=config.mongo_state_file_path)
+            self.logger.info(f"Mongo ingestion done: {new_documents} new documents ({skipped_documents} re-read "
+                             f"already ingested), {state['train_rows']} train / "
+                             f"{state['test_rows']} test rows in total, watermark {state['watermark']}.")
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
     def initiate_data_ingestion(self) -> DataIngestionArtifact:
         try:
             self.logger.info("Starting data ingestion process...")
 
-            df = self.export_data_into_feature_store()
-            self.split_data_into_train_and_test(df)
+            if self.data_ingestion_config.ingestion_source == "mongodb":
+                self.stream_mongodb_into_feature_store()
+            elif self.data_ingestion_config.ingestion_mode == "streaming":
+                self.stream_data_into_feature_store()
+            else:
+                df = self.export_data_into_feature_store()
+                self.split_data_into_train_and_test(df)
+                # Batch outputs do not continue an incremental state
+                self._discard_states()
 
             data_ingestion_artifact = DataIngestionArtifact(
                 trained_file_path=self.data_ingestion_config.training_file_path,
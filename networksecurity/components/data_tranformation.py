@@ -1,7 +1,6 @@
 import sys , os 
 import numpy as np 
 import pandas as pd
-from sklearn.impute import KNNImputer
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler
 from networksecurity.exception.exception import CustomException
@@ -12,7 +11,9 @@ from networksecurity.entity.artifact_entity import (
     DataValidationArtifact
 )
 from networksecurity.entity.config_entity import DataTransformationConfigEntity
-from networksecurity.utils.main_utils import save_numpy_array_data , save_obj
+from networksecurity.utils.main_utils import save_numpy_array_data , save_obj , read_dataframe
+from networksecurity.utils.preprocessing.knn_imputer import SampledKNNImputer
+from networksecurity.utils.dag import DagExecutor, Task
 
 
 
@@ -26,58 +27,66 @@ class DataTransformation:
     @staticmethod
     def read_data(file_path: str) -> pd.DataFrame:
         try:
-            if not os.path.exists(file_path):
-                raise FileNotFoundError(f"File not found: {file_path}")
-            return pd.read_csv(file_path)
+            return read_dataframe(file_path)
         except Exception as e:
             raise CustomException(e, sys) from e
     def get_data_transformation_pipeline(self) -> Pipeline:
         """
-        Creates a data transformation pipeline with KNNImputer and StandardScaler.
+        Creates a data transformation pipeline with a SampledKNNImputer, which skips
+        rows without missing values and looks up donors in a bounded reference sample.
         """
         try:
             self.logger.info("Creating data transformation pipeline.")
-            imputer = KNNImputer(**DATA_TRANSFORMATION_IMPUTER_PARAMS)
+            imputer = SampledKNNImputer(**DATA_TRANSFORMATION_IMPUTER_PARAMS)
             preprcessor : Pipeline = Pipeline(steps=[("imputer", imputer)])
             self.logger.info("Data transformation pipeline created successfully.")
             return preprcessor
         except Exception as e:
             raise CustomException(e, sys) from e
         
+    @staticmethod
+    def split_features(dataframe: pd.DataFrame) -> tuple:
+        """Input features and the target, with the -1 label mapped to 0."""
+        input_feature_df = dataframe.drop(columns=[TARGET_COLUMN])
+        target_feature_df = dataframe[TARGET_COLUMN].replace(-1 , 0)
+        return input_feature_df, target_feature_df
+
+    @staticmethod
+    def transform_and_save(preprocessor_object: Pipeline, split: tuple, file_path: str) -> None:
+        input_feature_df, target_feature_df = split
+        transformed_input_feature = preprocessor_object.transform(input_feature_df)
+        save_numpy_array_data(file_path=file_path,
+                              array=np.c_[transformed_input_feature, np.array(target_feature_df)])
+
     def initiate_data_transformation(self) -> DataTransformationArtifact:
         self.logger.info("Entered initiate_data_transformation method of DataTransformation class.")
         try:
-            self.logger.info("Reading training and testing data.")
-            train_df = DataTransformation.read_data(self.data_validation_artifact.valid_train_file_path)
-            test_df = DataTransformation.read_data(self.data_validation_artifact.valid_test_file_path)
-            self.logger.info("Data read successfully. Starting preprocessing.")
-
-            # training dataframe
-            input_feature_train_df = train_df.drop(columns=[TARGET_COLUMN], axis=1)
-            target_feature_train_df = train_df[TARGET_COLUMN]
-            target_feature_train_df = target_feature_train_df.replace(-1 , 0)
-            self.logger.info("Training data split into input and target features.")
-
-            # testing dataframe
-            input_feature_test_df = test_df.drop(columns=[TARGET_COLUMN], axis=1)
-            target_feature_test_df = test_df[TARGET_COLUMN]
-            target_feature_test_df = target_feature_test_df.replace(-1 , 0)
-            self.logger.info("Testing data split into input and target features.")
-
-            preprocessor = self.get_data_transformation_pipeline()
-            self.logger.info("Data transformation pipeline created successfully.")
-            # Fit the preprocessor on the training data
-            preprocessor_object = preprocessor.fit(input_feature_train_df)
-            transformed_input_train_feature = preprocessor_object.transform(input_feature_train_df)
-            transformed_input_test_feature = preprocessor_object.transform(input_feature_test_df)
-            
-            train_arr = np.c_[transformed_input_train_feature, np.array(target_feature_train_df)]
-            test_arr = np.c_[transformed_input_test_feature, np.array(target_feature_test_df)]
-
-            # save the numpy arrays
-            save_numpy_array_data(file_path=self.data_transformation_config.transformed_train_file_path, array=train_arr)
-            save_numpy_array_data(file_path=self.data_transformation_config.transformed_test_file_path, array=test_arr)
-            save_obj(file_path=self.data_transformation_config.transformed_object_file_path, obj=preprocessor_object)
+            # Each split is read, split into input/target features, transformed and saved on its own
+            # branch; only the transforms wait for the preprocessor fitted on the training data
+            tasks = [
+                Task(name="train", fn=lambda: self.split_features(
+                    DataTransformation.read_data(self.data_validation_artifact.valid_train_file_path))),
+                Task(name="test", fn=lambda: self.split_features(
+                    DataTransformation.read_data(self.data_validation_artifact.valid_test_file_path))),
+                Task(name="preprocessor", fn=lambda train: self.get_data_transformation_pipeline().fit(train[0]),
+                     inputs={"train": "train"}),
+                Task(name="save_train",
+                     fn=lambda preprocessor, train: self.transform_and_save(
+                         preprocessor, train, self.data_transformation_config.transformed_train_file_path),
+                     inputs={"preprocessor": "preprocessor", "train": "train"}),
+                Task(name="save_test",
+                     fn=lambda preprocessor, test: self.transform_and_save(
+                         preprocessor, test, self.data_transformation_config.transformed_test_file_path),
+                     inputs={"preprocessor": "preprocessor", "test": "test"}),
+                Task(name="save_preprocessor",
+                     fn=lambda preprocessor: save_obj(
+                         file_path=self.data_transformation_config.transformed_object_file_path,
+                         obj=preprocessor, mmap_arrays=True),
+                     inputs={"preprocessor": "preprocessor"}),
+            ]
+            self.logger.info("Reading, preprocessing and saving training and testing data.")
+            DagExecutor(cpu_budget=self.data_transformation_config.training_pipeline_config.dag_cpu_budget,
+                        name="data_transformation").run(tasks)
             self.logger.info("Transformed data saved successfully.")
 
             data_transformation_artifact = DataTransformationArtifact(
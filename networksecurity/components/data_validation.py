@@ -2,13 +2,20 @@ import os
 import sys
 import pandas as pd
 import yaml
-from scipy.stats import ks_2samp  # Import KS test
 from networksecurity.entity.artifact_entity import DataValidationArtifact, DataIngestionArtifact
 from networksecurity.entity.config_entity import DataValidationConfigEntity
 from networksecurity.exception.exception import CustomException
-from networksecurity.utils.main_utils import read_yaml_file, write_yaml_file
+from networksecurity.utils.main_utils import read_yaml_file, write_yaml_file, read_dataframe, write_dataframe
 from networksecurity.logger.customlogger import Custom_Logger
-from networksecurity.constants.training_pipeline import SCHEMA_FILE_PATH
+from networksecurity.utils.ml_metric.drift_metric import HistogramSketch, compute_drift
+from networksecurity.utils.preprocessing.outlier_profiler import OutlierProfiler
+from networksecurity.utils.dag import DagExecutor, Task
+from networksecurity.constants.training_pipeline import (
+    SCHEMA_FILE_PATH,
+    TARGET_COLUMN,
+    TRAIN_FEATURE_STORE_FILE_NAME,
+    TEST_FEATURE_STORE_FILE_NAME
+)
 
 
 class DataValidation:
@@ -37,9 +44,7 @@ class DataValidation:
     @staticmethod
     def read_data(file_path: str) -> pd.DataFrame:
         try:
-            if not os.path.exists(file_path):
-                raise FileNotFoundError(f"File not found: {file_path}")
-            return pd.read_csv(file_path)
+            return read_dataframe(file_path)
         except Exception as e:
             raise CustomException(e, sys) from e
 
@@ -64,25 +69,20 @@ class DataValidation:
         except Exception as e:
             raise CustomException(e, sys) from e
 
+    def get_outlier_profiler(self) -> OutlierProfiler:
+        return OutlierProfiler(
+            iqr_multiplier=self.data_validation_config.outlier_iqr_multiplier,
+            exclude_columns=(TARGET_COLUMN,),
+            sample_size=self.data_validation_config.outlier_sample_size,
+            strategy=self.data_validation_config.outlier_strategy
+        )
+
     def detect_outliers(self, dataframe: pd.DataFrame) -> dict:
+        """IQR outlier count per numeric feature column, using the dataframe's own quartiles."""
         try:
             self.logger.info("🔍 Detecting outliers using IQR method...")
-            outlier_summary = {}
-            numeric_columns = dataframe.select_dtypes(include=['int64', 'float64']).columns
-
-            for col in numeric_columns:
-                Q1 = dataframe[col].quantile(0.25)
-                Q3 = dataframe[col].quantile(0.75)
-                IQR = Q3 - Q1
-                lower_bound = Q1 - 1.5 * IQR
-                upper_bound = Q3 + 1.5 * IQR
-
-                outliers = dataframe[(dataframe[col] < lower_bound) | (dataframe[col] > upper_bound)]
-                outlier_count = outliers.shape[0]
-                outlier_summary[col] = outlier_count
-
-                self.logger.info(f"📉 Outliers in '{col}': {outlier_count}")
-
+            outlier_summary = self.get_outlier_profiler().fit(dataframe).count_outliers(dataframe)
+            self.logger.info(f"📉 Outliers per column: {outlier_summary}")
             return outlier_summary
         except Exception as e:
             raise CustomException(e, sys) from e
@@ -104,25 +104,18 @@ class DataValidation:
             raise CustomException(e, sys) from e
 
     def detect_dataset_drift(self, base_df: pd.DataFrame, current_df: pd.DataFrame, threshold=0.05) -> bool:
+        """
+        Compares per-column value-count histograms (chi-square p-value, PSI, Jensen-Shannon)
+        and saves the base histograms as the reference sketch for later drift checks.
+        """
         try:
-            status = True
-            report = {}
-
-            for column in base_df.columns:
-                d1 = base_df[column]
-                d2 = current_df[column]
+            reference_sketch = HistogramSketch.from_frame(base_df)
+            current_sketch = HistogramSketch.from_frame(current_df, columns=reference_sketch.columns)
+            reference_sketch.save(self.data_validation_config.reference_histogram_file_path)
+            self.logger.info(f"Reference histograms saved at {self.data_validation_config.reference_histogram_file_path}")
 
-                # KS test
-                ks_test_result = ks_2samp(d1, d2)
-
-                drift_detected = ks_test_result.pvalue < threshold
-                if drift_detected:
-                    status = False
-
-                report[column] = {
-                    "p_value": float(ks_test_result.pvalue),
-                    "drift_status": drift_detected
-                }
+            report = compute_drift(reference_sketch, current_sketch, threshold=threshold)
+            status = not any(column_report["drift_status"] for column_report in report.values())
 
             drift_report_file_path = self.data_validation_config.drift_report_file_path
             dir_path = os.path.dirname(drift_report_file_path)
@@ -135,45 +128,57 @@ class DataValidation:
         except Exception as e:
             raise CustomException(e, sys) from e
 
+    def load_split(self, file_path: str, split: str) -> pd.DataFrame:
+        dataframe = self.read_data(file_path)
+        if not self.validate_number_of_columns(dataframe):
+            raise ValueError(f"❌ {split.capitalize()} data columns do not match schema.")
+        return dataframe
+
+    def handle_outliers(self, outlier_profiler: OutlierProfiler, dataframe: pd.DataFrame, split: str) -> tuple:
+        """Counts, handles (in place) and recounts one split's outliers; returns (frame, before, after)."""
+        outliers_before = outlier_profiler.count_outliers(dataframe)
+        self.logger.info(f"📊 {split.capitalize()} Outliers Before Handling: {outliers_before}")
+        dataframe_after = outlier_profiler.transform(dataframe, outliers_before)
+        if outlier_profiler.strategy == "none":
+            outliers_after = outliers_before
+        else:
+            outliers_after = outlier_profiler.count_outliers(dataframe_after)
+        self.logger.info(f"📊 {split.capitalize()} Outliers After Handling: {outliers_after}")
+        return dataframe_after, outliers_before, outliers_after
+
     def initiate_data_validation(self) -> DataValidationArtifact:
         try:
-            train_df = self.read_data(self.data_ingestion_artifact.trained_file_path)
-            test_df = self.read_data(self.data_ingestion_artifact.test_file_path)
-            self.logger.info("📂 Train and Test datasets loaded successfully.")
-
-            if not self.validate_number_of_columns(train_df):
-                raise ValueError("❌ Train data columns do not match schema.")
-            if not self.validate_number_of_columns(test_df):
-                raise ValueError("❌ Test data columns do not match schema.")
-
-            train_outliers_before = self.detect_outliers(train_df)
-            test_outliers_before = self.detect_outliers(test_df)
-            self.logger.info(f"📊 Train Outliers Before Handling: {train_outliers_before}")
-            self.logger.info(f"📊 Test Outliers Before Handling: {test_outliers_before}")
-
-            # TODO: Add your outlier handling here (removal/capping)
-            train_df_after = train_df.copy()
-            test_df_after = test_df.copy()
-
-            train_outliers_after = self.detect_outliers(train_df_after)
-            test_outliers_after = self.detect_outliers(test_df_after)
-            self.logger.info(f"📊 Train Outliers After Handling: {train_outliers_after}")
-            self.logger.info(f"📊 Test Outliers After Handling: {test_outliers_after}")
-
-            self.save_outliers_report(
-                outliers_before={"train": train_outliers_before, "test": test_outliers_before},
-                outliers_after={"train": train_outliers_after, "test": test_outliers_after},
-            )
-
-            # Detect drift between train and test sets
-            drift_status = self.detect_dataset_drift(base_df=train_df_after, current_df=test_df_after)
-            self.logger.info(f"⚠️ Dataset drift detected: {not drift_status}")
-
-            # Save valid data files
-            valid_train_file_path = os.path.join(self.valid_train_dir, "train.csv")
-            valid_test_file_path = os.path.join(self.valid_test_dir, "test.csv")
-            train_df_after.to_csv(valid_train_file_path, index=False)
-            test_df_after.to_csv(valid_test_file_path, index=False)
+            valid_train_file_path = os.path.join(self.valid_train_dir, TRAIN_FEATURE_STORE_FILE_NAME)
+            valid_test_file_path = os.path.join(self.valid_test_dir, TEST_FEATURE_STORE_FILE_NAME)
+
+            # Train and test are read, checked, profiled and saved independently of each other;
+            # outlier bounds come from the train split only and are applied to both splits
+            tasks = [
+                Task(name="train", fn=lambda: self.load_split(self.data_ingestion_artifact.trained_file_path, "train")),
+                Task(name="test", fn=lambda: self.load_split(self.data_ingestion_artifact.test_file_path, "test")),
+                Task(name="outlier_profiler", fn=lambda train: self.get_outlier_profiler().fit(train),
+                     inputs={"train": "train"}),
+                Task(name="train_outliers", fn=lambda profiler, train: self.handle_outliers(profiler, train, "train"),
+                     inputs={"profiler": "outlier_profiler", "train": "train"}),
+                Task(name="test_outliers", fn=lambda profiler, test: self.handle_outliers(profiler, test, "test"),
+                     inputs={"profiler": "outlier_profiler", "test": "test"}),
+                Task(name="outliers_report",
+                     fn=lambda train, test: self.save_outliers_report(
+                         outliers_before={"train": train[1], "test": test[1]},
+                         outliers_after={"train": train[2], "test": test[2]}),
+                     inputs={"train": "train_outliers", "test": "test_outliers"}),
+                Task(name="drift",
+                     fn=lambda train, test: self.detect_dataset_drift(base_df=train[0], current_df=test[0]),
+                     inputs={"train": "train_outliers", "test": "test_outliers"}),
+                Task(name="save_train", fn=lambda train: write_dataframe(valid_train_file_path, train[0]),
+                     inputs={"train": "train_outliers"}),
+                Task(name="save_test", fn=lambda test: write_dataframe(valid_test_file_path, test[0]),
+                     inputs={"test": "test_outliers"}),
+            ]
+            self.logger.info("🔍 Validating train and test datasets and profiling outliers using IQR method...")
+            results = DagExecutor(cpu_budget=self.data_validation_config.training_pipeline_config.dag_cpu_budget,
+                                  name="data_validation").run(tasks)
+            self.logger.info(f"⚠️ Dataset drift detected: {not results['drift']}")
             self.logger.info(f"✅ Valid train data saved at {valid_train_file_path}")
             self.logger.info(f"✅ Valid test data saved at {valid_test_file_path}")
 
@@ -185,7 +190,8 @@ class DataValidation:
                 invalid_train_file_path=None,
                 invalid_test_file_path=None,
                 drift_report_file_path=self.data_validation_config.drift_report_file_path,
-                drift_summary_file_path=None  # Add if you have a summary path
+                drift_summary_file_path=None,  # Add if you have a summary path
+                reference_histogram_file_path=self.data_validation_config.reference_histogram_file_path
             )
 
         except Exception as e:
@@ -0,0 +1,501 @@
+import os
+import sys
+import json
+import math
+import time
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed, parallel_config
+from threadpoolctl import threadpool_limits
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestClassifier, ExtraTreesClassifier, GradientBoostingClassifier
+from sklearn.metrics import f1_score
+from sklearn.model_selection import ParameterGrid, cross_val_score
+
+from networksecurity.exception.exception import CustomException
+from networksecurity.logger.customlogger import Custom_Logger
+from networksecurity.utils.shared_array_store import precompute_folds
+from networksecurity.utils.evaluation_store import EvaluationStore, fingerprint_arrays, fingerprint_fold
+
+
+class BudgetedModelSearch:
+    """
+    Successive-halving search over several model families under one global budget.
+
+    Every (family, params) candidate is first cross-validated on a small nested
+    subsample of the training data. After each rung only the top 1/halving_factor
+    candidates are promoted to a halving_factor times larger subsample, and a whole
+    family is dropped once its best score trails the overall best by more than
+    family_abort_margin. The search stops early when the time or fit budget runs
+    out; the winner is the best candidate of the deepest rung reached, refit on
+    the full data. Every evaluation is recorded in trace_.
+    """
+
+    def __init__(self, models: dict, param_grids: dict, scoring: str = "f1", cv: int = 3,
+                 halving_factor: int = 3, min_samples: int = 300, time_budget_seconds: float = 600.0,
+                 max_fits: int = 1000, family_abort_margin: float = 0.05, random_state: int = 42,
+                 n_jobs: int = -1):
+        self.models = models
+        self.param_grids = param_grids
+        self.scoring = scoring
+        self.cv = cv
+        self.halving_factor = halving_factor
+        self.min_samples = min_samples
+        self.time_budget_seconds = time_budget_seconds
+        self.max_fits = max_fits
+        self.family_abort_margin = family_abort_margin
+        self.random_state = random_state
+        self.n_jobs = n_jobs
+        self.logger = Custom_Logger().get_logger()
+
+    def _candidates(self) -> list:
+        """All (family, params) pairs, interleaved across families so a short budget still samples each one."""
+        per_family = [
+            [{"family": family, "params": params} for params in ParameterGrid(self.param_grids.get(family) or {})]
+            for family in self.models
+        ]
+        candidates = []
+        for index in range(max(len(family_candidates) for family_candidates in per_family)):
+            candidates.extend(family_candidates[index] for family_candidates in per_family
+                              if index < len(family_candidates))
+        return candidates
+
+    def _rung_sizes(self, n_samples: int, n_candidates: int) -> list:
+        """Subsample size per rung, growing by halving_factor and ending at the full data."""
+        rungs_for_candidates = math.ceil(math.log(max(n_candidates, 1), self.halving_factor)) + 1
+        rungs_for_samples = int(math.log(max(n_samples / self.min_samples, 1), self.halving_factor)) + 1
+        n_rungs = max(min(rungs_for_candidates, rungs_for_samples), 1)
+        return [max(int(n_samples / self.halving_factor ** (n_rungs - 1 - rung)), self.cv * 2)
+                for rung in range(n_rungs)]
+
+    def _budget_left(self, start_time: float) -> bool:
+        return (time.perf_counter() - start_time < self.time_budget_seconds
+                and self.n_fits_ + self.cv <= self.max_fits)
+
+    def _evaluate(self, candidate: dict, X, y, folds: list) -> dict:
+        estimator = clone(self.models[candidate["family"]]).set_params(**candidate["params"])
+        fit_start = time.perf_counter()
+        try:
+            scores = cross_val_score(estimator, X, y, cv=folds, scoring=self.scoring,
+                                     n_jobs=self.n_jobs, error_score="raise")
+            mean_score, std_score, status = float(np.mean(scores)), float(np.std(scores)), "evaluated"
+        except Exception as e:
+            self.logger.warning(f"⚠️ {candidate['family']} {candidate['params']} failed: {e}")
+            mean_score, std_score, status = float("nan"), float("nan"), "failed"
+        self.n_fits_ += self.cv
+        return {
+            "family": candidate["family"],
+            "params": json.dumps(candidate["params"], sort_keys=True),
+            "n_samples": len(y),
+            "mean_score": mean_score,
+            "std_score": std_score,
+            "fit_seconds": time.perf_counter() - fit_start,
+            "n_fits": self.cv,
+            "status": status,
+        }
+
+    def fit(self, X, y) -> "BudgetedModelSearch":
+        try:
+            start_time = time.perf_counter()
+            self.n_fits_ = 0
+            self.trace_ = []
+            candidates = self._candidates()
+            rung_sizes = self._rung_sizes(len(y), len(candidates))
+            self.logger.info(f"🔎 Budgeted search: {len(candidates)} candidates over {len(self.models)} families, "
+                             f"rung sizes {rung_sizes}, budget {self.time_budget_seconds:.0f}s / {self.max_fits} fits.")
+
+            # Prefixes of one shuffled order give nested subsamples, so promoted candidates only see more data
+            order = np.random.default_rng(self.random_state).permutation(len(y))
+            best_rung_results = []
+            for rung, n_samples in enumerate(rung_sizes):
+                if n_samples < len(y):
+                    subset = np.sort(order[:n_samples])
+                    X_rung, y_rung = X[subset], y[subset]
+                else:
+                    # The full rung reads the caller's (possibly shared, memory-mapped) arrays directly
+                    X_rung, y_rung = X, y
+                # One set of folds per rung, shared by every candidate evaluated on it
+                folds = precompute_folds(y_rung, self.cv)
+                rung_results = []
+                for candidate in candidates:
+                    if not self._budget_left(start_time):
+                        self.trace_.append({"rung": rung, "family": candidate["family"],
+                                            "params": json.dumps(candidate["params"], sort_keys=True),
+                                            "n_samples": n_samples, "status": "skipped_budget"})
+                        continue
+                    result = {"rung": rung, **self._evaluate(candidate, X_rung, y_rung, folds)}
+                    self.trace_.append(result)
+                    if result["status"] == "evaluated":
+                        rung_results.append((result, candidate))
+
+                if rung_results:
+                    best_rung_results = rung_results
+                if not rung_results or not self._budget_left(start_time) or rung == len(rung_sizes) - 1:
+                    break
+
+                # Drop families that trail the overall best, then promote the top fraction of the rest
+                best_score = max(result["mean_score"] for result, _ in rung_results)
+                family_best = {}
+                for result, _ in rung_results:
+                    family_best[result["family"]] = max(family_best.get(result["family"], -np.inf),
+                                                        result["mean_score"])
+                survivors = []
+                for result, candidate in rung_results:
+                    if family_best[result["family"]] < best_score - self.family_abort_margin:
+                        result["status"] = "family_aborted"
+                    else:
+                        survivors.append((result, candidate))
+                survivors.sort(key=lambda item: item[0]["mean_score"], reverse=True)
+                n_promoted = max(math.ceil(len(rung_results) / self.halving_factor), 1)
+                for result, _ in survivors[n_promoted:]:
+                    result["status"] = "eliminated"
+                for result, _ in survivors[:n_promoted]:
+                    result["status"] = "promoted"
+                candidates = [candidate for _, candidate in survivors[:n_promoted]]
+                aborted = sorted(set(family_best) - {result["family"] for result, _ in survivors})
+                self.logger.info(f"Rung {rung} ({n_samples} rows): best {best_score:.4f}, "
+                                 f"promoted {len(candidates)}, aborted families {aborted}")
+
+            if not best_rung_results:
+                raise ValueError("Budgeted search evaluated no candidate successfully.")
+            best_result, best_candidate = max(best_rung_results, key=lambda item: item[0]["mean_score"])
+            best_result["status"] = "selected"
+            self.best_family_ = best_candidate["family"]
+            self.best_params_ = best_candidate["params"]
+            self.best_score_ = best_result["mean_score"]
+            self.best_estimator_ = clone(self.models[self.best_family_]).set_params(**self.best_params_).fit(X, y)
+            self.elapsed_seconds_ = time.perf_counter() - start_time
+            self.logger.info(f"✅ Budgeted search finished in {self.elapsed_seconds_:.1f}s using {self.n_fits_} fits: "
+                             f"{self.best_family_} {self.best_params_} scored {self.best_score_:.4f} "
+                             f"on {best_result['n_samples']} rows.")
+            return self
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def save_trace(self, file_path: str) -> None:
+        pd.DataFrame(self.trace_, columns=["rung", "family", "params", "n_samples", "mean_score", "std_score",
+                                           "fit_seconds", "n_fits", "status"]).to_csv(file_path, index=False)
+
+
+def _timed(job, fn, *args):
+    """Runs fn(*args) in a worker and returns (job, result, seconds), so unordered results can be matched up."""
+    start_time = time.perf_counter()
+    result = fn(*args)
+    return job, result, time.perf_counter() - start_time
+
+
+def _fit_and_score(estimator, X, y, train_index, test_index, score_func) -> list:
+    estimator.fit(X[train_index], y[train_index])
+    return [score_func(y[test_index], estimator.predict(X[test_index]))]
+
+
+def _score_path(estimator, X, y, train_index, test_index, sizes: list, score_func, early_stopping_rounds: int,
+                tol: float) -> list:
+    """
+    Fits one CV fold along the estimator-count path and scores the held-out part
+    at every size. Forests grow with warm_start, boosting is fitted once at the
+    largest size and read through staged_predict. With early_stopping_rounds, the
+    path stops once the score has not improved by tol for that many estimators;
+    later sizes repeat the score the ensemble stopped at.
+    """
+    X_train, y_train = X[train_index], y[train_index]
+    X_test, y_test = X[test_index], y[test_index]
+    scores = []
+    best_score, best_size = -np.inf, 0
+
+    def stop_after(size: int, score: float) -> bool:
+        nonlocal best_score, best_size
+        scores.append(score)
+        if score > best_score + tol:
+            best_score, best_size = score, size
+        return early_stopping_rounds is not None and size - best_size >= early_stopping_rounds
+
+    if isinstance(estimator, (RandomForestClassifier, ExtraTreesClassifier)):
+        # warm_start only adds trees, and forests draw tree seeds in order, so each size equals a fresh fit
+        estimator.set_params(warm_start=True)
+        for size in sizes:
+            estimator.set_params(n_estimators=size).fit(X_train, y_train)
+            if stop_after(size, score_func(y_test, estimator.predict(X_test))):
+                break
+    else:
+        estimator.set_params(n_estimators=sizes[-1]).fit(X_train, y_train)
+        pending = list(sizes)
+        y_pred = None
+        for stage, y_pred in enumerate(estimator.staged_predict(X_test), start=1):
+            if stage == pending[0]:
+                pending.pop(0)
+                if stop_after(stage, score_func(y_test, y_pred)) or not pending:
+                    break
+        else:
+            # The ensemble ended before the next size (perfect fit, native early stopping): every
+            # remaining size is that final model, exactly what a fresh fit at those sizes returns
+            if pending and y_pred is not None:
+                scores.append(score_func(y_test, y_pred))
+    return scores + [scores[-1]] * (len(sizes) - len(scores))
+
+
+class StoredGridSearch:
+    """
+    Grid search over precomputed CV folds backed by an EvaluationStore.
+
+    The grid is split into jobs, each fitting one fold and yielding the scores
+    of one or more candidates. Jobs whose scores are all in the store are not
+    run; the others run on a joblib pool and every result is committed to the
+    store as it arrives, so a rerun on unchanged data, or after an interrupted
+    search, fits only what is missing. Without a store every job runs. The best
+    candidate is the first highest mean score in ParameterGrid order, refit on
+    the full data, as in GridSearchCV.
+    """
+
+    def __init__(self, estimator, param_grid: dict, cv: list, score_func=f1_score, store: EvaluationStore = None,
+                 data_fingerprint: str = None, n_jobs: int = -1):
+        self.estimator = estimator
+        self.param_grid = param_grid
+        self.cv = cv
+        self.score_func = score_func
+        self.store = store if store is not None and store.enabled else None
+        self.data_fingerprint = data_fingerprint
+        self.n_jobs = n_jobs
+        self.logger = Custom_Logger().get_logger()
+
+    def _base_estimator(self):
+        return clone(self.estimator)
+
+    def _variant(self):
+        """Search settings outside the estimator's parameters that change its scores."""
+        return None
+
+    def _jobs(self) -> list:
+        """[(setting applied to the fitted estimator, [candidate params scored by the fit])] per fold."""
+        return [(params, [params]) for params in ParameterGrid(self.param_grid)]
+
+    def _job_fn(self):
+        return _fit_and_score
+
+    def _job_args(self) -> tuple:
+        return (self.score_func,)
+
+    def plan(self, X, y) -> list:
+        """Fills the scores found in the store and returns the jobs still to run as (setting, candidates, fold)."""
+        self._start_time = time.perf_counter()
+        self._base = self._base_estimator()
+        self._variant_key = self._variant()
+        if self.store is not None and self.data_fingerprint is None:
+            self.data_fingerprint = fingerprint_arrays(X, y)
+        self._fold_fingerprints = [fingerprint_fold(train_index, test_index) for train_index, test_index in self.cv]
+
+        # (candidate JSON, fold) -> score, from the store first
+        self._scores, self.pending_ = {}, []
+        for setting, candidates in self._jobs():
+            for fold, fold_fingerprint in enumerate(self._fold_fingerprints):
+                stored = [self.store.lookup(self.data_fingerprint, self._base, params, fold_fingerprint,
+                                            self._variant_key) if self.store is not None else None
+                          for params in candidates]
+                if all(score is not None for score in stored):
+                    for params, score in zip(candidates, stored):
+                        self._scores[(json.dumps(params, sort_keys=True), fold)] = score
+                else:
+                    self.pending_.append((setting, candidates, fold))
+        self.n_stored_ = len(self._scores)
+        self.n_fits_ = len(self.pending_)
+        if self.store is not None:
+            self.logger.info(f"🗄️ {type(self.estimator).__name__}: {self.n_stored_} fold scores from the evaluation "
+                             f"store, {self.n_fits_} fits to run.")
+        return self.pending_
+
+    def job(self, X, y, index: int, key=None):
+        """Delayed call for pending job index; its result is (key or index, scores, seconds)."""
+        setting, _, fold = self.pending_[index]
+        return delayed(_timed)(index if key is None else key, self._job_fn(),
+                               clone(self._base).set_params(**setting), X, y, *self.cv[fold], *self._job_args())
+
+    def collect(self, index: int, job_scores: list, fit_seconds: float) -> None:
+        """Takes one finished job's scores and commits them to the store."""
+        _, candidates, fold = self.pending_[index]
+        for params, score in zip(candidates, job_scores):
+            self._scores[(json.dumps(params, sort_keys=True), fold)] = score
+            if self.store is not None:
+                self.store.record(self.data_fingerprint, self._base, params, self._fold_fingerprints[fold],
+                                  score, fit_seconds, self._variant_key)
+
+    def select(self):
+        """Ranks the candidates once every score is in; returns the unfitted best estimator."""
+        candidates = list(ParameterGrid(self.param_grid))
+        fold_scores = np.array([[self._scores[(json.dumps(params, sort_keys=True), fold)]
+                                 for fold in range(len(self.cv))] for params in candidates], dtype=np.float64)
+        mean_scores = fold_scores.mean(axis=1)
+        self.cv_results_ = {
+            "params": candidates,
+            "mean_test_score": mean_scores,
+            "std_test_score": fold_scores.std(axis=1),
+        }
+        self.best_index_ = int(np.argmax(np.where(np.isnan(mean_scores), -np.inf, mean_scores)))
+        self.best_params_ = candidates[self.best_index_]
+        self.best_score_ = float(mean_scores[self.best_index_])
+        return clone(self._base).set_params(**self.best_params_)
+
+    def finish(self, best_estimator) -> None:
+        self.best_estimator_ = best_estimator
+        self.elapsed_seconds_ = time.perf_counter() - self._start_time
+        self.logger.info(f"🔎 {type(self).__name__} of {type(self.estimator).__name__}: {len(self.cv_results_['params'])} "
+                         f"candidates, {self.n_fits_} fits in {self.elapsed_seconds_:.1f}s.")
+
+    def fit(self, X, y):
+        try:
+            self.plan(X, y)
+            results = Parallel(n_jobs=self.n_jobs, return_as="generator_unordered")(
+                self.job(X, y, index) for index in range(len(self.pending_))
+            )
+            for index, job_scores, fit_seconds in results:
+                self.collect(index, job_scores, fit_seconds)
+            self.finish(self.select().fit(X, y))
+            return self
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+
+class WarmStartGridSearch(StoredGridSearch):
+    """
+    GridSearchCV replacement for ensembles whose grid includes n_estimators.
+
+    Smaller ensembles are prefixes of the largest one, so every fold is fitted
+    once per setting of the other parameters and scored at each n_estimators on
+    the way (see _score_path); the exhaustive grid fits every size from scratch.
+    Scores, the tie-breaking of the best candidate (first in ParameterGrid order)
+    and the refit best_estimator_ match GridSearchCV for the same random_state,
+    and they share evaluation store entries with the exhaustive search.
+    early_stopping_rounds adds validation-based early stopping: forests and
+    AdaBoost stop growing (or scoring) after that many estimators without
+    improvement, gradient boosting uses its native n_iter_no_change on a
+    held-out validation_fraction of each training fold.
+    """
+
+    def __init__(self, estimator, param_grid: dict, cv: list, score_func=f1_score,
+                 early_stopping_rounds: int = None, tol: float = 1e-4, store: EvaluationStore = None,
+                 data_fingerprint: str = None, n_jobs: int = -1):
+        super().__init__(estimator, param_grid, cv, score_func=score_func, store=store,
+                         data_fingerprint=data_fingerprint, n_jobs=n_jobs)
+        self.early_stopping_rounds = early_stopping_rounds
+        self.tol = tol
+
+    @staticmethod
+    def supports(estimator, param_grid: dict) -> bool:
+        return (len(param_grid.get("n_estimators", [])) > 1
+                and (isinstance(estimator, (RandomForestClassifier, ExtraTreesClassifier))
+                     or hasattr(estimator, "staged_predict")))
+
+    def _base_estimator(self):
+        base_estimator = clone(self.estimator)
+        if self.early_stopping_rounds is not None and isinstance(base_estimator, GradientBoostingClassifier):
+            base_estimator.set_params(n_iter_no_change=self.early_stopping_rounds, tol=self.tol)
+        return base_estimator
+
+    def _variant(self):
+        # Early stopping changes forest and AdaBoost scores without changing their parameters
+        if self.early_stopping_rounds is None:
+            return None
+        return f"early_stopping_rounds={self.early_stopping_rounds},tol={self.tol}"
+
+    def _sizes(self) -> list:
+        return sorted(set(self.param_grid["n_estimators"]))
+
+    def _jobs(self) -> list:
+        settings = ParameterGrid({key: values for key, values in self.param_grid.items() if key != "n_estimators"})
+        return [(setting, [{**setting, "n_estimators": size} for size in self._sizes()]) for setting in settings]
+
+    def _job_fn(self):
+        return _score_path
+
+    def _job_args(self) -> tuple:
+        return self._sizes(), self.score_func, self.early_stopping_rounds, self.tol
+
+
+def _fit(estimator, X, y):
+    return estimator.fit(X, y)
+
+
+def _fit_and_score_train(estimator, X, y):
+    estimator.fit(X, y)
+    return estimator, estimator.score(X, y)
+
+
+class ModelSearchScheduler:
+    """
+    Runs the searches of several model families as one global task pool under a core budget.
+
+    Every pending (family, candidate, fold) job of every search goes into a
+    single joblib pool of cpu_budget // threads_per_worker workers, largest
+    ensembles first so no long fit is left to run alone at the end. Families
+    without a grid are plain estimators, fitted and scored on the training
+    data. Once all scores are in, the refits of every family's best candidate
+    and the plain fits share a second pool. BLAS/OpenMP threads are pinned to
+    threads_per_worker in the workers and in this process, so nested
+    parallelism never oversubscribes the budget. After run(), family_stats_ holds
+    each family's totals: its CV fits and their summed worker seconds, the scores
+    taken from the evaluation store, its best score and the final fit's seconds.
+    """
+
+    def __init__(self, families: dict, cpu_budget: int = None, threads_per_worker: int = 1):
+        self.families = families
+        self.cpu_budget = max(int(cpu_budget or os.cpu_count() or 1), 1)
+        self.threads_per_worker = max(min(threads_per_worker, self.cpu_budget), 1)
+        self.n_workers = max(self.cpu_budget // self.threads_per_worker, 1)
+        self.logger = Custom_Logger().get_logger()
+
+    @staticmethod
+    def _job_cost(search: StoredGridSearch, index: int) -> int:
+        # Tree count stands in for fit time; a path job builds its largest ensemble
+        setting, candidates, _ = search.pending_[index]
+        return max([params.get("n_estimators", 1) for params in candidates] + [setting.get("n_estimators", 1)])
+
+    def run(self, X, y) -> tuple:
+        """Returns ({family: score}, {family: fitted estimator}) like the sequential grid search."""
+        try:
+            start_time = time.perf_counter()
+            searches = {name: family for name, family in self.families.items() if isinstance(family, StoredGridSearch)}
+            jobs = []
+            for name, search in searches.items():
+                jobs.extend((name, index) for index in range(len(search.plan(X, y))))
+            jobs.sort(key=lambda job: self._job_cost(searches[job[0]], job[1]), reverse=True)
+            self.logger.info(f"🧮 Scheduling {len(jobs)} fits of {len(searches)} searches on {self.n_workers} workers "
+                             f"x {self.threads_per_worker} threads.")
+
+            with threadpool_limits(limits=self.threads_per_worker), \
+                    parallel_config(backend="loky", inner_max_num_threads=self.threads_per_worker):
+                parallel = Parallel(n_jobs=self.n_workers, return_as="generator_unordered")
+                fit_seconds = {name: 0.0 for name in searches}
+                for (name, index), job_scores, seconds in parallel(
+                        searches[name].job(X, y, index, key=(name, index)) for name, index in jobs):
+                    searches[name].collect(index, job_scores, seconds)
+                    fit_seconds[name] += seconds
+
+                final_fits = [delayed(_timed)(name, _fit, search.select(), X, y) for name, search in searches.items()]
+                final_fits.extend(delayed(_timed)(name, _fit_and_score_train, estimator, X, y)
+                                  for name, estimator in self.families.items() if name not in searches)
+                model_report, models, family_stats = {}, {}, {}
+                for name, result, seconds in parallel(final_fits):
+                    if name in searches:
+                        searches[name].finish(result)
+                        model_report[name], models[name] = searches[name].best_score_, result
+                        self.logger.info(f"{name}: {searches[name].n_fits_} fits ({fit_seconds[name]:.1f}s of worker "
+                                         f"time), best params {searches[name].best_params_}")
+                        family_stats[name] = {"n_fits": searches[name].n_fits_,
+                                              "n_stored_scores": searches[name].n_stored_,
+                                              "fit_seconds": round(fit_seconds[name], 6),
+                                              "best_score": model_report[name], "score": "cv",
+                                              "best_params": searches[name].best_params_}
+                    else:
+                        models[name], model_report[name] = result
+                        family_stats[name] = {"n_fits": 0, "n_stored_scores": 0, "fit_seconds": 0.0,
+                                              "best_score": model_report[name], "score": "train", "best_params": {}}
+                    # The fit on the full training data: the best candidate's refit, or the plain estimator's fit
+                    family_stats[name]["refit_seconds"] = round(seconds, 6)
+            self.family_stats_ = {name: family_stats[name] for name in self.families}
+            self.elapsed_seconds_ = time.perf_counter() - start_time
+            self.logger.info(f"✅ Scheduled search finished in {self.elapsed_seconds_:.1f}s.")
+            # Callers iterate the families in their declared order
+            return ({name: model_report[name] for name in self.families},
+                    {name: models[name] for name in self.families})
+        except Exception as e:
+            raise CustomException(e, sys) from e
@@ -1,121 +1,268 @@
 import os
 import sys
+import json
 import numpy as np
+from dataclasses import asdict
 from networksecurity.logger.customlogger import Custom_Logger
 from networksecurity.exception.exception import CustomException
 from networksecurity.utils.ml_metric.classification_metric import get_classification_score
-from networksecurity.entity.config_entity import ModelTrainerConfigEntity, DataTransformationConfigEntity
-from networksecurity.entity.artifact_entity import DataTransformationArtifact, ModelTrainerArtifact
-from networksecurity.utils.main_utils import save_obj, load_obj, load_numpy_array_data, evaluate_models
+from networksecurity.entity.config_entity import (
+    ModelTrainerConfigEntity,
+    DataTransformationConfigEntity,
+    ExperimentTrackingConfigEntity
+)
+from networksecurity.entity.artifact_entity import (
+    DataTransformationArtifact,
+    ModelTrainerArtifact,
+    ClassificationMetricArtifact
+)
+from networksecurity.utils.main_utils import save_obj, load_obj_cached, load_numpy_array_data, evaluate_models
 from networksecurity.utils.model_metric.estimator import NetworkModel
+from networksecurity.utils.model_metric.compiled_ensemble import compile_ensemble
+from networksecurity.utils.shared_array_store import SharedArrayStore, precompute_folds
+from networksecurity.utils.profiler import StageProfiler
+from networksecurity.utils.experiment_tracker import ExperimentTracker
+from networksecurity.components.model_search import (
+    BudgetedModelSearch,
+    StoredGridSearch,
+    WarmStartGridSearch,
+    ModelSearchScheduler
+)
+from networksecurity.utils.evaluation_store import EvaluationStore, fingerprint_arrays
 from sklearn.linear_model import LogisticRegression
 from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier, AdaBoostClassifier
 from sklearn.tree import DecisionTreeClassifier
 from sklearn.neighbors import KNeighborsClassifier
-from sklearn.model_selection import GridSearchCV
-
-# import mlflow
-# import dagshub
-# dagshub.init(repo_owner='Ananddd06', repo_name='Network_Security_end_to_end_Mlops_DVC_Mlflow', mlflow=True)
 
 
 class ModelTrainer:
     def __init__(self, model_trainer_config: ModelTrainerConfigEntity,
-                 data_transformation_artifact: DataTransformationArtifact):
+                 data_transformation_artifact: DataTransformationArtifact, profiler: StageProfiler = None,
+                 tracker: ExperimentTracker = None):
         try:
             self.model_trainer_config = model_trainer_config
             self.data_transformation_artifact = data_transformation_artifact
+            # Per-family spans go into the pipeline's run report; standalone use records nothing
+            self.profiler = profiler if profiler is not None else StageProfiler(enabled=False)
+            # Cores the searches may occupy; the pipeline DAG reserves the whole budget for training
+            self.cpu_budget = self.model_trainer_config.training_pipeline_config.dag_cpu_budget
+            # One tracked run per train_model call; started there, so constructing a trainer costs nothing
+            self.tracker = tracker if tracker is not None else ExperimentTracker.from_config(
+                ExperimentTrackingConfigEntity(training_pipeline_config=self.model_trainer_config.training_pipeline_config)
+            )
             self.logger = Custom_Logger().get_logger()
             self.logger.info("Model Trainer initialized with configuration and artifacts.")
         except Exception as e:
             raise CustomException(e, sys) from e
     
-    # def track_mlflow(self, model, classification_metric):
-    #     """
-    #     Track the model and its metrics using MLflow.
-        
-    #     Args:
-    #         model: The trained model to log.
-    #         classification_metric: The classification metrics to log.
-    #     """
-    #     try:
-    #         self.logger.info("Starting MLflow tracking.")
-    #         # mlflow.set_experiment(experiment_name="Network Security Model Training")
-    #         with mlflow.start_run():
-    #             mlflow.log_metric("precision", classification_metric.precision)
-    #             mlflow.log_metric("recall", classification_metric.recall)
-    #             mlflow.log_metric("f1_score", classification_metric.f1_score)
-    #             mlflow.log_metric("r2_score", classification_metric.r2_score)
-    #             self.logger.info("MLflow tracking completed successfully.")
-    #     except Exception as e:
-    #         raise CustomException(e, sys)
-    
-    def train_model(self, X_train, y_train, X_test, y_test) -> ModelTrainerArtifact:
+    def track_experiment(self, best_model_name: str, best_model, best_model_score: float,
+                         classification_train_metric: ClassificationMetricArtifact,
+                         classification_test_metric: ClassificationMetricArtifact,
+                         artifact_file_paths: list) -> None:
+        """
+        Queues the run's outcome on the experiment tracker; its writer thread does the file I/O.
+        Per-candidate CV results are queued by the searches. artifact_file_paths are the files
+        this run wrote: the artifact directory is shared across runs, so files that merely
+        exist there may belong to an earlier run.
+        """
         try:
-            self.logger.info("Starting model training process.")
-            
-            models = {
-                'Logistic Regression': LogisticRegression(),
-                'Random Forest': RandomForestClassifier(),
-                'Gradient Boosting': GradientBoostingClassifier(),
-                'AdaBoost': AdaBoostClassifier(),
-                'Decision Tree': DecisionTreeClassifier(),
-                'KNeighbors': KNeighborsClassifier()
-            }
+            self.tracker.log_params({"best_model": best_model_name,
+                                     **{f"best_model.{key}": value
+                                        for key, value in best_model.get_params(deep=False).items()}})
+            self.tracker.log_metrics({
+                "best_cv_score": best_model_score,
+                **{f"train_{key}": value for key, value in asdict(classification_train_metric).items()},
+                **{f"test_{key}": value for key, value in asdict(classification_test_metric).items()},
+            })
+            for file_path in artifact_file_paths:
+                self.tracker.log_artifact(file_path, artifact_path="model_trainer")
+        except Exception as e:
+            raise CustomException(e, sys) from e
 
-            params = {
-                "Decision Tree": {
-                    'criterion': ['gini', 'entropy', 'log_loss'],
-                },
-                "Random Forest": {
-                    'n_estimators': [8, 16, 32, 128, 256]
-                },
-                "Gradient Boosting": {
-                    'learning_rate': [0.1, 0.01, 0.05, 0.001],
-                    'subsample': [0.6, 0.7, 0.75, 0.85, 0.9],
-                    'n_estimators': [8, 16, 32, 64, 128, 256]
-                },
-                "Logistic Regression": {},
-                "AdaBoost": {
-                    'learning_rate': [0.1, 0.01, 0.001],
-                    'n_estimators': [8, 16, 32, 64, 128, 256]
-                }
+    def remove_compiled_model(self) -> None:
+        if os.path.exists(self.model_trainer_config.compiled_model_file_path):
+            os.remove(self.model_trainer_config.compiled_model_file_path)
+            self.logger.info(f"Removed stale compiled model {self.model_trainer_config.compiled_model_file_path}")
+
+    def export_compiled_model(self, model, X_reference):
+        """
+        Saves tree ensembles as a CompiledEnsemble (plain NumPy arrays) for fast scoring.
+        The export is skipped unless it reproduces model.predict on X_reference exactly;
+        a skipped export also removes a previous run's file, which no longer matches the model.
+        Returns the saved file's path, or None when the export is skipped.
+        """
+        try:
+            if not isinstance(model, (RandomForestClassifier, GradientBoostingClassifier,
+                                      AdaBoostClassifier, DecisionTreeClassifier)):
+                self.logger.info(f"Skipping compiled export: {type(model).__name__} is not a tree ensemble.")
+                self.remove_compiled_model()
+                return None
+            compiled_model = compile_ensemble(model)
+            if not np.array_equal(compiled_model.predict(X_reference), model.predict(X_reference)):
+                self.logger.warning("Compiled ensemble predictions differ from the model; export skipped.")
+                self.remove_compiled_model()
+                return None
+            os.makedirs(os.path.dirname(self.model_trainer_config.compiled_model_file_path), exist_ok=True)
+            compiled_model.save(self.model_trainer_config.compiled_model_file_path)
+            self.logger.info(f"Compiled ensemble saved at {self.model_trainer_config.compiled_model_file_path}")
+            return self.model_trainer_config.compiled_model_file_path
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    @staticmethod
+    def get_models() -> dict:
+        return {
+            'Logistic Regression': LogisticRegression(),
+            'Random Forest': RandomForestClassifier(),
+            'Gradient Boosting': GradientBoostingClassifier(),
+            'AdaBoost': AdaBoostClassifier(),
+            'Decision Tree': DecisionTreeClassifier(),
+            'KNeighbors': KNeighborsClassifier()
+        }
+
+    @staticmethod
+    def get_param_grids() -> dict:
+        return {
+            "Decision Tree": {
+                'criterion': ['gini', 'entropy', 'log_loss'],
+            },
+            "Random Forest": {
+                'n_estimators': [8, 16, 32, 128, 256]
+            },
+            "Gradient Boosting": {
+                'learning_rate': [0.1, 0.01, 0.05, 0.001],
+                'subsample': [0.6, 0.7, 0.75, 0.85, 0.9],
+                'n_estimators': [8, 16, 32, 64, 128, 256]
+            },
+            "Logistic Regression": {},
+            "AdaBoost": {
+                'learning_rate': [0.1, 0.01, 0.001],
+                'n_estimators': [8, 16, 32, 64, 128, 256]
             }
-            
-            model_report = {}
-            
-            for model_name, model in models.items():
-                self.logger.info(f"Training and tuning {model_name}...")
-                
-                param_grid = params.get(model_name, {})
-                
-                if param_grid:
-                    grid_search = GridSearchCV(
-                        estimator=model,
-                        param_grid=param_grid,
-                        cv=3,
-                        verbose=3,     # <-- This enables detailed terminal output during fitting
-                        n_jobs=-1,
-                        scoring='f1'
+        }
+
+    def run_grid_search(self, models: dict, params: dict, X_train, y_train, cv_folds: list):
+        """
+        Grid search of every family over shared folds; returns the best score and fitted estimator of each.
+        All (family, candidate, fold) fits run as one task pool under the pipeline's CPU budget.
+        In "warm_start" mode, families with an n_estimators grid score the whole path from one fit per fold.
+        CV scores are read from and recorded to the evaluation store, so reruns fit only new candidates.
+        """
+        try:
+            with EvaluationStore(self.model_trainer_config.evaluation_store_file_path,
+                                 enabled=self.model_trainer_config.evaluation_store_enabled) as evaluation_store:
+                # Hashed once; every family's stored scores are keyed by it
+                data_fingerprint = fingerprint_arrays(X_train, y_train) if evaluation_store.enabled else None
+                families = {}
+                for model_name, model in models.items():
+                    param_grid = params.get(model_name, {})
+                    if (self.model_trainer_config.search_mode == "warm_start"
+                            and WarmStartGridSearch.supports(model, param_grid)):
+                        families[model_name] = WarmStartGridSearch(
+                            estimator=model,
+                            param_grid=param_grid,
+                            cv=cv_folds,
+                            early_stopping_rounds=self.model_trainer_config.early_stopping_rounds,
+                            tol=self.model_trainer_config.early_stopping_tol,
+                            store=evaluation_store,
+                            data_fingerprint=data_fingerprint
+                        )
+                    elif param_grid:
+                        # Same candidates and selection as GridSearchCV, fitting only unstored (candidate, fold) pairs
+                        families[model_name] = StoredGridSearch(
+                            estimator=model,
+                            param_grid=param_grid,
+                            cv=cv_folds,
+                            store=evaluation_store,
+                            data_fingerprint=data_fingerprint
+                        )
+                    else:
+                        families[model_name] = model
+
+                # Families share one pool, so the search is one span; per-family totals go to the report's families
+                with self.profiler.span("grid_search", category="model_search", rows=len(y_train)):
+                    scheduler = ModelSearchScheduler(
+                        families=families,
+                        cpu_budget=self.cpu_budget,
+                        threads_per_worker=self.model_trainer_config.threads_per_worker
                     )
-                    grid_search.fit(X_train, y_train)
-                    best_model = grid_search.best_estimator_
-                    best_score = grid_search.best_score_
-                    self.logger.info(f"{model_name} best params: {grid_search.best_params_}")
-                else:
-                    model.fit(X_train, y_train)
-                    best_model = model
-                    best_score = model.score(X_train, y_train)
-                
-                model_report[model_name] = best_score
-                models[model_name] = best_model  # update with best estimator
-            
-            self.logger.info("Model evaluation completed.")
+                    model_report, models = scheduler.run(X_train, y_train)
+                for model_name, family_stats in scheduler.family_stats_.items():
+                    self.profiler.record_family(model_name, rows=len(y_train), **family_stats)
+                for model_name, family in families.items():
+                    if isinstance(family, StoredGridSearch):
+                        self.tracker.log_cv_results(model_name, family.cv_results_)
+                    else:
+                        self.tracker.log_cv_result(model_name, {}, model_report[model_name], score="train")
+            return model_report, models
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def run_budgeted_search(self, models: dict, params: dict, X_train, y_train):
+        """
+        Successive-halving search across all families; writes the per-candidate trace.
+        Returns the best family, its score and fitted estimator, and the trace file path.
+        """
+        try:
+            # Families are interleaved rung by rung, so the search is one span; the trace has per-candidate times
+            with self.profiler.span("budgeted_search", category="model_search", rows=len(y_train)):
+                search = BudgetedModelSearch(
+                    models=models,
+                    param_grids=params,
+                    cv=self.model_trainer_config.cv_folds,
+                    halving_factor=self.model_trainer_config.halving_factor,
+                    min_samples=self.model_trainer_config.halving_min_samples,
+                    time_budget_seconds=self.model_trainer_config.search_time_budget_seconds,
+                    max_fits=self.model_trainer_config.search_max_fits,
+                    family_abort_margin=self.model_trainer_config.family_abort_margin,
+                    n_jobs=self.cpu_budget
+                ).fit(X_train, y_train)
+            os.makedirs(os.path.dirname(self.model_trainer_config.search_trace_file_path), exist_ok=True)
+            search.save_trace(self.model_trainer_config.search_trace_file_path)
+            self.logger.info(f"Search trace saved at {self.model_trainer_config.search_trace_file_path}")
+            for result in search.trace_:
+                if result["status"] != "skipped_budget":
+                    self.tracker.log_cv_result(result["family"], json.loads(result["params"]), result["mean_score"],
+                                               result["std_score"], rung=result["rung"],
+                                               n_samples=result["n_samples"], status=result["status"])
+            return (search.best_family_, search.best_score_, search.best_estimator_,
+                    self.model_trainer_config.search_trace_file_path)
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def train_model(self, X_train, y_train, X_test, y_test) -> ModelTrainerArtifact:
+        self.tracker.start()
+        try:
+            self.logger.info("Starting model training process.")
             
-            # Select best model based on score
-            best_model_name = max(model_report, key=model_report.get)
-            best_model_score = model_report[best_model_name]
-            best_model = models[best_model_name]
+            models = self.get_models()
+            params = self.get_param_grids()
+            self.tracker.log_params({
+                "search_mode": self.model_trainer_config.search_mode,
+                "cv_folds": self.model_trainer_config.cv_folds,
+                "train_rows": len(y_train),
+                "test_rows": len(y_test),
+                "param_grids": params,
+            })
+
+            # Files written by this call, attached to the tracked run
+            artifact_file_paths = []
+            if self.model_trainer_config.search_mode == "halving":
+                best_model_name, best_model_score, best_model, search_trace_file_path = self.run_budgeted_search(
+                    models, params, X_train, y_train
+                )
+                artifact_file_paths.append(search_trace_file_path)
+            else:
+                # Folds are computed once and reused by every family
+                cv_folds = precompute_folds(y_train, self.model_trainer_config.cv_folds)
+                model_report, models = self.run_grid_search(models, params, X_train, y_train, cv_folds)
+
+                self.logger.info("Model evaluation completed.")
+
+                # Select best model based on score
+                best_model_name = max(model_report, key=model_report.get)
+                best_model_score = model_report[best_model_name]
+                best_model = models[best_model_name]
 
             self.logger.info(f"Best model selected: {best_model_name} with score: {best_model_score}")
 
@@ -124,18 +271,20 @@ class ModelTrainer:
             y_test_pred = best_model.predict(X_test)
 
             classification_train_metric = get_classification_score(y_true=y_train, y_pred=y_train_pred)
-
-            # self.track_mlflow(best_model, classification_train_metric)
             classification_test_metric = get_classification_score(y_true=y_test, y_pred=y_test_pred)
 
-            preprocessor = load_obj(file_path=self.data_transformation_artifact.transformed_object_file_path)
+            preprocessor = load_obj_cached(file_path=self.data_transformation_artifact.transformed_object_file_path)
             model_dir_path = os.path.dirname(self.model_trainer_config.trained_model_file_path)
             os.makedirs(model_dir_path, exist_ok=True)
 
             network_model = NetworkModel(preprocessor=preprocessor, model=best_model)
-            save_obj(file_path=self.model_trainer_config.trained_model_file_path, obj=network_model)
+            save_obj(file_path=self.model_trainer_config.trained_model_file_path, obj=network_model, mmap_arrays=True)
+            artifact_file_paths.append(self.model_trainer_config.trained_model_file_path)
 
             save_obj(file_path="final_model/model.pkl", obj=best_model)
+            compiled_model_file_path = self.export_compiled_model(best_model, X_test)
+            if compiled_model_file_path is not None:
+                artifact_file_paths.append(compiled_model_file_path)
 
             model_trainer_artifact = ModelTrainerArtifact(
                 trained_model_file_path=self.model_trainer_config.trained_model_file_path,
@@ -143,10 +292,15 @@ class ModelTrainer:
                 test_metric_artifact=classification_test_metric
             )
 
+            self.track_experiment(best_model_name, best_model, best_model_score,
+                                  classification_train_metric, classification_test_metric, artifact_file_paths)
+            self.tracker.end(status="FINISHED")
+
             self.logger.info(f"ModelTrainerArtifact created: {model_trainer_artifact}")
             return model_trainer_artifact
 
         except Exception as e:
+            self.tracker.end(status="FAILED")
             raise CustomException(e, sys)
     
     def initiate_model_trainer(self) -> ModelTrainerArtifact:
@@ -154,18 +308,23 @@ class ModelTrainer:
             train_file_path = self.data_transformation_artifact.transformed_train_file_path
             test_file_path = self.data_transformation_artifact.transformed_test_file_path
 
-            # Load transformed data arrays
-            train_arr = load_numpy_array_data(file_path=train_file_path)
-            test_arr = load_numpy_array_data(file_path=test_file_path)
+            # Load transformed data arrays without reading them into memory
+            train_arr = load_numpy_array_data(file_path=train_file_path, mmap_mode="r")
+            test_arr = load_numpy_array_data(file_path=test_file_path, mmap_mode="r")
 
-            # Split features and target
-            X_train, y_train = train_arr[:, :-1], train_arr[:, -1]
-            X_test, y_test = test_arr[:, :-1], test_arr[:, -1]
+            # Split features and target into one shared, memory-mapped copy each,
+            # so CV workers of every model family read the same pages
+            with SharedArrayStore(root_dir=self.model_trainer_config.shared_data_root) as shared_store:
+                X_train = shared_store.put("X_train", train_arr[:, :-1])
+                y_train = shared_store.put("y_train", train_arr[:, -1])
+                X_test = shared_store.put("X_test", test_arr[:, :-1])
+                y_test = shared_store.put("y_test", test_arr[:, -1])
+                del train_arr, test_arr
 
-            self.logger.info("Loaded and split training and testing data successfully.")
-            
-            # Start training
-            model_trainer_artifact = self.train_model(X_train, y_train, X_test, y_test)
+                self.logger.info("Loaded and split training and testing data successfully.")
+
+                # Start training
+                model_trainer_artifact = self.train_model(X_train, y_train, X_test, y_test)
             
             self.logger.info("Model training completed successfully.")
             return model_trainer_artifact
@@ -1,14 +1,29 @@
-import os 
+import os
 import sys
 import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Iterator
 
 import certifi
 import pandas as pd
-import numpy as np 
+import numpy as np
 import pymongo
 from pymongo import MongoClient
+from pymongo.errors import BulkWriteError, ConnectionFailure
 from networksecurity.logger.customlogger import Custom_Logger
 from networksecurity.exception.exception import CustomException
+from networksecurity.entity.artifact_entity import MongoBulkLoadArtifact
+from networksecurity.constants.training_pipeline import (
+    DATA_INGESTION_SOURCE_PATH,
+    MONGO_DB_DATABASE_NAME,
+    MONGO_DB_COLLECTION_NAME,
+    MONGO_CLIENT_MAX_POOL_SIZE,
+    MONGO_BULK_BATCH_SIZE,
+    MONGO_BULK_MAX_WORKERS,
+    MONGO_BULK_MAX_RETRIES
+)
 
 log = Custom_Logger().get_logger()
 
@@ -22,13 +37,48 @@ if not MONGO_DB_URL:
 
 ca = certifi.where()
 
+# Duplicate key: the document is already in the collection, e.g. from an earlier attempt of the same batch
+DUPLICATE_KEY_ERROR_CODE = 11000
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_mongo_client(url: str = None) -> MongoClient:
+    """One pooled, thread-safe MongoClient per URL for the whole process."""
+    url = url or MONGO_DB_URL
+    with _clients_lock:
+        if url not in _clients:
+            _clients[url] = pymongo.MongoClient(url, tlsCAFile=ca, maxPoolSize=MONGO_CLIENT_MAX_POOL_SIZE)
+        return _clients[url]
+
+
 class MongoDBConnection:
-    def __init__(self):
+    """
+    Loads CSV data into MongoDB.
+
+    bulk_insert_csv streams the CSV in batch_size record batches and keeps at most
+    2 * max_workers of them in flight, each sent by a writer thread as an unordered
+    insert_many through the shared client. Pass client= to use another
+    pymongo-compatible client (e.g. mongomock.MongoClient() in tests).
+    """
+
+    def __init__(self, client: MongoClient = None, batch_size: int = MONGO_BULK_BATCH_SIZE,
+                 max_workers: int = MONGO_BULK_MAX_WORKERS, max_retries: int = MONGO_BULK_MAX_RETRIES):
         try:
-            pass
+            self.client = client
+            self.batch_size = batch_size
+            self.max_workers = max_workers
+            self.max_retries = max_retries
         except Exception as e:
             raise CustomException(f"Error initializing MongoDBConnection: {str(e)}", sys)
-    
+
+    @property
+    def mongo_client(self) -> MongoClient:
+        if self.client is None:
+            self.client = get_mongo_client()
+        return self.client
+
     def cv_to_json_converter(self, file_path):
         try:
             data = pd.read_csv(file_path)
@@ -37,33 +87,121 @@ class MongoDBConnection:
             return records
         except Exception as e:
             raise CustomException(f"Error converting CSV to JSON: {str(e)}", sys)
-    
-    def insert_data_to_mongodb(self, records, database , collection):
+
+    def iter_csv_record_batches(self, file_path: str) -> Iterator[list]:
+        """Yields the CSV as lists of at most batch_size documents, without loading the whole file."""
         try:
-            self.database = database
-            self.collection = collection
-            self.records = records
+            for chunk in pd.read_csv(file_path, chunksize=self.batch_size):
+                yield chunk.to_dict(orient="records")
+        except Exception as e:
+            raise CustomException(f"Error converting CSV to JSON: {str(e)}", sys)
 
-            print("Number of records to insert:", len(self.records))
-            if self.records:
-                print("Sample record:", self.records[0])
+    def _insert_batch(self, collection, records: list) -> tuple:
+        """
+        Inserts one batch unordered and returns (inserted, duplicates, failed).
+        Connection errors retry the batch with backoff; insert_many assigns each
+        document its _id up front, so documents that did land before a failure come
+        back as duplicate-key errors on the retry instead of being stored twice.
+        Those are counted as inserted, not as duplicates: only documents that were
+        already in the collection before this batch count as duplicates.
+        """
+        # Documents whose _id insert_many generates on the first attempt: no one else can hold that _id
+        generated_ids = {id(record) for record in records if "_id" not in record}
+        connection_failed = False
+        inserted = duplicates = 0
+        for attempt in range(self.max_retries + 1):
+            try:
+                result = collection.insert_many(records, ordered=False)
+                return inserted + len(result.inserted_ids), duplicates, 0
+            except BulkWriteError as e:
+                inserted += e.details.get("nInserted", 0)
+                write_errors = e.details.get("writeErrors", [])
+                for error in write_errors:
+                    if error.get("code") != DUPLICATE_KEY_ERROR_CODE:
+                        continue
+                    if connection_failed and id(records[error["index"]]) in generated_ids:
+                        # Landed on the attempt that lost its connection
+                        inserted += 1
+                    else:
+                        duplicates += 1
+                failed_indexes = {error["index"] for error in write_errors
+                                  if error.get("code") != DUPLICATE_KEY_ERROR_CODE}
+                if not failed_indexes:
+                    return inserted, duplicates, 0
+                records = [record for index, record in enumerate(records) if index in failed_indexes]
+                last_error = e
+            except ConnectionFailure as e:
+                connection_failed = True
+                last_error = e
+            if attempt < self.max_retries:
+                time.sleep(min(0.5 * 2 ** attempt, 8.0))
+        log.error(f"❌ Giving up on {len(records)} documents after {self.max_retries} retries: {last_error}")
+        return inserted, duplicates, len(records)
+
+    def bulk_insert(self, record_batches, database: str, collection: str) -> MongoBulkLoadArtifact:
+        """Inserts an iterable of record batches with max_workers concurrent writers."""
+        try:
+            target = self.mongo_client[database][collection]
+            start_time = time.perf_counter()
+            records_read = inserted_count = duplicate_count = failed_count = 0
+
+            def collect(done_futures) -> None:
+                nonlocal inserted_count, duplicate_count, failed_count
+                for future in done_futures:
+                    inserted, duplicates, failed = future.result()
+                    inserted_count += inserted
+                    duplicate_count += duplicates
+                    failed_count += failed
+
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="mongo-writer") as executor:
+                pending = set()
+                for records in record_batches:
+                    if not records:
+                        continue
+                    records_read += len(records)
+                    pending.add(executor.submit(self._insert_batch, target, records))
+                    # Bounded in-flight batches keep memory flat however large the source is
+                    if len(pending) >= 2 * self.max_workers:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        collect(done)
+                collect(pending)
+
+            elapsed_seconds = time.perf_counter() - start_time
+            records_per_second = records_read / elapsed_seconds if elapsed_seconds > 0 else 0.0
+            log.info(f"✅ Bulk load into {database}.{collection}: {inserted_count} inserted, "
+                     f"{duplicate_count} duplicates, {failed_count} failed of {records_read} read "
+                     f"in {elapsed_seconds:.2f}s ({records_per_second:,.0f} records/sec)")
+            return MongoBulkLoadArtifact(
+                records_read=records_read,
+                inserted_count=inserted_count,
+                duplicate_count=duplicate_count,
+                failed_count=failed_count,
+                elapsed_seconds=elapsed_seconds,
+                records_per_second=records_per_second
+            )
+        except Exception as e:
+            raise CustomException(f"Unexpected error: {str(e)}", sys)
+
+    def bulk_insert_csv(self, file_path: str, database: str = MONGO_DB_DATABASE_NAME,
+                        collection: str = MONGO_DB_COLLECTION_NAME) -> MongoBulkLoadArtifact:
+        return self.bulk_insert(self.iter_csv_record_batches(file_path), database, collection)
+
+    def insert_data_to_mongodb(self, records, database , collection):
+        try:
+            log.info(f"Number of records to insert: {len(records)}")
+            if records:
+                log.info(f"Sample record: {records[0]}")
             else:
-                print("No records to insert!")
-
-            self.mongo_client = pymongo.MongoClient(MONGO_DB_URL, tlsCAFile=ca)
-            self.database = self.mongo_client[self.database]
-            self.collection = self.database[self.collection]
-            self.collection.insert_many(self.records)
-            log.info(f"Data inserted successfully into {self.database.name}.{self.collection.name}")
-            return (len(self.records))
+                log.warning("⚠️ No records to insert!")
+
+            batches = (records[start:start + self.batch_size] for start in range(0, len(records), self.batch_size))
+            load_artifact = self.bulk_insert(batches, database, collection)
+            return load_artifact.inserted_count
         except Exception as e:
             raise CustomException(f"Unexpected error: {str(e)}", sys)
 
 if __name__ == "__main__":
-    FILE_PATH = "/Users/anand/Desktop/Network_Security_End_to_End_mlops_DVC_Dagshub/Network_Data/phisingData.csv"
-    DATABASE = "network_security" # <-- use the existing database name, all lowercase
-    COLLECTION = "NetworkData"
+    FILE_PATH = sys.argv[1] if len(sys.argv) > 1 else DATA_INGESTION_SOURCE_PATH
     networkobj = MongoDBConnection()
-    records = networkobj.cv_to_json_converter(FILE_PATH)
-    inserted_count = networkobj.insert_data_to_mongodb(records, DATABASE, COLLECTION)
-    log.info(f"Inserted {inserted_count} records into MongoDB collection {COLLECTION} in database {DATABASE}.")
\ No newline at end of file
+    load_artifact = networkobj.bulk_insert_csv(FILE_PATH, MONGO_DB_DATABASE_NAME, MONGO_DB_COLLECTION_NAME)
+    log.info(f"📦 Mongo Bulk Load Artifact: {load_artifact}")
@@ -14,12 +14,62 @@ FILE_NAME: str = "phisingData.csv"
 TRAIN_FILE_NAME: str = "train.csv"
 TEST_FILE_NAME: str = "test.csv"
 
+"""
+Feature store related constants: ingested and validated data is stored as int8 columns
+"""
+FEATURE_STORE_FILE_EXTENSION: str = ".nsfs"
+FEATURE_STORE_FILE_NAME: str = "phisingData" + FEATURE_STORE_FILE_EXTENSION
+TRAIN_FEATURE_STORE_FILE_NAME: str = "train" + FEATURE_STORE_FILE_EXTENSION
+TEST_FEATURE_STORE_FILE_NAME: str = "test" + FEATURE_STORE_FILE_EXTENSION
+# None keeps chunks memory-mappable; "zlib" trades read time for ~5x smaller files
+FEATURE_STORE_COMPRESSION: str = None
+FEATURE_STORE_ROW_GROUP_SIZE: int = 262_144
+
 SCHEMA_FILE_PATH = os.path.join("config", "schema.yaml")
 MODEL_FILE_PATH: str = os.path.join("config", "model.yaml")
 
 SAVED_MODEL_DIR: str = os.path.join("saved_models")
 MODEL_FILE_NAME: str = "model.pkl"
 
+"""
+Stage cache related constants: stages whose input fingerprint is unchanged are skipped
+"""
+STAGE_CACHE_DIR_NAME: str = "stage_cache"
+STAGE_CACHE_ENABLED: bool = True
+
+"""
+Run report related constants: per-stage wall/CPU time, peak RSS, rows/sec and I/O of each pipeline run
+"""
+RUN_REPORT_ENABLED: bool = True
+RUN_REPORT_DIR_NAME: str = "run_report"
+RUN_REPORT_FILE_NAME: str = "run_report.json"
+# Trace Event Format file for chrome://tracing / Perfetto; None disables the export
+RUN_REPORT_CHROME_TRACE_FILE_NAME: str = "chrome_trace.json"
+
+"""
+DAG executor related constants: stages and their independent sub-tasks run as a task graph
+"""
+# CPU units the running tasks may hold at once; model training claims the whole budget
+DAG_CPU_BUDGET: int = os.cpu_count() or 1
+
+"""
+Object cache related constants used by load_obj_cached / save_obj
+"""
+OBJECT_CACHE_MAX_ENTRIES: int = 16
+OBJECT_CACHE_MAX_BYTES: int = 1024 * 1024 * 1024
+# NumPy arrays at least this large are saved beside the pickle and memory-mapped on load
+OBJECT_MMAP_MIN_ARRAY_BYTES: int = 1024 * 1024
+
+"""
+MongoDB related constants used by the bulk loader in configuration/mongodb_connection.py
+"""
+MONGO_DB_DATABASE_NAME: str = "network_security"
+MONGO_DB_COLLECTION_NAME: str = "NetworkData"
+MONGO_CLIENT_MAX_POOL_SIZE: int = 16
+MONGO_BULK_BATCH_SIZE: int = 5_000
+MONGO_BULK_MAX_WORKERS: int = 4
+MONGO_BULK_MAX_RETRIES: int = 3
+
 """
 Data ingestion related constants
 Reading directly from the local CSV file
@@ -31,6 +81,19 @@ DATA_INGESTION_DIR_NAME: str = "data_ingestion"
 DATA_INGESTION_FEATURE_STORE_DIR: str = "feature_store"
 DATA_INGESTION_INGESTED_DIR: str = "ingested"
 DATA_INGESTION_TRAIN_TEST_SPLIT_RATIO: float = 0.2
+# "batch" splits the whole source in memory; "streaming" appends only new source rows, split by row hash
+DATA_INGESTION_MODE: str = "batch"
+DATA_INGESTION_CHUNK_SIZE: int = 100_000
+DATA_INGESTION_STATE_FILE_NAME: str = "ingestion_state.json"
+# "csv" reads DATA_INGESTION_SOURCE_PATH; "mongodb" pulls new documents from the MONGO_DB collection
+DATA_INGESTION_SOURCE: str = "csv"
+DATA_INGESTION_MONGO_BATCH_SIZE: int = 10_000
+# Monotonic, indexed field used as the high-water mark (e.g. "_id" or an ingest timestamp)
+DATA_INGESTION_MONGO_WATERMARK_FIELD: str = "_id"
+# Each run re-reads this far behind the watermark (seconds for ObjectId/datetime fields, field units for numbers)
+# and drops documents it already ingested, so writes that commit out of watermark order are not skipped
+DATA_INGESTION_MONGO_WATERMARK_LAG_SECONDS: float = 300.0
+DATA_INGESTION_MONGO_STATE_FILE_NAME: str = "mongo_watermark.json"
 
 """
 Data validation related constants starts with DATA_VALIDATION VAR NAME
@@ -42,6 +105,13 @@ DATA_VALIDATION_INVALID_DIR = "invalid"
 DATA_VALIDATION_DRIFT_REPORT_DIR = "drift_report"
 DATA_VALIDATION_DRIFT_REPORT_FILE_NAME = "drift_report.html"
 DATA_VALIDATION_DRIFT_SUMMARY_FILE_NAME = "drift_summary.yaml" 
+# Value-count histograms of the validated train split, the drift reference for later data
+DATA_VALIDATION_REFERENCE_HISTOGRAM_FILE_NAME = "reference_histogram.json"
+# "none" only reports IQR outliers, "cap" clips them to the train bounds, "remove" drops their rows
+DATA_VALIDATION_OUTLIER_STRATEGY = "none"
+DATA_VALIDATION_OUTLIER_IQR_MULTIPLIER = 1.5
+# Non-int8 columns of larger inputs get their quartiles from a random sample of this many rows
+DATA_VALIDATION_OUTLIER_SAMPLE_SIZE = 100_000
 
 """
 Data transformation related constants
@@ -54,6 +124,8 @@ DATA_TRANSFORMATION_IMPUTER_PARAMS : dict = {
     "missing_values": np.nan,
     "n_neighbors": 3,
     "weights": "uniform",
+    "max_reference_rows": 50_000,
+    "random_state": 42,
 }
 
 """
@@ -62,6 +134,89 @@ MODEL TRAINER related constant start with MODEL_TRAINER var name
 MODEL_TRAINER_DIR_NAME: str = "model_trainer"
 MODEL_TRAINER_TRAINED_MODEL_DIR: str = "trained_model"
 MODEL_TRAINER_TRAINED_MODEL_NAME: str = "model.pkl"
+MODEL_TRAINER_COMPILED_MODEL_NAME: str = "compiled_model.npz"
 MODEL_TRAINER_EXPECTED_SCORE: float = 0.6
 MODEL_TRAINER_OVER_FITTING_UNDER_FITTING_THRESHOLD :float = 0.05
-MODEL_TRAINER_MODEL_CONFIG_FILE_PATH: str = os.path.join("config", "model.yaml")
\ No newline at end of file
+MODEL_TRAINER_MODEL_CONFIG_FILE_PATH: str = os.path.join("config", "model.yaml")
+MODEL_TRAINER_CV_FOLDS: int = 3
+# Train/test arrays are shared with CV workers as memory-mapped files under this directory (tmpfs when available)
+MODEL_TRAINER_SHARED_DATA_ROOT: str = "/dev/shm"
+# "grid" fits every grid combination; "halving" runs the budgeted successive-halving search;
+# "warm_start" is the grid with each n_estimators path scored from one fit per fold
+MODEL_TRAINER_SEARCH_MODE: str = "grid"
+MODEL_TRAINER_SEARCH_TRACE_FILE_NAME: str = "search_trace.csv"
+MODEL_TRAINER_SEARCH_TIME_BUDGET_SECONDS: float = 600.0
+MODEL_TRAINER_SEARCH_MAX_FITS: int = 1000
+MODEL_TRAINER_HALVING_FACTOR: int = 3
+MODEL_TRAINER_HALVING_MIN_SAMPLES: int = 300
+MODEL_TRAINER_FAMILY_ABORT_MARGIN: float = 0.05
+# Warm-start search only: stop an ensemble after this many estimators without a validation gain of TOL (None disables)
+MODEL_TRAINER_EARLY_STOPPING_ROUNDS: int = None
+MODEL_TRAINER_EARLY_STOPPING_TOL: float = 1e-4
+# CV scores of grid searches persist across runs, keyed by data, estimator, params and fold
+MODEL_TRAINER_EVALUATION_STORE_ENABLED: bool = True
+MODEL_TRAINER_EVALUATION_STORE_DIR_NAME: str = "evaluation_store"
+MODEL_TRAINER_EVALUATION_STORE_FILE_NAME: str = "evaluations.sqlite"
+# Grid searches run DAG_CPU_BUDGET // THREADS_PER_WORKER workers, each with BLAS/OpenMP pinned to this many threads
+MODEL_TRAINER_THREADS_PER_WORKER: int = 1
+
+"""
+Prediction pipeline related constants start with PREDICTION var name
+"""
+PREDICTION_PIPELINE_DIR_NAME: str = "prediction_pipeline"
+PREDICTION_OUTPUT_FILE_NAME: str = "predictions.csv"
+PREDICTION_COLUMN_NAME: str = "predicted_column"
+PREDICTION_CHUNK_SIZE: int = 50_000
+PREDICTION_QUEUE_SIZE: int = 4
+
+"""
+Scoring server related constants start with SCORING_SERVER var name
+"""
+SCORING_SERVER_HOST: str = "127.0.0.1"
+SCORING_SERVER_PORT: int = 8080
+SCORING_SERVER_MAX_BATCH_SIZE: int = 256
+SCORING_SERVER_MAX_WAIT_MS: float = 5.0
+# Batches of at most this many rows are scored by the compiled ensemble, when the trainer exported one;
+# sklearn's per-tree loop is faster on larger batches. 0 always uses the sklearn model
+SCORING_SERVER_COMPILED_MODEL_MAX_ROWS: int = 64
+
+"""
+Drift monitor related constants start with DRIFT_MONITOR var name
+"""
+DRIFT_MONITOR_ENABLED: bool = True
+DRIFT_MONITOR_DIR_NAME: str = "drift_monitor"
+DRIFT_MONITOR_SUMMARY_FILE_NAME: str = "drift_monitor_summary.yaml"
+# Rolling window = DRIFT_MONITOR_WINDOW_SLOTS slots of DRIFT_MONITOR_SLOT_ROWS scored rows
+DRIFT_MONITOR_WINDOW_SLOTS: int = 12
+DRIFT_MONITOR_SLOT_ROWS: int = 10_000
+DRIFT_MONITOR_MIN_ROWS: int = 1_000
+# PSI >= 0.2 is the usual "significant shift" level
+DRIFT_MONITOR_PSI_THRESHOLD: float = 0.2
+DRIFT_MONITOR_SUMMARY_INTERVAL_SECONDS: float = 60.0
+DRIFT_MONITOR_MAX_ALERTS: int = 100
+
+"""
+Experiment tracking related constants start with EXPERIMENT_TRACKING var name
+"""
+EXPERIMENT_TRACKING_ENABLED: bool = True
+# Local file-backed store: <dir>/<experiment>/<run id>/{meta.json, events.jsonl, artifacts/}
+EXPERIMENT_TRACKING_DIR_NAME: str = "experiment_tracking"
+EXPERIMENT_TRACKING_EXPERIMENT_NAME: str = "Network Security Model Training"
+# The writer thread flushes whatever is queued at least this often, in batches of up to BATCH_SIZE events
+EXPERIMENT_TRACKING_FLUSH_INTERVAL_SECONDS: float = 1.0
+EXPERIMENT_TRACKING_BATCH_SIZE: int = 1_000
+# Events are dropped, never waited on, once this many are queued
+EXPERIMENT_TRACKING_QUEUE_SIZE: int = 100_000
+
+"""
+Logging related constants start with LOG var name
+"""
+LOG_DIR_NAME: str = "log"
+# "json" writes one structured record per line to the log file; "text" keeps the console format
+LOG_FILE_FORMAT: str = "json"
+LOG_CONSOLE_ENABLED: bool = True
+# Records are dropped, never waited on, once this many are queued for the writer thread
+LOG_QUEUE_SIZE: int = 10_000
+# Hot paths (per request / per batch) log at this level or above, INFO and DEBUG one in every N calls
+LOG_HOT_PATH_LEVEL: str = "INFO"
+LOG_HOT_PATH_SAMPLE_EVERY: int = 1000
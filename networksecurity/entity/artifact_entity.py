@@ -14,6 +14,7 @@ class DataValidationArtifact:
     invalid_test_file_path: str
     drift_report_file_path: str
     drift_summary_file_path: str
+    reference_histogram_file_path: str = None
 
 @dataclass
 class DataTransformationArtifact:
@@ -33,4 +34,21 @@ class ModelTrainerArtifact:
     trained_model_file_path: str
     trained_metric_artifact: ClassificationMetricArtifact
     test_metric_artifact: ClassificationMetricArtifact
-    
+
+@dataclass
+class PredictionArtifact:
+    prediction_file_path: str
+    rows_processed: int
+    elapsed_seconds: float
+    rows_per_second: float
+    # Set when the input carries the target column
+    metric_artifact: ClassificationMetricArtifact = None
+
+@dataclass
+class MongoBulkLoadArtifact:
+    records_read: int
+    inserted_count: int
+    duplicate_count: int
+    failed_count: int
+    elapsed_seconds: float
+    records_per_second: float
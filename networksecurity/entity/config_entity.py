@@ -9,6 +9,16 @@ class TrainingPipelineConfigEntity:
         self.artifacts_name: str = training_pipeline.ARTIFACTS_DIR  # e.g., "artifacts"
         self.artifact_dir: str = os.path.join(self.artifacts_name, self.pipeline_name)
         self.timestamp: str = datetime.now().strftime("%Y%m%d%H%M%S")  # Keep this if you still want to log timestamp separately
+        self.stage_cache_dir: str = os.path.join(self.artifact_dir, training_pipeline.STAGE_CACHE_DIR_NAME)
+        self.stage_cache_enabled: bool = training_pipeline.STAGE_CACHE_ENABLED
+        # One report directory per run, so reports of successive runs can be compared
+        self.run_report_enabled: bool = training_pipeline.RUN_REPORT_ENABLED
+        self.run_report_dir: str = os.path.join(self.artifact_dir, training_pipeline.RUN_REPORT_DIR_NAME, self.timestamp)
+        self.run_report_file_path: str = os.path.join(self.run_report_dir, training_pipeline.RUN_REPORT_FILE_NAME)
+        self.chrome_trace_file_path: str = os.path.join(
+            self.run_report_dir, training_pipeline.RUN_REPORT_CHROME_TRACE_FILE_NAME
+        ) if training_pipeline.RUN_REPORT_CHROME_TRACE_FILE_NAME else None
+        self.dag_cpu_budget: int = training_pipeline.DAG_CPU_BUDGET
 
 
 @dataclass
@@ -20,16 +30,33 @@ class DataIngestionConfigEntity:
             self.training_pipeline_config.artifact_dir, training_pipeline.DATA_INGESTION_DIR_NAME
         )
         self.feature_store_file_path: str = os.path.join(
-            self.data_ingestion_dir, training_pipeline.DATA_INGESTION_FEATURE_STORE_DIR, training_pipeline.FILE_NAME
+            self.data_ingestion_dir, training_pipeline.DATA_INGESTION_FEATURE_STORE_DIR,
+            training_pipeline.FEATURE_STORE_FILE_NAME
         )
         self.training_file_path: str = os.path.join(
-            self.data_ingestion_dir, training_pipeline.DATA_INGESTION_INGESTED_DIR, training_pipeline.TRAIN_FILE_NAME
+            self.data_ingestion_dir, training_pipeline.DATA_INGESTION_INGESTED_DIR,
+            training_pipeline.TRAIN_FEATURE_STORE_FILE_NAME
         )
         self.testing_file_path: str = os.path.join(
-            self.data_ingestion_dir, training_pipeline.DATA_INGESTION_INGESTED_DIR, training_pipeline.TEST_FILE_NAME
+            self.data_ingestion_dir, training_pipeline.DATA_INGESTION_INGESTED_DIR,
+            training_pipeline.TEST_FEATURE_STORE_FILE_NAME
         )
         self.train_test_split_ratio: float = training_pipeline.DATA_INGESTION_TRAIN_TEST_SPLIT_RATIO
         self.source_data_file_path: str = training_pipeline.DATA_INGESTION_SOURCE_PATH  # New: path to CSV file
+        self.ingestion_mode: str = training_pipeline.DATA_INGESTION_MODE
+        self.chunk_size: int = training_pipeline.DATA_INGESTION_CHUNK_SIZE
+        self.ingestion_state_file_path: str = os.path.join(
+            self.data_ingestion_dir, training_pipeline.DATA_INGESTION_STATE_FILE_NAME
+        )
+        self.ingestion_source: str = training_pipeline.DATA_INGESTION_SOURCE
+        self.mongo_database_name: str = training_pipeline.MONGO_DB_DATABASE_NAME
+        self.mongo_collection_name: str = training_pipeline.MONGO_DB_COLLECTION_NAME
+        self.mongo_batch_size: int = training_pipeline.DATA_INGESTION_MONGO_BATCH_SIZE
+        self.mongo_watermark_field: str = training_pipeline.DATA_INGESTION_MONGO_WATERMARK_FIELD
+        self.mongo_watermark_lag_seconds: float = training_pipeline.DATA_INGESTION_MONGO_WATERMARK_LAG_SECONDS
+        self.mongo_state_file_path: str = os.path.join(
+            self.data_ingestion_dir, training_pipeline.DATA_INGESTION_MONGO_STATE_FILE_NAME
+        )
 
 @dataclass
 class DataValidationConfigEntity:
@@ -52,19 +79,19 @@ class DataValidationConfigEntity:
 
         self.valid_train_file_path: str = os.path.join(
             self.valid_data_dir,
-            training_pipeline.TRAIN_FILE_NAME
+            training_pipeline.TRAIN_FEATURE_STORE_FILE_NAME
         )
         self.valid_test_file_path: str = os.path.join(
             self.valid_data_dir,
-            training_pipeline.TEST_FILE_NAME
+            training_pipeline.TEST_FEATURE_STORE_FILE_NAME
         )
         self.invalid_train_file_path: str = os.path.join(
             self.invalid_data_dir,
-            training_pipeline.TRAIN_FILE_NAME
+            training_pipeline.TRAIN_FEATURE_STORE_FILE_NAME
         )
         self.invalid_test_file_path: str = os.path.join(
             self.invalid_data_dir,
-            training_pipeline.TEST_FILE_NAME
+            training_pipeline.TEST_FEATURE_STORE_FILE_NAME
         )
 
         # Drift Report HTML path
@@ -80,6 +107,16 @@ class DataValidationConfigEntity:
             training_pipeline.DATA_VALIDATION_DRIFT_REPORT_DIR,
             training_pipeline.DATA_VALIDATION_DRIFT_SUMMARY_FILE_NAME
         )
+
+        self.reference_histogram_file_path: str = os.path.join(
+            self.data_validation_dir,
+            training_pipeline.DATA_VALIDATION_DRIFT_REPORT_DIR,
+            training_pipeline.DATA_VALIDATION_REFERENCE_HISTOGRAM_FILE_NAME
+        )
+
+        self.outlier_strategy: str = training_pipeline.DATA_VALIDATION_OUTLIER_STRATEGY
+        self.outlier_iqr_multiplier: float = training_pipeline.DATA_VALIDATION_OUTLIER_IQR_MULTIPLIER
+        self.outlier_sample_size: int = training_pipeline.DATA_VALIDATION_OUTLIER_SAMPLE_SIZE
     
 @dataclass
 class DataTransformationConfigEntity:
@@ -123,9 +160,126 @@ class ModelTrainerConfigEntity:
             self.model_trainer_dir,
             training_pipeline.MODEL_TRAINER_TRAINED_MODEL_DIR
         )
+        self.compiled_model_file_path: str = os.path.join(
+            self.model_trainer_dir,
+            training_pipeline.MODEL_TRAINER_COMPILED_MODEL_NAME
+        )
         self.expected_score: float = training_pipeline.MODEL_TRAINER_EXPECTED_SCORE
         self.overfitting_underfitting_threshold: float = training_pipeline.MODEL_TRAINER_OVER_FITTING_UNDER_FITTING_THRESHOLD
         self.model_config_file_path: str = os.path.join(
             self.model_trainer_dir,
             training_pipeline.MODEL_FILE_PATH
-        )
\ No newline at end of file
+        )
+        self.cv_folds: int = training_pipeline.MODEL_TRAINER_CV_FOLDS
+        self.shared_data_root: str = training_pipeline.MODEL_TRAINER_SHARED_DATA_ROOT
+        self.search_mode: str = training_pipeline.MODEL_TRAINER_SEARCH_MODE
+        self.search_trace_file_path: str = os.path.join(
+            self.model_trainer_dir,
+            training_pipeline.MODEL_TRAINER_SEARCH_TRACE_FILE_NAME
+        )
+        self.search_time_budget_seconds: float = training_pipeline.MODEL_TRAINER_SEARCH_TIME_BUDGET_SECONDS
+        self.search_max_fits: int = training_pipeline.MODEL_TRAINER_SEARCH_MAX_FITS
+        self.halving_factor: int = training_pipeline.MODEL_TRAINER_HALVING_FACTOR
+        self.halving_min_samples: int = training_pipeline.MODEL_TRAINER_HALVING_MIN_SAMPLES
+        self.family_abort_margin: float = training_pipeline.MODEL_TRAINER_FAMILY_ABORT_MARGIN
+        self.early_stopping_rounds: int = training_pipeline.MODEL_TRAINER_EARLY_STOPPING_ROUNDS
+        self.early_stopping_tol: float = training_pipeline.MODEL_TRAINER_EARLY_STOPPING_TOL
+        self.threads_per_worker: int = training_pipeline.MODEL_TRAINER_THREADS_PER_WORKER
+        # Outside the model_trainer dir on purpose: shared by every run of the pipeline
+        self.evaluation_store_enabled: bool = training_pipeline.MODEL_TRAINER_EVALUATION_STORE_ENABLED
+        self.evaluation_store_file_path: str = os.path.join(
+            self.training_pipeline_config.artifact_dir,
+            training_pipeline.MODEL_TRAINER_EVALUATION_STORE_DIR_NAME,
+            training_pipeline.MODEL_TRAINER_EVALUATION_STORE_FILE_NAME
+        )
+
+@dataclass
+class PredictionPipelineConfigEntity:
+    training_pipeline_config: TrainingPipelineConfigEntity
+
+    def __post_init__(self):
+        self.prediction_dir: str = os.path.join(
+            self.training_pipeline_config.artifact_dir,
+            training_pipeline.PREDICTION_PIPELINE_DIR_NAME
+        )
+        self.prediction_file_path: str = os.path.join(
+            self.prediction_dir,
+            training_pipeline.PREDICTION_OUTPUT_FILE_NAME
+        )
+        # Same location ModelTrainerConfigEntity writes the NetworkModel to
+        self.trained_model_file_path: str = os.path.join(
+            self.training_pipeline_config.artifact_dir,
+            training_pipeline.MODEL_TRAINER_DIR_NAME,
+            training_pipeline.MODEL_TRAINER_TRAINED_MODEL_DIR
+        )
+        self.chunk_size: int = training_pipeline.PREDICTION_CHUNK_SIZE
+        self.queue_size: int = training_pipeline.PREDICTION_QUEUE_SIZE
+
+
+@dataclass
+class ScoringServerConfigEntity:
+    training_pipeline_config: TrainingPipelineConfigEntity
+
+    def __post_init__(self):
+        self.trained_model_file_path: str = os.path.join(
+            self.training_pipeline_config.artifact_dir,
+            training_pipeline.MODEL_TRAINER_DIR_NAME,
+            training_pipeline.MODEL_TRAINER_TRAINED_MODEL_DIR
+        )
+        self.compiled_model_file_path: str = os.path.join(
+            self.training_pipeline_config.artifact_dir,
+            training_pipeline.MODEL_TRAINER_DIR_NAME,
+            training_pipeline.MODEL_TRAINER_COMPILED_MODEL_NAME
+        )
+        self.compiled_model_max_rows: int = training_pipeline.SCORING_SERVER_COMPILED_MODEL_MAX_ROWS
+        self.host: str = training_pipeline.SCORING_SERVER_HOST
+        self.port: int = training_pipeline.SCORING_SERVER_PORT
+        self.max_batch_size: int = training_pipeline.SCORING_SERVER_MAX_BATCH_SIZE
+        self.max_wait_seconds: float = training_pipeline.SCORING_SERVER_MAX_WAIT_MS / 1000.0
+
+
+@dataclass
+class DriftMonitorConfigEntity:
+    training_pipeline_config: TrainingPipelineConfigEntity
+
+    def __post_init__(self):
+        # Same location DataValidationConfigEntity saves the training reference histograms to
+        self.reference_histogram_file_path: str = os.path.join(
+            self.training_pipeline_config.artifact_dir,
+            training_pipeline.DATA_VALIDATION_DIR_NAME,
+            training_pipeline.DATA_VALIDATION_DRIFT_REPORT_DIR,
+            training_pipeline.DATA_VALIDATION_REFERENCE_HISTOGRAM_FILE_NAME
+        )
+        self.drift_monitor_dir: str = os.path.join(
+            self.training_pipeline_config.artifact_dir,
+            training_pipeline.DRIFT_MONITOR_DIR_NAME
+        )
+        self.summary_file_path: str = os.path.join(
+            self.drift_monitor_dir,
+            training_pipeline.DRIFT_MONITOR_SUMMARY_FILE_NAME
+        )
+        self.enabled: bool = training_pipeline.DRIFT_MONITOR_ENABLED
+        self.window_slots: int = training_pipeline.DRIFT_MONITOR_WINDOW_SLOTS
+        self.slot_rows: int = training_pipeline.DRIFT_MONITOR_SLOT_ROWS
+        self.min_rows: int = training_pipeline.DRIFT_MONITOR_MIN_ROWS
+        self.psi_threshold: float = training_pipeline.DRIFT_MONITOR_PSI_THRESHOLD
+        self.summary_interval_seconds: float = training_pipeline.DRIFT_MONITOR_SUMMARY_INTERVAL_SECONDS
+        self.max_alerts: int = training_pipeline.DRIFT_MONITOR_MAX_ALERTS
+
+
+@dataclass
+class ExperimentTrackingConfigEntity:
+    training_pipeline_config: TrainingPipelineConfigEntity
+
+    def __post_init__(self):
+        # Shared by every pipeline run; each run gets its own directory below the experiment
+        self.tracking_dir: str = os.path.join(
+            self.training_pipeline_config.artifact_dir,
+            training_pipeline.EXPERIMENT_TRACKING_DIR_NAME
+        )
+        self.enabled: bool = training_pipeline.EXPERIMENT_TRACKING_ENABLED
+        self.experiment_name: str = training_pipeline.EXPERIMENT_TRACKING_EXPERIMENT_NAME
+        self.run_name: str = self.training_pipeline_config.timestamp
+        self.flush_interval_seconds: float = training_pipeline.EXPERIMENT_TRACKING_FLUSH_INTERVAL_SECONDS
+        self.batch_size: int = training_pipeline.EXPERIMENT_TRACKING_BATCH_SIZE
+        self.queue_size: int = training_pipeline.EXPERIMENT_TRACKING_QUEUE_SIZE
@@ -1,38 +1,168 @@
 import os
+import json
+import queue
+import atexit
 import logging
+import itertools
+import threading
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 
-class Custom_Logger:
-    def get_logger(self):
-        # Start from current file and move up until we find 'app.py'
-        current_path = os.path.abspath(__file__)
-        project_root = current_path
-        while not os.path.exists(os.path.join(project_root, "app.py")):
-            parent = os.path.dirname(project_root)
-            if parent == project_root:  # Reached filesystem root
-                break
-            project_root = parent
-
-        # Create a global log folder just outside your main source folders
-        log_dir = os.path.join(project_root, "log")
-        os.makedirs(log_dir, exist_ok=True)
-
-        # Create a unique log file with timestamp
-        log_file = os.path.join(log_dir, f"log_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.log")
-
-        logger = logging.getLogger("CustomLogger")
-        logger.setLevel(logging.DEBUG)
-
-        # Prevent duplicate handlers if logger is reused
-        if not logger.hasHandlers():
-            fh = logging.FileHandler(log_file)
-            formatter = logging.Formatter('[%(asctime)s] [%(levelname)s] → %(message)s')
-            fh.setFormatter(formatter)
-            logger.addHandler(fh)
-
-            # Optional: log to console as well
-            sh = logging.StreamHandler()
-            sh.setFormatter(formatter)
-            logger.addHandler(sh)
+from networksecurity.constants.training_pipeline import (
+    LOG_DIR_NAME,
+    LOG_FILE_FORMAT,
+    LOG_CONSOLE_ENABLED,
+    LOG_QUEUE_SIZE,
+    LOG_HOT_PATH_LEVEL,
+    LOG_HOT_PATH_SAMPLE_EVERY
+)
+
+LOGGER_NAME = "CustomLogger"
+TEXT_FORMAT = '[%(asctime)s] [%(levelname)s] → %(message)s'
+
+# Attributes every LogRecord has; anything else on a record came in through extra=
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+_setup_lock = threading.Lock()
+_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, message, origin and any extra= fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "message": record.getMessage(),
+            "module": record.module,
+            "function": record.funcName,
+            "line": record.lineno,
+            "thread": record.threadName,
+        }
+        payload.update({key: value for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES})
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Never blocks the caller: when the queue is full the record is dropped and counted."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped_records = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped_records += 1
+
+
+class HotPathLogger:
+    """
+    Level-gated, sampled front of a logger for per-request code. Records below level
+    cost one comparison; records below WARNING are then kept one in every sample_every,
+    decided before a LogRecord is built. Warnings and errors are never sampled away.
+    """
+
+    def __init__(self, logger: logging.Logger, level: int, sample_every: int = 1):
+        self.logger = logger
+        self.level = level
+        self.sample_every = max(int(sample_every), 1)
+        self._counter = itertools.count()
+
+    def log(self, level: int, msg: str, *args, **kwargs) -> None:
+        if level < self.level:
+            return
+        if level < logging.WARNING and next(self._counter) % self.sample_every:
+            return
+        kwargs.setdefault("stacklevel", 3)
+        self.logger.log(level, msg, *args, **kwargs)
+
+    def debug(self, msg: str, *args, **kwargs) -> None:
+        self.log(logging.DEBUG, msg, *args, **kwargs)
 
+    def info(self, msg: str, *args, **kwargs) -> None:
+        self.log(logging.INFO, msg, *args, **kwargs)
+
+    def warning(self, msg: str, *args, **kwargs) -> None:
+        self.log(logging.WARNING, msg, *args, **kwargs)
+
+    def error(self, msg: str, *args, **kwargs) -> None:
+        self.log(logging.ERROR, msg, *args, **kwargs)
+
+
+def _find_project_root() -> str:
+    # Start from current file and move up until we find 'app.py'
+    project_root = os.path.abspath(__file__)
+    while not os.path.exists(os.path.join(project_root, "app.py")):
+        parent = os.path.dirname(project_root)
+        if parent == project_root:  # Reached filesystem root
+            break
+        project_root = parent
+    return project_root
+
+
+def _stop_listener() -> None:
+    # Flushes every queued record before the interpreter exits
+    if _listener is not None:
+        _listener.stop()
+
+
+def _setup_logger() -> logging.Logger:
+    """
+    Configures the process-wide logger once: callers only put records on a bounded
+    queue, and a QueueListener thread does the file (JSON lines or text) and console I/O.
+    """
+    global _listener
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(logging.DEBUG)
+    # Prevent duplicate handlers if logger is reused
+    if logger.handlers:
         return logger
+
+    # Create a global log folder just outside your main source folders
+    log_dir = os.path.join(_find_project_root(), LOG_DIR_NAME)
+    os.makedirs(log_dir, exist_ok=True)
+    # Create a unique log file with timestamp
+    log_file = os.path.join(log_dir, f"log_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.log")
+
+    text_formatter = logging.Formatter(TEXT_FORMAT)
+    fh = logging.FileHandler(log_file)
+    fh.setFormatter(JsonFormatter() if LOG_FILE_FORMAT == "json" else text_formatter)
+    handlers = [fh]
+    if LOG_CONSOLE_ENABLED:
+        sh = logging.StreamHandler()
+        sh.setFormatter(text_formatter)
+        handlers.append(sh)
+
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_stop_listener)
+    logger.addHandler(DroppingQueueHandler(log_queue))
+    logger.propagate = False
+    return logger
+
+
+class Custom_Logger:
+    _logger = None
+    _hot_path_logger = None
+
+    def get_logger(self) -> logging.Logger:
+        # Resolved once per process; later calls are an attribute lookup
+        if Custom_Logger._logger is None:
+            with _setup_lock:
+                if Custom_Logger._logger is None:
+                    Custom_Logger._logger = _setup_logger()
+        return Custom_Logger._logger
+
+    def get_hot_path_logger(self) -> HotPathLogger:
+        """Logger for code that runs per request or per batch, e.g. NetworkModel.predict."""
+        if Custom_Logger._hot_path_logger is None:
+            Custom_Logger._hot_path_logger = HotPathLogger(
+                self.get_logger(), logging.getLevelName(LOG_HOT_PATH_LEVEL), LOG_HOT_PATH_SAMPLE_EVERY
+            )
+        return Custom_Logger._hot_path_logger
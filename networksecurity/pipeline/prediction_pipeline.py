@@ -0,0 +1,219 @@
+import os
+import sys
+import time
+import queue
+import threading
+from typing import Callable, Iterator
+
+import pandas as pd
+
+from networksecurity.exception.exception import CustomException
+from networksecurity.logger.customlogger import Custom_Logger
+from networksecurity.constants.training_pipeline import (
+    TARGET_COLUMN,
+    PREDICTION_COLUMN_NAME,
+    FEATURE_STORE_FILE_EXTENSION
+)
+from networksecurity.entity.config_entity import (
+    TrainingPipelineConfigEntity,
+    PredictionPipelineConfigEntity,
+    DriftMonitorConfigEntity
+)
+from networksecurity.entity.artifact_entity import PredictionArtifact
+from networksecurity.utils.main_utils import load_obj_cached
+from networksecurity.utils.feature_store import FeatureStoreReader
+from networksecurity.utils.ml_metric.drift_monitor import DriftMonitor, load_drift_monitor
+from networksecurity.utils.ml_metric.classification_metric import ConfusionMatrixAccumulator
+
+# Marks the end of the chunk stream between two stages
+_END_OF_STREAM = object()
+
+
+class PredictionPipeline:
+    """
+    Batch scoring engine for the trained NetworkModel.
+
+    The input file is streamed in fixed-size chunks through four stages
+    (read -> preprocess -> predict -> write), each on its own thread and
+    connected by three bounded queues. Peak memory is therefore bounded by
+    about 3 * queue_size * chunk_size rows (plus one chunk in flight per stage)
+    instead of the input size.
+
+    Every scored chunk is also fed to the drift monitor, which is loaded from the
+    training reference histograms unless one is passed in. When the input has
+    the target column, each chunk also updates a confusion-matrix accumulator,
+    so labelled evaluation runs report metrics without holding the labels.
+    """
+
+    def __init__(self, prediction_pipeline_config: PredictionPipelineConfigEntity, network_model=None,
+                 drift_monitor: DriftMonitor = None):
+        try:
+            self.prediction_pipeline_config = prediction_pipeline_config
+            self.logger = Custom_Logger().get_logger()
+            self.network_model = network_model if network_model is not None else load_obj_cached(
+                file_path=self.prediction_pipeline_config.trained_model_file_path
+            )
+            self.drift_monitor = drift_monitor if drift_monitor is not None else load_drift_monitor(
+                DriftMonitorConfigEntity(training_pipeline_config=self.prediction_pipeline_config.training_pipeline_config)
+            )
+            # Reset per batch run; predict_chunk also updates it when called directly
+            self.metric_accumulator = ConfusionMatrixAccumulator()
+            self.logger.info("Prediction pipeline initialized.")
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def read_input_chunks(self, input_file_path: str) -> Iterator[pd.DataFrame]:
+        """Yields the input file (CSV or feature store) as DataFrames of at most chunk_size rows."""
+        if not os.path.exists(input_file_path):
+            raise FileNotFoundError(f"File not found: {input_file_path}")
+        if input_file_path.endswith(FEATURE_STORE_FILE_EXTENSION):
+            yield from FeatureStoreReader(input_file_path).iter_batches(
+                batch_size=self.prediction_pipeline_config.chunk_size
+            )
+        elif input_file_path.endswith(".csv"):
+            yield from pd.read_csv(input_file_path, chunksize=self.prediction_pipeline_config.chunk_size)
+        else:
+            raise ValueError(f"Unsupported input format for batch prediction: {input_file_path}")
+
+    def preprocess_chunk(self, chunk: pd.DataFrame):
+        input_features = chunk.drop(columns=[TARGET_COLUMN], errors="ignore")
+        return chunk, self.network_model.preprocessor.transform(input_features)
+
+    def predict_chunk(self, item) -> pd.DataFrame:
+        chunk, transformed_features = item
+        predictions = self.network_model.model.predict(transformed_features)
+        if self.drift_monitor is not None:
+            self.drift_monitor.observe(chunk, predictions)
+        if TARGET_COLUMN in chunk:
+            # The model predicts 1 for the positive class whether labels are -1/1 or 0/1
+            self.metric_accumulator.update(chunk[TARGET_COLUMN].to_numpy(), predictions)
+        chunk[PREDICTION_COLUMN_NAME] = predictions
+        return chunk
+
+    @staticmethod
+    def _put(q: queue.Queue, item, stop_event: threading.Event) -> bool:
+        # Bounded put that gives up once another stage has failed
+        while not stop_event.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    @staticmethod
+    def _get(q: queue.Queue, stop_event: threading.Event):
+        while not stop_event.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _END_OF_STREAM
+
+    def _run_source(self, chunks: Iterator[pd.DataFrame], out_queue: queue.Queue,
+                    stop_event: threading.Event, errors: list) -> None:
+        try:
+            for chunk in chunks:
+                if not self._put(out_queue, chunk, stop_event):
+                    return
+        except Exception as e:
+            errors.append(e)
+            stop_event.set()
+        finally:
+            self._put(out_queue, _END_OF_STREAM, stop_event)
+
+    def _run_stage(self, fn: Callable, in_queue: queue.Queue, out_queue: queue.Queue,
+                   stop_event: threading.Event, errors: list) -> None:
+        try:
+            while True:
+                item = self._get(in_queue, stop_event)
+                if item is _END_OF_STREAM:
+                    return
+                if not self._put(out_queue, fn(item), stop_event):
+                    return
+        except Exception as e:
+            errors.append(e)
+            stop_event.set()
+        finally:
+            self._put(out_queue, _END_OF_STREAM, stop_event)
+
+    def initiate_batch_prediction(self, input_file_path: str) -> PredictionArtifact:
+        try:
+            self.logger.info(f"🚀 Starting batch prediction for {input_file_path}")
+            output_file_path = self.prediction_pipeline_config.prediction_file_path
+            os.makedirs(os.path.dirname(output_file_path), exist_ok=True)
+
+            queue_size = self.prediction_pipeline_config.queue_size
+            read_queue = queue.Queue(maxsize=queue_size)
+            transform_queue = queue.Queue(maxsize=queue_size)
+            write_queue = queue.Queue(maxsize=queue_size)
+            stop_event = threading.Event()
+            errors = []
+            self.metric_accumulator = ConfusionMatrixAccumulator()
+
+            workers = [
+                threading.Thread(target=self._run_source, daemon=True,
+                                 args=(self.read_input_chunks(input_file_path), read_queue, stop_event, errors)),
+                threading.Thread(target=self._run_stage, daemon=True,
+                                 args=(self.preprocess_chunk, read_queue, transform_queue, stop_event, errors)),
+                threading.Thread(target=self._run_stage, daemon=True,
+                                 args=(self.predict_chunk, transform_queue, write_queue, stop_event, errors)),
+            ]
+            start_time = time.perf_counter()
+            rows_processed = 0
+            drift_summary = None
+            if self.drift_monitor is not None:
+                self.drift_monitor.start()
+            try:
+                for worker in workers:
+                    worker.start()
+
+                # The writer runs on the calling thread so results land on disk in input order
+                with open(output_file_path, "w", newline="") as output_file:
+                    while True:
+                        chunk = self._get(write_queue, stop_event)
+                        if chunk is _END_OF_STREAM:
+                            break
+                        chunk.to_csv(output_file, header=rows_processed == 0, index=False)
+                        rows_processed += len(chunk)
+            finally:
+                # Also when the writer fails, so no stage thread or the drift monitor outlives the call
+                stop_event.set()
+                for worker in workers:
+                    if worker.ident is not None:
+                        worker.join()
+                if self.drift_monitor is not None:
+                    drift_summary = self.drift_monitor.stop()
+            if drift_summary is not None:
+                self.logger.info(f"📈 Drift monitor status: {drift_summary['status']} "
+                                 f"{drift_summary.get('drifted', [])}, summary at {self.drift_monitor.summary_file_path}")
+            if errors:
+                raise errors[0]
+
+            elapsed_seconds = time.perf_counter() - start_time
+            rows_per_second = rows_processed / elapsed_seconds if elapsed_seconds > 0 else 0.0
+            metric_artifact = None
+            if self.metric_accumulator.n_samples:
+                metric_artifact = self.metric_accumulator.to_artifact()
+                self.logger.info(f"📊 Metrics over {self.metric_accumulator.n_samples} labelled rows: {metric_artifact}")
+            self.logger.info(
+                f"✅ Batch prediction completed: {rows_processed} rows in {elapsed_seconds:.2f}s "
+                f"({rows_per_second:,.0f} rows/sec). Predictions saved at {output_file_path}"
+            )
+            return PredictionArtifact(
+                prediction_file_path=output_file_path,
+                rows_processed=rows_processed,
+                elapsed_seconds=elapsed_seconds,
+                rows_per_second=rows_per_second,
+                metric_artifact=metric_artifact
+            )
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+
+if __name__ == "__main__":
+    INPUT_FILE_PATH = sys.argv[1] if len(sys.argv) > 1 else os.path.join("Network_Data", "phisingData.csv")
+    prediction_pipeline_config = PredictionPipelineConfigEntity(training_pipeline_config=TrainingPipelineConfigEntity())
+    prediction_pipeline = PredictionPipeline(prediction_pipeline_config)
+    prediction_artifact = prediction_pipeline.initiate_batch_prediction(INPUT_FILE_PATH)
+    print(f"📦 Prediction Artifact: {prediction_artifact}")
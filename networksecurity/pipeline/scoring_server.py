@@ -0,0 +1,419 @@
+import os
+import sys
+import json
+import math
+import time
+import queue
+import struct
+import threading
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from networksecurity.exception.exception import CustomException
+from networksecurity.logger.customlogger import Custom_Logger
+from networksecurity.constants.training_pipeline import SCHEMA_FILE_PATH, TARGET_COLUMN
+from networksecurity.entity.config_entity import (
+    TrainingPipelineConfigEntity,
+    ScoringServerConfigEntity,
+    DriftMonitorConfigEntity
+)
+from networksecurity.utils.main_utils import read_yaml_file, load_obj_cached
+from networksecurity.utils.ml_metric.drift_monitor import DriftMonitor, load_drift_monitor
+from networksecurity.utils.model_metric.compiled_ensemble import CompiledEnsemble
+
+# Binary columnar request header: little-endian uint32 n_rows, uint32 n_cols
+BINARY_HEADER = struct.Struct("<II")
+BINARY_CONTENT_TYPE = "application/octet-stream"
+JSON_CONTENT_TYPE = "application/json"
+
+
+class LatencyHistogram:
+    """
+    Fixed-memory latency histogram with geometric buckets (~10% relative error).
+    Percentiles are read from bucket upper bounds, so recording is O(1).
+    """
+
+    def __init__(self, min_seconds: float = 1e-5, max_seconds: float = 60.0, growth: float = 1.1):
+        self._lock = threading.Lock()
+        self._growth = growth
+        self._min_seconds = min_seconds
+        n_buckets = int(math.ceil(math.log(max_seconds / min_seconds, growth))) + 1
+        self._bounds = [min_seconds * growth ** i for i in range(n_buckets)]
+        self._counts = [0] * (n_buckets + 1)
+        self._total = 0
+        self._max = 0.0
+
+    def record(self, seconds: float) -> None:
+        index = 0 if seconds <= self._min_seconds else int(math.ceil(math.log(seconds / self._min_seconds, self._growth)))
+        with self._lock:
+            self._counts[min(index, len(self._counts) - 1)] += 1
+            self._total += 1
+            self._max = max(self._max, seconds)
+
+    def percentile(self, q: float) -> float:
+        with self._lock:
+            if self._total == 0:
+                return 0.0
+            rank = q * self._total
+            cumulative = 0
+            for index, count in enumerate(self._counts):
+                cumulative += count
+                if cumulative >= rank:
+                    return min(self._bounds[index], self._max) if index < len(self._bounds) else self._max
+            return self._max
+
+    def distribution(self) -> list:
+        """Non-empty buckets as [upper bound in ms, count]; the overflow bucket is bounded by the max."""
+        with self._lock:
+            return [[(self._bounds[index] if index < len(self._bounds) else self._max) * 1000.0, count]
+                    for index, count in enumerate(self._counts) if count]
+
+    def summary(self) -> dict:
+        return {
+            "count": self._total,
+            "p50_ms": self.percentile(0.50) * 1000.0,
+            "p99_ms": self.percentile(0.99) * 1000.0,
+            "max_ms": self._max * 1000.0,
+        }
+
+
+class BatchSizeHistogram:
+    """Counts executed micro-batches in power-of-two row-count buckets."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+
+    def record(self, batch_size: int) -> None:
+        bucket = 1 << max(batch_size - 1, 0).bit_length()
+        with self._lock:
+            self._counts[bucket] = self._counts.get(bucket, 0) + 1
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {f"<={bucket}": count for bucket, count in sorted(self._counts.items())}
+
+
+class ScoringModel:
+    """
+    Scores NetworkModel input, routing small batches to the model's CompiledEnsemble.
+
+    Rows always go through the NetworkModel's preprocessor. Batches of at most
+    compiled_model_max_rows rows are then scored by the array-backed ensemble,
+    which avoids sklearn's per-estimator overhead (about 0.2ms instead of 9ms
+    for one row on a 128-tree forest); larger batches go to the sklearn model,
+    whose Cython traversal is faster once that overhead is amortized. The
+    preprocessor (SampledKNNImputer) still imports sklearn, so a scoring process
+    needs it installed either way.
+    """
+
+    def __init__(self, network_model, compiled_model: CompiledEnsemble = None, compiled_model_max_rows: int = 0):
+        self.network_model = network_model
+        self.compiled_model = compiled_model
+        self.compiled_model_max_rows = compiled_model_max_rows
+        self.preprocessor = network_model.preprocessor
+        self._lock = threading.Lock()
+        self._batches = {"compiled": 0, "sklearn": 0}
+
+    def predict(self, X: pd.DataFrame) -> np.ndarray:
+        if self.compiled_model is None or len(X) > self.compiled_model_max_rows:
+            route, predictions = "sklearn", self.network_model.predict(X)
+        else:
+            route, predictions = "compiled", self.compiled_model.predict(self.preprocessor.transform(X))
+        with self._lock:
+            self._batches[route] += 1
+        return predictions
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {"compiled_model_max_rows": self.compiled_model_max_rows if self.compiled_model else 0,
+                    "batches": dict(self._batches)}
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent scoring requests into micro-batches.
+
+    A single worker thread takes the first queued request, then keeps collecting
+    until max_batch_size rows are pending or max_wait_seconds have passed, and
+    runs the NetworkModel once over the stacked rows. Requests are validated
+    before they are queued; if a batch still fails, its requests are scored one
+    by one so only the request that caused the failure gets the error. Each
+    executed batch is handed to the drift monitor, if any, after its requests
+    are answered, so monitoring adds no latency and its failures never fail a
+    scored batch.
+    """
+
+    def __init__(self, network_model, feature_columns: list, max_batch_size: int, max_wait_seconds: float,
+                 drift_monitor: DriftMonitor = None):
+        self.network_model = network_model
+        self.drift_monitor = drift_monitor
+        self.feature_columns = feature_columns
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_seconds
+        self.batch_size_histogram = BatchSizeHistogram()
+        self.logger = Custom_Logger().get_logger()
+        self._requests = queue.Queue()
+        self._stopped = threading.Event()
+        self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, features: np.ndarray) -> Future:
+        future = Future()
+        self._requests.put((features, future))
+        return future
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._worker.join()
+
+    def _collect_batch(self) -> list:
+        try:
+            batch = [self._requests.get(timeout=0.1)]
+        except queue.Empty:
+            return []
+        pending_rows = len(batch[0][0])
+        deadline = time.perf_counter() + self.max_wait_seconds
+        while pending_rows < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                request = self._requests.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(request)
+            pending_rows += len(request[0])
+        return batch
+
+    def _predict(self, features: np.ndarray) -> np.ndarray:
+        return self.network_model.predict(pd.DataFrame(features, columns=self.feature_columns))
+
+    def _predict_each(self, batch: list) -> None:
+        # Isolates the request that failed the batch; the others still get their predictions
+        for request_features, future in batch:
+            try:
+                future.set_result(self._predict(request_features))
+            except Exception as e:
+                future.set_exception(e)
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            batch = self._collect_batch()
+            if not batch:
+                continue
+            try:
+                features = np.vstack([request_features for request_features, _ in batch])
+                predictions = self._predict(features)
+                self.batch_size_histogram.record(len(features))
+            except Exception as e:
+                self.logger.warning(f"⚠️ Micro-batch of {len(batch)} requests failed, scoring them one by one: {e}")
+                self._predict_each(batch)
+                continue
+            offset = 0
+            for request_features, future in batch:
+                future.set_result(predictions[offset:offset + len(request_features)])
+                offset += len(request_features)
+            if self.drift_monitor is not None:
+                try:
+                    self.drift_monitor.observe(features, predictions)
+                except Exception as e:
+                    self.logger.error(f"❌ Drift monitor failed to observe a batch of {len(features)} rows: {e}")
+
+
+class ScoringRequestHandler(BaseHTTPRequestHandler):
+    """
+    POST /predict  JSON body {"instances": [...]} where each instance is a list of
+                   feature values in schema order or a {column: value} mapping, or a
+                   binary columnar body (application/octet-stream): uint32 n_rows,
+                   uint32 n_cols, then n_cols contiguous int8 columns.
+    GET  /metrics  latency percentiles, batch-size histogram, compiled/sklearn routing counts
+                   and the last drift summary.
+    GET  /health   liveness probe.
+    """
+
+    def log_message(self, format, *args):
+        # Access logging per request would dominate latency; errors still go through the logger
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        self._send(status, json.dumps(payload).encode("utf-8"), JSON_CONTENT_TYPE)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        elif self.path == "/metrics":
+            self._send_json(200, self.server.scoring_server.metrics())
+        else:
+            self._send_json(404, {"error": f"Unknown path {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/predict":
+            self._send_json(404, {"error": f"Unknown path {self.path}"})
+            return
+        start_time = time.perf_counter()
+        scoring_server = self.server.scoring_server
+        binary = self.headers.get("Content-Type", "").startswith(BINARY_CONTENT_TYPE)
+        try:
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            features = scoring_server.decode_binary(body) if binary else scoring_server.decode_json(body)
+            predictions = scoring_server.micro_batcher.submit(features).result()
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+            return
+        except Exception as e:
+            # Details (exception text, file paths) stay in the server log
+            scoring_server.logger.error(f"❌ Scoring request failed: {e}")
+            self._send_json(500, {"error": "Internal error while scoring the request."})
+            return
+        if binary:
+            self._send(200, np.asarray(predictions, dtype=np.int8).tobytes(), BINARY_CONTENT_TYPE)
+        else:
+            self._send_json(200, {"predictions": np.asarray(predictions).tolist()})
+        scoring_server.latency_histogram.record(time.perf_counter() - start_time)
+
+
+class ScoringHTTPServer(ThreadingHTTPServer):
+    # The socketserver default backlog of 5 resets connections under concurrent load
+    request_queue_size = 1024
+    daemon_threads = True
+
+
+class ScoringServer:
+    """
+    Local HTTP scoring service that loads the trained NetworkModel once, together with
+    the compiled ensemble the trainer exported beside it (if any) for small batches.
+    """
+
+    def __init__(self, scoring_server_config: ScoringServerConfigEntity, network_model=None,
+                 drift_monitor: DriftMonitor = None, compiled_model: CompiledEnsemble = None):
+        try:
+            self.scoring_server_config = scoring_server_config
+            self.logger = Custom_Logger().get_logger()
+            schema_config = read_yaml_file(SCHEMA_FILE_PATH)
+            self.feature_columns = [
+                list(col_dict.keys())[0] for col_dict in schema_config["columns"]
+                if list(col_dict.keys())[0] != TARGET_COLUMN
+            ]
+            if network_model is None:
+                network_model = load_obj_cached(file_path=self.scoring_server_config.trained_model_file_path)
+                # Only the export beside the loaded model is known to reproduce its predictions
+                if (compiled_model is None and self.scoring_server_config.compiled_model_max_rows > 0
+                        and os.path.exists(self.scoring_server_config.compiled_model_file_path)):
+                    compiled_model = CompiledEnsemble.load(self.scoring_server_config.compiled_model_file_path)
+            self.network_model = network_model
+            self.scoring_model = ScoringModel(
+                network_model=self.network_model,
+                compiled_model=compiled_model,
+                compiled_model_max_rows=self.scoring_server_config.compiled_model_max_rows
+            )
+            if compiled_model is not None:
+                self.logger.info(f"Batches of up to {self.scoring_server_config.compiled_model_max_rows} rows "
+                                 f"use the compiled ensemble ({compiled_model.n_trees} trees).")
+            self.drift_monitor = drift_monitor if drift_monitor is not None else load_drift_monitor(
+                DriftMonitorConfigEntity(training_pipeline_config=self.scoring_server_config.training_pipeline_config),
+                feature_columns=self.feature_columns
+            )
+            self.latency_histogram = LatencyHistogram()
+            self.micro_batcher = MicroBatcher(
+                network_model=self.scoring_model,
+                feature_columns=self.feature_columns,
+                max_batch_size=self.scoring_server_config.max_batch_size,
+                max_wait_seconds=self.scoring_server_config.max_wait_seconds,
+                drift_monitor=self.drift_monitor
+            )
+            self.httpd = ScoringHTTPServer(
+                (self.scoring_server_config.host, self.scoring_server_config.port), ScoringRequestHandler
+            )
+            self.httpd.scoring_server = self
+            self.logger.info(f"Scoring server bound to {self.httpd.server_address[0]}:{self.httpd.server_address[1]}")
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def decode_json(self, body: bytes) -> np.ndarray:
+        """
+        Validates a JSON request into a float64 feature matrix; raises ValueError (a 400) for
+        malformed bodies, wrong feature counts, non-numeric and infinite values. null is a
+        missing value, which the preprocessor imputes.
+        """
+        payload = json.loads(body)
+        if isinstance(payload, dict):
+            instances = payload.get("instances", [payload])
+        elif isinstance(payload, list):
+            instances = payload
+        else:
+            raise ValueError("Request body must be a JSON object or list.")
+        if not isinstance(instances, list) or not instances:
+            raise ValueError("Request contains no instances.")
+        rows = []
+        for instance in instances:
+            if not isinstance(instance, (list, dict)):
+                raise ValueError("Each instance must be a list of feature values or a {column: value} object.")
+            if isinstance(instance, dict):
+                missing_cols = [col for col in self.feature_columns if col not in instance]
+                if missing_cols:
+                    raise ValueError(f"Missing features in instance: {missing_cols}")
+                instance = [instance[col] for col in self.feature_columns]
+            if len(instance) != len(self.feature_columns):
+                raise ValueError(f"Expected {len(self.feature_columns)} features, got {len(instance)}")
+            rows.append(instance)
+        try:
+            features = np.asarray(rows, dtype=np.float64)
+        except (TypeError, ValueError):
+            raise ValueError("Feature values must be numbers.")
+        if np.isinf(features).any():
+            raise ValueError("Feature values must be finite.")
+        return features
+
+    def decode_binary(self, body: bytes) -> np.ndarray:
+        if len(body) < BINARY_HEADER.size:
+            raise ValueError("Binary body is shorter than its header.")
+        n_rows, n_cols = BINARY_HEADER.unpack_from(body)
+        if n_rows < 1:
+            raise ValueError("Binary body contains no rows.")
+        if n_cols != len(self.feature_columns):
+            raise ValueError(f"Expected {len(self.feature_columns)} columns, got {n_cols}")
+        if len(body) != BINARY_HEADER.size + n_rows * n_cols:
+            raise ValueError("Binary body size does not match its header.")
+        columns = np.frombuffer(body, dtype=np.int8, offset=BINARY_HEADER.size).reshape(n_cols, n_rows)
+        return columns.T.astype(np.float64)
+
+    def metrics(self) -> dict:
+        return {
+            "latency": self.latency_histogram.summary(),
+            "batch_size_histogram": self.micro_batcher.batch_size_histogram.summary(),
+            "model_routing": self.scoring_model.summary(),
+            "drift": self.drift_monitor.last_summary if self.drift_monitor is not None else None,
+        }
+
+    def serve_forever(self) -> None:
+        try:
+            self.logger.info("🚀 Scoring server started.")
+            if self.drift_monitor is not None:
+                self.drift_monitor.start()
+            self.httpd.serve_forever()
+        finally:
+            self.httpd.server_close()
+            self.micro_batcher.stop()
+            if self.drift_monitor is not None:
+                self.drift_monitor.stop()
+            self.logger.info("Scoring server stopped.")
+
+    def shutdown(self) -> None:
+        """Stops serve_forever; must be called from a different thread."""
+        self.httpd.shutdown()
+
+
+if __name__ == "__main__":
+    scoring_server_config = ScoringServerConfigEntity(training_pipeline_config=TrainingPipelineConfigEntity())
+    ScoringServer(scoring_server_config).serve_forever()
@@ -1,11 +1,16 @@
-import os , sys 
+import os , sys
 
-from networksecurity.logger.customlogger import CustomLogger
+from networksecurity.logger.customlogger import Custom_Logger
 from networksecurity.exception.exception import CustomException
 from networksecurity.components.data_ingestion import DataIngestion
 from networksecurity.components.data_validation import DataValidation
 from networksecurity.components.data_tranformation import DataTransformation
 from networksecurity.components.model_trainer import ModelTrainer
+from networksecurity.constants.training_pipeline import SCHEMA_FILE_PATH, DATA_TRANSFORMATION_IMPUTER_PARAMS
+from networksecurity.utils.dag import DagExecutor, Task
+from networksecurity.utils.stage_cache import StageCache, module_source_files
+from networksecurity.utils.profiler import StageProfiler
+from networksecurity.utils.main_utils import count_rows
 
 from networksecurity.entity.config_entity import (
     TrainingPipelineConfigEntity,
@@ -22,24 +27,47 @@ from networksecurity.entity.artifact_entity import (
     ModelTrainerArtifact
 )
 
-logger = CustomLogger().get_logger()
+logger = Custom_Logger().get_logger()
+
+
+def _config_state(config) -> dict:
+    """Stage config attributes that feed its fingerprint (the shared pipeline config is excluded)."""
+    return {key: value for key, value in vars(config).items() if key != "training_pipeline_config"}
+
 
 class TrainingPipeline:
-    def __init__(self, config: TrainingPipelineConfigEntity):
-        self.training_pipeline_config = TrainingPipelineConfigEntity()
-    
+    def __init__(self, config: TrainingPipelineConfigEntity = None):
+        self.training_pipeline_config = config if config is not None else TrainingPipelineConfigEntity()
+        self.stage_cache = StageCache(
+            cache_dir=self.training_pipeline_config.stage_cache_dir,
+            enabled=self.training_pipeline_config.stage_cache_enabled
+        )
+        self.profiler = StageProfiler(enabled=self.training_pipeline_config.run_report_enabled)
+
     def start_data_ingestion(self)-> DataIngestionArtifact:
         try:
             logger.info("🚀 Starting data ingestion process...")
             data_ingestion_config = DataIngestionConfigEntity(training_pipeline_config=self.training_pipeline_config)
             # Data Ingestion
             data_ingestion = DataIngestion(data_ingestion_config)
-            data_ingestion_artifact: DataIngestionArtifact = data_ingestion.initiate_data_ingestion()
+            if data_ingestion_config.ingestion_source == "mongodb":
+                # A collection has no file to fingerprint; the watermark already makes reruns incremental
+                data_ingestion_artifact: DataIngestionArtifact = data_ingestion.initiate_data_ingestion()
+            else:
+                data_ingestion_artifact: DataIngestionArtifact = self.stage_cache.run(
+                    stage_name="data_ingestion",
+                    run_stage=data_ingestion.initiate_data_ingestion,
+                    artifact_cls=DataIngestionArtifact,
+                    input_paths=[data_ingestion_config.source_data_file_path],
+                    config=_config_state(data_ingestion_config),
+                    source_files=module_source_files(DataIngestion)
+                )
             logger.info("✅ Data ingestion completed successfully.")
             logger.info(f"📦 Data Ingestion Artifact: {data_ingestion_artifact}")
+            return data_ingestion_artifact
         except Exception as e:
             raise CustomException(e, sys) from e
-    
+
     def start_data_validation(self, data_ingestion_artifact: DataIngestionArtifact) -> DataValidationArtifact:
         try:
             logger.info("🚀 Starting data validation process...")
@@ -47,12 +75,21 @@ class TrainingPipeline:
             # Data Validation
             data_validation = DataValidation(data_ingestion_artifact = data_ingestion_artifact,
                                              data_validation_config=data_validation_config)
-            data_validation_artifact: DataValidationArtifact = data_validation.initiate_data_validation()
+            data_validation_artifact: DataValidationArtifact = self.stage_cache.run(
+                stage_name="data_validation",
+                run_stage=data_validation.initiate_data_validation,
+                artifact_cls=DataValidationArtifact,
+                input_paths=[data_ingestion_artifact.trained_file_path, data_ingestion_artifact.test_file_path,
+                             SCHEMA_FILE_PATH],
+                config=_config_state(data_validation_config),
+                source_files=module_source_files(DataValidation)
+            )
             logger.info("✅ Data validation completed successfully.")
             logger.info(f"📦 Data Validation Artifact: {data_validation_artifact}")
+            return data_validation_artifact
         except Exception as e:
             raise CustomException(e, sys) from e
-        
+
     def start_data_transformation(self, data_validation_artifact: DataValidationArtifact) -> DataTransformationArtifact:
         try:
             logger.info("🚀 Starting data transformation process...")
@@ -60,33 +97,89 @@ class TrainingPipeline:
             # Data Transformation
             data_transformation = DataTransformation(data_validation_artifact=data_validation_artifact,
                                                      data_transformation_config=data_transformation_config)
-            data_transformation_artifact: DataTransformationArtifact = data_transformation.initiate_data_transformation()
+            data_transformation_artifact: DataTransformationArtifact = self.stage_cache.run(
+                stage_name="data_transformation",
+                run_stage=data_transformation.initiate_data_transformation,
+                artifact_cls=DataTransformationArtifact,
+                input_paths=[data_validation_artifact.valid_train_file_path,
+                             data_validation_artifact.valid_test_file_path],
+                config={**_config_state(data_transformation_config),
+                        "imputer_params": DATA_TRANSFORMATION_IMPUTER_PARAMS},
+                source_files=module_source_files(DataTransformation)
+            )
             logger.info("✅ Data transformation completed successfully.")
             logger.info(f"📦 Data TransformationArtifact: {data_transformation_artifact}")
+            return data_transformation_artifact
         except Exception as e:
             raise CustomException(e, sys) from e
-    
+
     def start_model_trainer(self, data_transformation_artifact: DataTransformationArtifact) -> ModelTrainerArtifact:
         try:
             logger.info("🚀 Starting model training process...")
             model_trainer_config = ModelTrainerConfigEntity(training_pipeline_config=self.training_pipeline_config)
             # Model Trainer
             model_trainer = ModelTrainer(data_transformation_artifact=data_transformation_artifact,
-                                         model_trainer_config=model_trainer_config)
-            model_trainer_artifact: ModelTrainerArtifact = model_trainer.initiate_model_trainer()
+                                         model_trainer_config=model_trainer_config,
+                                         profiler=self.profiler)
+            model_trainer_artifact: ModelTrainerArtifact = self.stage_cache.run(
+                stage_name="model_trainer",
+                run_stage=model_trainer.initiate_model_trainer,
+                artifact_cls=ModelTrainerArtifact,
+                input_paths=[data_transformation_artifact.transformed_train_file_path,
+                             data_transformation_artifact.transformed_test_file_path,
+                             data_transformation_artifact.transformed_object_file_path],
+                config=_config_state(model_trainer_config),
+                source_files=module_source_files(ModelTrainer)
+            )
             logger.info("✅ Model training completed successfully.")
             logger.info(f"📦 Model Trainer Artifact: {model_trainer_artifact}")
+            return model_trainer_artifact
         except Exception as e:
             raise CustomException(e, sys) from e
-    
+
+    def save_run_report(self) -> None:
+        """Writes the profiler's run report (and Chrome trace) beside the artifacts; never fails the run."""
+        if not self.training_pipeline_config.run_report_enabled:
+            return
+        try:
+            self.profiler.save_report(self.training_pipeline_config.run_report_file_path)
+            if self.training_pipeline_config.chrome_trace_file_path:
+                self.profiler.save_chrome_trace(self.training_pipeline_config.chrome_trace_file_path)
+        except Exception as e:
+            logger.error(f"❌ Could not save the run report: {e}")
+
+    def build_tasks(self) -> list:
+        """The pipeline as a task graph: each stage consumes its upstream stage's artifact."""
+        return [
+            Task(name="data_ingestion", fn=self.start_data_ingestion,
+                 rows=lambda artifact, _: count_rows(artifact.trained_file_path) + count_rows(artifact.test_file_path)),
+            Task(name="data_validation", fn=self.start_data_validation,
+                 inputs={"data_ingestion_artifact": "data_ingestion"},
+                 rows=lambda artifact, _: (count_rows(artifact.valid_train_file_path)
+                                           + count_rows(artifact.valid_test_file_path))),
+            Task(name="data_transformation", fn=self.start_data_transformation,
+                 inputs={"data_validation_artifact": "data_validation"},
+                 rows=lambda artifact, _: (count_rows(artifact.transformed_train_file_path)
+                                           + count_rows(artifact.transformed_test_file_path))),
+            # The grid search parallelises itself, so training holds the whole CPU budget
+            Task(name="model_trainer", fn=self.start_model_trainer,
+                 inputs={"data_transformation_artifact": "data_transformation"},
+                 cpu=self.training_pipeline_config.dag_cpu_budget,
+                 rows=lambda _, inputs: (
+                     count_rows(inputs["data_transformation_artifact"].transformed_train_file_path)
+                     + count_rows(inputs["data_transformation_artifact"].transformed_test_file_path))),
+        ]
+
     def run_pipeline(self):
         try:
             logger.info("🚀 Starting the training pipeline...")
-            data_ingestion_artifact = self.start_data_ingestion()
-            data_validation_artifact = self.start_data_validation(data_ingestion_artifact)
-            data_transformation_artifact = self.start_data_transformation(data_validation_artifact)
-            model_trainer_artifact = self.start_model_trainer(data_transformation_artifact)
+            dag_executor = DagExecutor(cpu_budget=self.training_pipeline_config.dag_cpu_budget,
+                                       profiler=self.profiler, name="stage")
+            with self.profiler.span("training_pipeline", category="pipeline"):
+                artifacts = dag_executor.run(self.build_tasks())
             logger.info("✅ Training pipeline completed successfully.")
-            return model_trainer_artifact
+            return artifacts["model_trainer"]
         except Exception as e:
             raise CustomException(e, sys) from e
+        finally:
+            self.save_run_report()
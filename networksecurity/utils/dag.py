@@ -0,0 +1,141 @@
+import os
+import sys
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Optional
+
+from networksecurity.exception.exception import CustomException
+from networksecurity.logger.customlogger import Custom_Logger
+from networksecurity.utils.profiler import StageProfiler
+
+
+@dataclass
+class Task:
+    """
+    One unit of pipeline work. fn is called with a keyword argument per entry of
+    inputs (argument name -> upstream task name) bound to that task's result, and
+    its return value is the task's output, stored under the task name. after lists
+    ordering-only dependencies (tasks whose side effects this one needs). cpu is the
+    share of the executor's CPU budget the task occupies while it runs; rows, if
+    given, maps (output, keyword inputs) to a row count for the profiler.
+    """
+    name: str
+    fn: Callable
+    inputs: dict = field(default_factory=dict)
+    after: tuple = ()
+    cpu: int = 1
+    rows: Optional[Callable] = None
+
+    @property
+    def dependencies(self) -> set:
+        return set(self.inputs.values()) | set(self.after)
+
+
+def _run_task(fn: Callable, kwargs: dict):
+    # Module-level so process pools can pickle it
+    return fn(**kwargs)
+
+
+class DagExecutor:
+    """
+    Runs a DAG of Tasks on a thread or process pool.
+
+    Ready tasks are started in declaration order as long as the CPU units of the
+    running tasks stay within cpu_budget; a task asking for more than the whole
+    budget runs alone. The first failure stops new submissions, waits for the
+    running tasks and is raised. Process pools need picklable task functions and
+    results, and their tasks are not profiled (spans are recorded on the worker).
+    """
+
+    def __init__(self, cpu_budget: int = None, executor: str = "thread", profiler: StageProfiler = None,
+                 name: str = "dag"):
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unknown executor '{executor}', expected 'thread' or 'process'")
+        self.cpu_budget = max(int(cpu_budget or os.cpu_count() or 1), 1)
+        self.executor = executor
+        self.profiler = profiler
+        self.name = name
+        self.logger = Custom_Logger().get_logger()
+
+    @staticmethod
+    def topological_order(tasks: list) -> list:
+        """Task names in a dependency-respecting order; raises on unknown inputs and cycles."""
+        by_name = {}
+        for task in tasks:
+            if task.name in by_name:
+                raise ValueError(f"Duplicate task name '{task.name}'")
+            by_name[task.name] = task
+        for task in tasks:
+            unknown = task.dependencies - set(by_name)
+            if unknown:
+                raise ValueError(f"Task '{task.name}' depends on unknown tasks: {sorted(unknown)}")
+
+        order, state = [], {}
+
+        def visit(name: str, path: list) -> None:
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"Cycle in task graph: {' -> '.join(path + [name])}")
+            state[name] = "visiting"
+            for dependency in sorted(by_name[name].dependencies):
+                visit(dependency, path + [name])
+            state[name] = "done"
+            order.append(name)
+
+        for task in tasks:
+            visit(task.name, [])
+        return order
+
+    def _profiled(self, task: Task) -> Callable:
+        def run(**kwargs):
+            with self.profiler.span(task.name, category=self.name) as span:
+                result = task.fn(**kwargs)
+                if task.rows is not None:
+                    span["rows"] = task.rows(result, kwargs)
+                return result
+        return run
+
+    def run(self, tasks: list) -> dict:
+        """Executes every task and returns {task name: output}."""
+        try:
+            self.topological_order(tasks)
+            pending = list(tasks)
+            results, running = {}, {}
+            cpu_in_use = 0
+            error = None
+            pool_cls = ThreadPoolExecutor if self.executor == "thread" else ProcessPoolExecutor
+            profile = self.profiler is not None and self.executor == "thread"
+            with pool_cls(max_workers=min(self.cpu_budget, max(len(tasks), 1))) as pool:
+                while pending or running:
+                    for task in list(pending):
+                        if error is not None:
+                            break
+                        if not task.dependencies.issubset(results):
+                            continue
+                        cpu = min(task.cpu, self.cpu_budget)
+                        if running and cpu_in_use + cpu > self.cpu_budget:
+                            continue
+                        kwargs = {argument: results[upstream] for argument, upstream in task.inputs.items()}
+                        fn = self._profiled(task) if profile else task.fn
+                        running[pool.submit(_run_task, fn, kwargs)] = task
+                        cpu_in_use += cpu
+                        pending.remove(task)
+                    if error is not None:
+                        pending.clear()
+                    if not running:
+                        break
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        task = running.pop(future)
+                        cpu_in_use -= min(task.cpu, self.cpu_budget)
+                        try:
+                            results[task.name] = future.result()
+                        except Exception as e:
+                            self.logger.error(f"❌ Task '{task.name}' of {self.name} failed: {e}")
+                            error = error or e
+            if error is not None:
+                raise error
+            return results
+        except Exception as e:
+            raise CustomException(e, sys) from e
@@ -0,0 +1,124 @@
+import os
+import sys
+import json
+import sqlite3
+import hashlib
+import threading
+from datetime import datetime
+
+import numpy as np
+import sklearn
+
+from networksecurity.exception.exception import CustomException
+from networksecurity.logger.customlogger import Custom_Logger
+from networksecurity.utils.main_utils import json_default
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS evaluations (
+    key TEXT PRIMARY KEY,
+    data_fingerprint TEXT NOT NULL,
+    estimator TEXT NOT NULL,
+    params TEXT NOT NULL,
+    fold_fingerprint TEXT NOT NULL,
+    variant TEXT,
+    score REAL NOT NULL,
+    fit_seconds REAL,
+    created_at TEXT NOT NULL
+)
+"""
+
+
+def fingerprint_arrays(*arrays) -> str:
+    """Content hash of the training arrays (shape, dtype and bytes)."""
+    digest = hashlib.sha256()
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.shape}{array.dtype.str}".encode("utf-8"))
+        digest.update(memoryview(array).cast("B"))
+    return digest.hexdigest()
+
+
+def fingerprint_fold(train_index, test_index) -> str:
+    return fingerprint_arrays(np.asarray(train_index, dtype=np.int64), np.asarray(test_index, dtype=np.int64))
+
+
+class EvaluationStore:
+    """
+    Persistent SQLite store of cross-validation scores, one row per (data, estimator, params, fold).
+
+    The key hashes the training data fingerprint, the estimator class with its
+    complete parameter set (defaults included, so a changed default or sklearn
+    upgrade is a new key), the fold's train/test indices and an optional search
+    variant (e.g. early stopping settings that change scores). Searches look up
+    finished evaluations and record new ones as each completes, which makes an
+    interrupted search resumable.
+    """
+
+    def __init__(self, db_path: str, enabled: bool = True):
+        self.db_path = db_path
+        self.enabled = enabled
+        self.logger = Custom_Logger().get_logger()
+        self._lock = threading.Lock()
+        self._connection = None
+        if enabled:
+            try:
+                os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+                self._connection = sqlite3.connect(db_path, check_same_thread=False)
+                # WAL keeps every committed score on disk without fsync-heavy rollback journals
+                self._connection.execute("PRAGMA journal_mode=WAL")
+                self._connection.execute("PRAGMA synchronous=NORMAL")
+                self._connection.execute(_SCHEMA)
+                self._connection.commit()
+            except Exception as e:
+                raise CustomException(e, sys) from e
+
+    @staticmethod
+    def describe(estimator, params: dict) -> tuple:
+        """(estimator name, canonical JSON of its full parameter set with params applied)."""
+        estimator_name = f"{type(estimator).__module__}.{type(estimator).__qualname__}@sklearn-{sklearn.__version__}"
+        full_params = {**estimator.get_params(deep=False), **params}
+        return estimator_name, json.dumps(full_params, sort_keys=True, default=json_default)
+
+    @staticmethod
+    def _key(data_fingerprint: str, estimator_name: str, params_json: str, fold_fingerprint: str,
+             variant: str) -> str:
+        return hashlib.sha256("\x1f".join(
+            [data_fingerprint, estimator_name, params_json, fold_fingerprint, variant or ""]
+        ).encode("utf-8")).hexdigest()
+
+    def lookup(self, data_fingerprint: str, estimator, params: dict, fold_fingerprint: str,
+               variant: str = None):
+        """The stored score, or None."""
+        if not self.enabled:
+            return None
+        key = self._key(data_fingerprint, *self.describe(estimator, params), fold_fingerprint, variant)
+        with self._lock:
+            row = self._connection.execute("SELECT score FROM evaluations WHERE key = ?", (key,)).fetchone()
+        return row[0] if row is not None else None
+
+    def record(self, data_fingerprint: str, estimator, params: dict, fold_fingerprint: str, score: float,
+               fit_seconds: float = None, variant: str = None) -> None:
+        """Stores and commits one score, so it survives an interrupted search."""
+        if not self.enabled or score is None or np.isnan(score):
+            return
+        estimator_name, params_json = self.describe(estimator, params)
+        key = self._key(data_fingerprint, estimator_name, params_json, fold_fingerprint, variant)
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO evaluations VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, data_fingerprint, estimator_name, params_json, fold_fingerprint, variant, float(score),
+                 fit_seconds, datetime.now().isoformat(timespec="seconds"))
+            )
+            self._connection.commit()
+
+    def close(self) -> None:
+        if self._connection is not None:
+            with self._lock:
+                self._connection.close()
+                self._connection = None
+
+    def __enter__(self) -> "EvaluationStore":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
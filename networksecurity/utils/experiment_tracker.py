@@ -0,0 +1,244 @@
+import os
+import sys
+import json
+import time
+import uuid
+import queue
+import shutil
+import threading
+from datetime import datetime
+
+from networksecurity.exception.exception import CustomException
+from networksecurity.logger.customlogger import Custom_Logger
+from networksecurity.entity.config_entity import ExperimentTrackingConfigEntity
+from networksecurity.utils.main_utils import json_default
+
+EVENTS_FILE_NAME = "events.jsonl"
+META_FILE_NAME = "meta.json"
+ARTIFACTS_DIR_NAME = "artifacts"
+# Tells the writer thread to drain the queue and exit
+_END_OF_RUN = object()
+
+
+class ExperimentTracker:
+    """
+    Non-blocking experiment tracking for one run, backed by local files.
+
+    log_* calls only stamp the event and put it on a bounded queue (put_nowait,
+    so a full queue drops and counts events instead of stalling training). A
+    background thread drains the queue in batches of up to batch_size events,
+    at least every flush_interval_seconds, and appends each batch to
+    <tracking_dir>/<experiment>/<run id>/events.jsonl with a single write;
+    logged artifacts are copied into the run's artifacts/ directory by the same
+    thread. meta.json records the run's status, times and event counts, and
+    load_run() folds a run directory back into params, metrics and CV results.
+    """
+
+    def __init__(self, tracking_dir: str, experiment_name: str, run_name: str = None, enabled: bool = True,
+                 flush_interval_seconds: float = 1.0, batch_size: int = 1_000, queue_size: int = 100_000):
+        self.enabled = enabled
+        self.experiment_name = experiment_name
+        self.run_name = run_name
+        self.run_id = f"{datetime.now().strftime('%Y%m%d%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        self.run_dir = os.path.join(tracking_dir, experiment_name.replace(os.sep, "_"), self.run_id)
+        self.flush_interval_seconds = flush_interval_seconds
+        self.batch_size = batch_size
+        self.logger = Custom_Logger().get_logger()
+        self.n_logged = 0
+        self.n_written = 0
+        self.n_dropped = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._worker = None
+        self._started_at = None
+
+    @classmethod
+    def from_config(cls, config: ExperimentTrackingConfigEntity) -> "ExperimentTracker":
+        return cls(
+            tracking_dir=config.tracking_dir,
+            experiment_name=config.experiment_name,
+            run_name=config.run_name,
+            enabled=config.enabled,
+            flush_interval_seconds=config.flush_interval_seconds,
+            batch_size=config.batch_size,
+            queue_size=config.queue_size
+        )
+
+    @property
+    def active(self) -> bool:
+        return self.enabled and self._worker is not None
+
+    def start(self) -> "ExperimentTracker":
+        if not self.enabled or self._worker is not None:
+            return self
+        try:
+            os.makedirs(os.path.join(self.run_dir, ARTIFACTS_DIR_NAME), exist_ok=True)
+            self._started_at = datetime.now().isoformat(timespec="seconds")
+            self._write_meta(status="RUNNING")
+            self._worker = threading.Thread(target=self._run, name="experiment-tracker", daemon=True)
+            self._worker.start()
+            self.logger.info(f"🧪 Tracking run {self.run_id} of '{self.experiment_name}' at {self.run_dir}")
+            return self
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def end(self, status: str = "FINISHED") -> None:
+        """Flushes every queued event, stops the writer thread and records the final status."""
+        if not self.active:
+            return
+        try:
+            # The end marker must not be dropped, but a dead writer would never make room for it
+            while self._worker.is_alive():
+                try:
+                    self._queue.put(_END_OF_RUN, timeout=self.flush_interval_seconds)
+                    break
+                except queue.Full:
+                    continue
+            self._worker.join()
+            if self._queue.qsize():
+                self.logger.error(f"❌ Experiment tracker writer stopped early; {self._queue.qsize()} events not written.")
+            self._worker = None
+            self._write_meta(status=status, ended_at=datetime.now().isoformat(timespec="seconds"))
+            if self.n_dropped:
+                self.logger.warning(f"⚠️ Experiment tracker dropped {self.n_dropped} events (queue full).")
+            self.logger.info(f"🧪 Run {self.run_id} {status.lower()}: {self.n_written} events written.")
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def __enter__(self) -> "ExperimentTracker":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.end(status="FAILED" if exc_type is not None else "FINISHED")
+
+    def _enqueue(self, event: dict) -> None:
+        if not self.active:
+            return
+        event["timestamp"] = time.time()
+        try:
+            self._queue.put_nowait(event)
+            self.n_logged += 1
+        except queue.Full:
+            self.n_dropped += 1
+
+    def log_param(self, key: str, value) -> None:
+        self._enqueue({"type": "param", "key": key, "value": value})
+
+    def log_params(self, params: dict) -> None:
+        self._enqueue({"type": "params", "value": params})
+
+    def log_metric(self, key: str, value: float, step: int = None) -> None:
+        self._enqueue({"type": "metric", "key": key, "value": value, "step": step})
+
+    def log_metrics(self, metrics: dict, step: int = None) -> None:
+        self._enqueue({"type": "metrics", "value": metrics, "step": step})
+
+    def log_cv_result(self, family: str, params: dict, mean_score: float, std_score: float = None,
+                      **extra) -> None:
+        """One evaluated search candidate."""
+        self._enqueue({"type": "cv_result", "family": family, "params": params, "mean_score": mean_score,
+                       "std_score": std_score, **extra})
+
+    def log_cv_results(self, family: str, cv_results: dict) -> None:
+        """Every candidate of a search's cv_results_ (params, mean_test_score, std_test_score)."""
+        for params, mean_score, std_score in zip(cv_results["params"], cv_results["mean_test_score"],
+                                                 cv_results["std_test_score"]):
+            self.log_cv_result(family, params, mean_score, std_score)
+
+    def log_artifact(self, file_path: str, artifact_path: str = None) -> None:
+        """
+        Queues a copy of file_path into the run's artifacts directory (optionally below
+        artifact_path); the file is copied when its batch is written, so log it once final.
+        """
+        self._enqueue({"type": "artifact", "source": os.path.abspath(file_path), "artifact_path": artifact_path})
+
+    def _copy_artifact(self, event: dict) -> None:
+        target_dir = os.path.join(self.run_dir, ARTIFACTS_DIR_NAME, event["artifact_path"] or "")
+        os.makedirs(target_dir, exist_ok=True)
+        event["path"] = os.path.relpath(os.path.join(target_dir, os.path.basename(event["source"])), self.run_dir)
+        shutil.copy2(event["source"], os.path.join(self.run_dir, event["path"]))
+        # save_obj(mmap_arrays=True) keeps large arrays in a sibling directory
+        if os.path.isdir(f"{event['source']}.arrays"):
+            shutil.copytree(f"{event['source']}.arrays", os.path.join(self.run_dir, f"{event['path']}.arrays"),
+                            dirs_exist_ok=True)
+
+    def _write_batch(self, events_file, batch: list) -> None:
+        lines = []
+        for event in batch:
+            try:
+                if event["type"] == "artifact":
+                    self._copy_artifact(event)
+                lines.append(json.dumps(event, default=json_default))
+            except Exception as e:
+                # A bad event (missing artifact, unserializable value) must not lose the rest of the batch
+                self.logger.error(f"❌ Experiment tracker could not record an event of type {event['type']}: {e}")
+        if lines:
+            events_file.write("\n".join(lines) + "\n")
+            events_file.flush()
+            self.n_written += len(lines)
+
+    def _run(self) -> None:
+        with open(os.path.join(self.run_dir, EVENTS_FILE_NAME), "a") as events_file:
+            ended = False
+            while not ended:
+                batch = []
+                deadline = time.monotonic() + self.flush_interval_seconds
+                while len(batch) < self.batch_size:
+                    try:
+                        event = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                    except queue.Empty:
+                        break
+                    if event is _END_OF_RUN:
+                        ended = True
+                        break
+                    batch.append(event)
+                try:
+                    self._write_batch(events_file, batch)
+                except Exception as e:
+                    # e.g. a full disk: drop this batch but keep draining so end() still returns
+                    self.logger.error(f"❌ Experiment tracker could not write {len(batch)} events: {e}")
+
+    def _write_meta(self, status: str, ended_at: str = None) -> None:
+        meta = {
+            "run_id": self.run_id,
+            "run_name": self.run_name,
+            "experiment_name": self.experiment_name,
+            "status": status,
+            "started_at": self._started_at,
+            "ended_at": ended_at,
+            "events_written": self.n_written,
+            "events_dropped": self.n_dropped,
+        }
+        with open(os.path.join(self.run_dir, META_FILE_NAME), "w") as file:
+            json.dump(meta, file, indent=2)
+
+
+def load_run(run_dir: str) -> dict:
+    """
+    Folds a run's events into {"meta", "params", "metrics" (latest value), "metric_history",
+    "cv_results", "artifacts"}.
+    """
+    try:
+        with open(os.path.join(run_dir, META_FILE_NAME)) as file:
+            run = {"meta": json.load(file), "params": {}, "metrics": {}, "metric_history": {},
+                   "cv_results": [], "artifacts": []}
+        events_file_path = os.path.join(run_dir, EVENTS_FILE_NAME)
+        if not os.path.exists(events_file_path):
+            return run
+        with open(events_file_path) as file:
+            for line in file:
+                event = json.loads(line)
+                if event["type"] in ("param", "params"):
+                    run["params"].update(event["value"] if event["type"] == "params" else {event["key"]: event["value"]})
+                elif event["type"] in ("metric", "metrics"):
+                    metrics = event["value"] if event["type"] == "metrics" else {event["key"]: event["value"]}
+                    for key, value in metrics.items():
+                        run["metrics"][key] = value
+                        run["metric_history"].setdefault(key, []).append((event["step"], value, event["timestamp"]))
+                elif event["type"] == "cv_result":
+                    run["cv_results"].append(event)
+                elif event["type"] == "artifact":
+                    run["artifacts"].append(event["path"])
+        return run
+    except Exception as e:
+        raise CustomException(e, sys) from e
+
@@ -0,0 +1,271 @@
+import os
+import sys
+import json
+import zlib
+import struct
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from networksecurity.exception.exception import CustomException
+
+"""
+Columnar feature-store file for small-integer (int8) features.
+
+    MAGIC
+    row group 0: column chunk 0 | column chunk 1 | ...      (n_rows int8 values each,
+    row group 1: ...                                         raw or zlib-compressed)
+    footer (UTF-8 JSON: columns, compression, chunk offsets, per-column statistics)
+    footer length (uint64 little-endian)
+    MAGIC
+
+Missing values are stored as NULL_SENTINEL. Uncompressed chunks are read through
+np.memmap, so a projection only touches the pages of the requested columns.
+"""
+
+MAGIC = b"NSFS0001"
+FOOTER_LENGTH = struct.Struct("<Q")
+NULL_SENTINEL = np.int8(-128)
+COMPRESSIONS = (None, "zlib")
+
+
+def encode_int8_column(values: pd.Series) -> np.ndarray:
+    """Converts a column to int8, mapping missing values to NULL_SENTINEL."""
+    array = values.to_numpy(dtype=np.float64, na_value=np.nan)
+    is_null = np.isnan(array)
+    present = array[~is_null]
+    if present.size and (present.min() < -127 or present.max() > 127 or not np.array_equal(present, np.round(present))):
+        raise ValueError(f"Column '{values.name}' has values that are not integers in [-127, 127].")
+    encoded = np.where(is_null, NULL_SENTINEL, array).astype(np.int8)
+    return encoded
+
+
+def _column_stats(encoded: np.ndarray) -> dict:
+    """Null count, min/max and the count of every distinct value of an encoded chunk."""
+    counts = np.bincount(encoded.view(np.uint8) ^ 0x80, minlength=256)
+    values = np.flatnonzero(counts[1:]) - 127
+    return {
+        "null_count": int(counts[0]),
+        "min": int(values[0]) if values.size else None,
+        "max": int(values[-1]) if values.size else None,
+        "value_counts": {str(value): int(counts[value + 128]) for value in values},
+    }
+
+
+def _merge_stats(left: Optional[dict], right: dict) -> dict:
+    if left is None:
+        return right
+    value_counts = dict(left["value_counts"])
+    for value, count in right["value_counts"].items():
+        value_counts[value] = value_counts.get(value, 0) + count
+    present = [int(value) for value in value_counts]
+    return {
+        "null_count": left["null_count"] + right["null_count"],
+        "min": min(present) if present else None,
+        "max": max(present) if present else None,
+        "value_counts": dict(sorted(value_counts.items(), key=lambda item: int(item[0]))),
+    }
+
+
+def _read_footer(file) -> tuple:
+    """Returns (footer dict, byte offset where the footer starts)."""
+    file.seek(0, os.SEEK_END)
+    file_size = file.tell()
+    trailer_size = FOOTER_LENGTH.size + len(MAGIC)
+    if file_size < len(MAGIC) + trailer_size:
+        raise ValueError("File is too small to be a feature store.")
+    file.seek(0)
+    if file.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Not a feature store file (bad header magic).")
+    file.seek(file_size - trailer_size)
+    (footer_length,) = FOOTER_LENGTH.unpack(file.read(FOOTER_LENGTH.size))
+    if file.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Feature store file is truncated (bad trailing magic).")
+    footer_offset = file_size - trailer_size - footer_length
+    file.seek(footer_offset)
+    return json.loads(file.read(footer_length).decode("utf-8")), footer_offset
+
+
+class FeatureStoreWriter:
+    """
+    Writes DataFrames of small-integer columns as int8 row groups.
+
+    mode="a" reopens an existing file, drops its footer and continues after the
+    last row group; the columns must match. Use as a context manager or call close().
+    """
+
+    def __init__(self, file_path: str, columns: list = None, compression: str = None,
+                 row_group_size: int = 262_144, mode: str = "w"):
+        try:
+            if compression not in COMPRESSIONS:
+                raise ValueError(f"Unsupported compression '{compression}', expected one of {COMPRESSIONS}")
+            if mode not in ("w", "a"):
+                raise ValueError(f"Unsupported mode '{mode}', expected 'w' or 'a'")
+            self.file_path = file_path
+            self.row_group_size = row_group_size
+            dir_path = os.path.dirname(file_path)
+            if dir_path:
+                os.makedirs(dir_path, exist_ok=True)
+
+            if mode == "a" and os.path.exists(file_path):
+                self._file = open(file_path, "r+b")
+                footer, footer_offset = _read_footer(self._file)
+                if columns is not None and footer["columns"] and list(columns) != footer["columns"]:
+                    raise ValueError(f"Columns {list(columns)} do not match the existing file {footer['columns']}")
+                self.columns = footer["columns"] or (list(columns) if columns is not None else None)
+                self.compression = footer["compression"]
+                self.n_rows = footer["n_rows"]
+                self.row_groups = footer["row_groups"]
+                self.stats = footer["stats"]
+                self._file.seek(footer_offset)
+                self._file.truncate()
+            else:
+                self._file = open(file_path, "wb")
+                self._file.write(MAGIC)
+                self.columns = list(columns) if columns is not None else None
+                self.compression = compression
+                self.n_rows = 0
+                self.row_groups = []
+                self.stats = {}
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def __enter__(self) -> "FeatureStoreWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _write_row_group(self, df: pd.DataFrame) -> None:
+        chunks = []
+        for column in self.columns:
+            encoded = encode_int8_column(df[column])
+            payload = encoded.tobytes() if self.compression is None else zlib.compress(encoded.tobytes(), 1)
+            offset = self._file.tell()
+            self._file.write(payload)
+            chunk_stats = _column_stats(encoded)
+            self.stats[column] = _merge_stats(self.stats.get(column), chunk_stats)
+            chunks.append({"offset": offset, "length": len(payload), "null_count": chunk_stats["null_count"],
+                           "min": chunk_stats["min"], "max": chunk_stats["max"]})
+        self.row_groups.append({"n_rows": len(df), "columns": chunks})
+        self.n_rows += len(df)
+
+    def write(self, df: pd.DataFrame) -> None:
+        try:
+            if self.columns is None:
+                self.columns = df.columns.tolist()
+            missing_cols = [col for col in self.columns if col not in df.columns]
+            if missing_cols:
+                raise ValueError(f"DataFrame is missing feature store columns: {missing_cols}")
+            for start in range(0, len(df), self.row_group_size):
+                self._write_row_group(df.iloc[start:start + self.row_group_size])
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        footer = {
+            "columns": self.columns or [],
+            "compression": self.compression,
+            "n_rows": self.n_rows,
+            "row_groups": self.row_groups,
+            "stats": self.stats,
+        }
+        footer_bytes = json.dumps(footer).encode("utf-8")
+        self._file.write(footer_bytes)
+        self._file.write(FOOTER_LENGTH.pack(len(footer_bytes)))
+        self._file.write(MAGIC)
+        self._file.close()
+
+
+class FeatureStoreReader:
+    """
+    Reads a feature store file written by FeatureStoreWriter.
+
+    Columns without nulls come back as int8; columns with nulls as float32 with NaN.
+    Uncompressed files are memory-mapped copy-on-write, so in-place edits of the
+    returned frame never reach the file.
+    """
+
+    def __init__(self, file_path: str):
+        try:
+            if not os.path.exists(file_path):
+                raise FileNotFoundError(f"File not found: {file_path}")
+            self.file_path = file_path
+            with open(file_path, "rb") as file:
+                footer, _ = _read_footer(file)
+            self.columns = footer["columns"]
+            self.compression = footer["compression"]
+            self.n_rows = footer["n_rows"]
+            self.row_groups = footer["row_groups"]
+            self.stats = footer["stats"]
+            self._column_index = {column: index for index, column in enumerate(self.columns)}
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def _read_chunk(self, row_group: dict, column: str, file) -> np.ndarray:
+        chunk = row_group["columns"][self._column_index[column]]
+        if self.compression is None:
+            if row_group["n_rows"] == 0:
+                return np.empty(0, dtype=np.int8)
+            return np.memmap(self.file_path, dtype=np.int8, mode="c", offset=chunk["offset"],
+                             shape=(row_group["n_rows"],))
+        file.seek(chunk["offset"])
+        return np.frombuffer(zlib.decompress(file.read(chunk["length"])), dtype=np.int8).copy()
+
+    def _decode(self, encoded: np.ndarray, has_nulls: bool) -> np.ndarray:
+        if not has_nulls:
+            return encoded
+        decoded = encoded.astype(np.float32)
+        decoded[encoded == NULL_SENTINEL] = np.nan
+        return decoded
+
+    def read_column(self, column: str) -> np.ndarray:
+        """The encoded int8 values of one column across all row groups."""
+        with open(self.file_path, "rb") as file:
+            chunks = [self._read_chunk(row_group, column, file) for row_group in self.row_groups]
+        if len(chunks) == 1:
+            return chunks[0]
+        return np.concatenate(chunks) if chunks else np.empty(0, dtype=np.int8)
+
+    def read(self, columns: list = None) -> pd.DataFrame:
+        try:
+            columns = self.columns if columns is None else list(columns)
+            unknown_cols = [col for col in columns if col not in self._column_index]
+            if unknown_cols:
+                raise KeyError(f"Columns not in feature store: {unknown_cols}")
+            data = {column: self._decode(self.read_column(column), self.stats[column]["null_count"] > 0)
+                    for column in columns}
+            return pd.DataFrame(data, columns=columns, copy=False)
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def iter_batches(self, columns: list = None, batch_size: int = None) -> Iterator[pd.DataFrame]:
+        """Yields DataFrames of at most batch_size rows (one per row group by default)."""
+        columns = self.columns if columns is None else list(columns)
+        start_row = 0
+        with open(self.file_path, "rb") as file:
+            for row_group in self.row_groups:
+                # File-level null counts keep each column's dtype the same in every batch
+                data = {column: self._decode(self._read_chunk(row_group, column, file),
+                                             self.stats[column]["null_count"] > 0)
+                        for column in columns}
+                group_df = pd.DataFrame(data, columns=columns, copy=False)
+                group_df.index = pd.RangeIndex(start_row, start_row + row_group["n_rows"])
+                step = batch_size or max(row_group["n_rows"], 1)
+                for start in range(0, row_group["n_rows"], step):
+                    yield group_df.iloc[start:start + step]
+                start_row += row_group["n_rows"]
+
+
+def write_feature_store(file_path: str, df: pd.DataFrame, compression: str = None,
+                        row_group_size: int = 262_144) -> None:
+    with FeatureStoreWriter(file_path, columns=df.columns.tolist(), compression=compression,
+                            row_group_size=row_group_size) as writer:
+        writer.write(df)
+
+
+def read_feature_store(file_path: str, columns: list = None) -> pd.DataFrame:
+    return FeatureStoreReader(file_path).read(columns=columns)
@@ -1,11 +1,24 @@
 import os
 import sys
+import shutil
+import threading
+from collections import OrderedDict
 import numpy as np 
 import dill
 import yaml
+import pandas as pd
 from pandas import DataFrame
 from networksecurity.exception.exception import CustomException
 from networksecurity.logger.customlogger import Custom_Logger
+from networksecurity.constants.training_pipeline import (
+    OBJECT_CACHE_MAX_ENTRIES,
+    OBJECT_CACHE_MAX_BYTES,
+    OBJECT_MMAP_MIN_ARRAY_BYTES,
+    FEATURE_STORE_FILE_EXTENSION,
+    FEATURE_STORE_COMPRESSION,
+    FEATURE_STORE_ROW_GROUP_SIZE
+)
+from networksecurity.utils.feature_store import read_feature_store, write_feature_store, FeatureStoreReader
 from sklearn.model_selection import GridSearchCV
 from sklearn.metrics import r2_score
 from sklearn.metrics import accuracy_score
@@ -36,17 +49,139 @@ def write_yaml_file(file_path: str, content: object, replace: bool = False) -> N
     except Exception as e:
         raise CustomException(e, sys) from e
 
-def load_obj(file_path: str) -> object:
-    """Loads a pickled object from a file."""
+def json_default(value):
+    """json.dump(s) default= hook: numpy scalars in metric artifacts, tuples/sets in configs, str otherwise."""
+    if hasattr(value, "item"):
+        return value.item()
+    if isinstance(value, (set, tuple)):
+        return list(value)
+    return str(value)
+
+def _array_dir(file_path: str) -> str:
+    """Directory holding the large NumPy arrays of a pickle saved with mmap_arrays=True."""
+    return f"{file_path}.arrays"
+
+
+class _ObjectPickler(dill.Pickler):
+    """
+    dill pickler that, given an array_dir, writes large NumPy arrays to .npy files
+    beside the pickle instead of inline. Memory-mapped arrays coming from load_obj
+    are otherwise saved by value.
+    """
+
+    def __init__(self, file, array_dir: str = None):
+        super().__init__(file)
+        self.array_dir = array_dir
+        self.array_count = 0
+
+    def reducer_override(self, obj):
+        if isinstance(obj, np.memmap):
+            return np.array, (np.asarray(obj),)
+        return NotImplemented
+
+    def persistent_id(self, obj):
+        if self.array_dir is None:
+            return None
+        if type(obj) in (np.ndarray, np.memmap) and not obj.dtype.hasobject \
+                and obj.nbytes >= OBJECT_MMAP_MIN_ARRAY_BYTES:
+            os.makedirs(self.array_dir, exist_ok=True)
+            array_name = f"{self.array_count}.npy"
+            np.save(os.path.join(self.array_dir, array_name), obj, allow_pickle=False)
+            self.array_count += 1
+            return ("ndarray", array_name)
+        return None
+
+
+class _ArrayMappingUnpickler(dill.Unpickler):
+    """Resolves externalized arrays as read-only memory maps."""
+
+    def __init__(self, file, array_dir: str, mmap_mode: str):
+        super().__init__(file)
+        self.array_dir = array_dir
+        self.mmap_mode = mmap_mode
+
+    def persistent_load(self, pid):
+        kind, array_name = pid
+        if kind != "ndarray":
+            raise dill.UnpicklingError(f"Unsupported persistent id: {pid}")
+        return np.load(os.path.join(self.array_dir, array_name), mmap_mode=self.mmap_mode, allow_pickle=False)
+
+
+def load_obj(file_path: str, mmap_mode: str = "r") -> object:
+    """Loads a pickled object from a file, memory-mapping any externalized arrays."""
     logging.info("Entered the load object method of Utils")
     try:
         with open(file_path, 'rb') as file:  # Open the file in binary mode ('rb')
-            obj = dill.load(file)
+            obj = _ArrayMappingUnpickler(file, _array_dir(file_path), mmap_mode).load()
             logging.info("Exited the load object from the method utils")
             return obj
     except Exception as e:
         raise CustomException(e, sys) from e
 
+
+class _ObjectCache:
+    """
+    Process-wide LRU cache of loaded objects keyed by absolute path.
+    An entry is reused only while the file's (mtime_ns, size) is unchanged.
+    Its cost is the pickle size on disk; memory-mapped arrays live in the page cache.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, file_path: str) -> object:
+        key = os.path.abspath(file_path)
+        stat = os.stat(key)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(key)
+                return entry[2]
+
+        obj = load_obj(key)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.total_bytes -= previous[1]
+            self._entries[key] = (signature, stat.st_size, obj)
+            self.total_bytes += stat.st_size
+            # Always keep the entry just loaded, even if it alone exceeds the cap
+            while len(self._entries) > 1 and (
+                len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes
+            ):
+                _, (_, evicted_bytes, _) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_bytes
+        return obj
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+
+_object_cache = _ObjectCache(max_entries=OBJECT_CACHE_MAX_ENTRIES, max_bytes=OBJECT_CACHE_MAX_BYTES)
+
+
+def load_obj_cached(file_path: str) -> object:
+    """
+    Loads a pickled object through the process-wide cache; repeated loads of an
+    unchanged file return the same (shared, treat as read-only) object.
+    """
+    try:
+        return _object_cache.get(file_path)
+    except Exception as e:
+        raise CustomException(e, sys) from e
+
+
+def clear_obj_cache() -> None:
+    """Drops every cached object."""
+    _object_cache.clear()
+
 def save_numpy_array_data(file_path: str, array: np.array) -> None:
     """Saves a numpy array to a file."""
     try:
@@ -59,29 +194,85 @@ def save_numpy_array_data(file_path: str, array: np.array) -> None:
     except Exception as e:
         raise CustomException(e, sys) from e
 
-def load_numpy_array_data(file_path: str) -> np.array:
-    """Loads a numpy array from a file."""
+def load_numpy_array_data(file_path: str, mmap_mode: str = None) -> np.array:
+    """Loads a numpy array from a file, memory-mapped when mmap_mode is given."""
     try:
+        if mmap_mode is not None:
+            return np.load(file_path, mmap_mode=mmap_mode)
         with open(file_path, "rb") as file:  # Open the file in binary mode ('rb')
             return np.load(file)
     except Exception as e:
         raise CustomException(e, sys) from e
 
-def save_obj(file_path: str, obj: object) -> None:
-    """Saves an object to a file using dill."""
+def save_obj(file_path: str, obj: object, mmap_arrays: bool = False) -> None:
+    """
+    Saves an object to a file using dill. With mmap_arrays=True, large NumPy arrays
+    are written as .npy files beside it so load_obj can memory-map them.
+    """
     logging.info("Enter the save method object of the utils")
     try:
         dir_path = os.path.dirname(file_path)
         if not os.path.exists(dir_path):
             os.makedirs(dir_path)
 
+        # Arrays from a previous save must not outlive the pickle that referenced them
+        array_dir = _array_dir(file_path)
+        if os.path.isdir(array_dir):
+            shutil.rmtree(array_dir)
+
         with open(file_path, "wb") as file:  # Open the file in binary mode ('wb')
-            dill.dump(obj, file)
+            _ObjectPickler(file, array_dir if mmap_arrays else None).dump(obj)
 
         logging.info("Exited the save object from the utils")
     except Exception as e:
         raise CustomException(e, sys) from e
 
+def read_dataframe(file_path: str, columns: list = None) -> DataFrame:
+    """Reads a feature store file (memory-mapped int8 columns) or a CSV file."""
+    try:
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File not found: {file_path}")
+        if file_path.endswith(FEATURE_STORE_FILE_EXTENSION):
+            return read_feature_store(file_path, columns=columns)
+        return pd.read_csv(file_path, usecols=columns)
+    except Exception as e:
+        raise CustomException(e, sys) from e
+
+def count_rows(file_path: str) -> int:
+    """Row count of a feature store (footer), NumPy array (header) or CSV file (line scan)."""
+    try:
+        if file_path.endswith(FEATURE_STORE_FILE_EXTENSION):
+            return FeatureStoreReader(file_path).n_rows
+        with open(file_path, "rb") as file:
+            is_npy = file.read(6) == b"\x93NUMPY"
+        # Recognised by content: save_numpy_array_data also writes arrays under .csv names
+        if is_npy:
+            return int(np.load(file_path, mmap_mode="r").shape[0])
+        n_lines, last_block = 0, b""
+        with open(file_path, "rb") as file:
+            for block in iter(lambda: file.read(1024 * 1024), b""):
+                n_lines += block.count(b"\n")
+                last_block = block
+        if last_block and not last_block.endswith(b"\n"):
+            n_lines += 1
+        return max(n_lines - 1, 0)
+    except Exception as e:
+        raise CustomException(e, sys) from e
+
+def write_dataframe(file_path: str, df: DataFrame) -> None:
+    """Writes a DataFrame as a feature store file or CSV, depending on the file extension."""
+    try:
+        dir_path = os.path.dirname(file_path)
+        if dir_path:
+            os.makedirs(dir_path, exist_ok=True)
+        if file_path.endswith(FEATURE_STORE_FILE_EXTENSION):
+            write_feature_store(file_path, df, compression=FEATURE_STORE_COMPRESSION,
+                                row_group_size=FEATURE_STORE_ROW_GROUP_SIZE)
+        else:
+            df.to_csv(file_path, index=False)
+    except Exception as e:
+        raise CustomException(e, sys) from e
+
 def drop_columns(df: DataFrame, cols: list) -> DataFrame:
     """Drops specified columns from a DataFrame."""
     logging.info("Entered drop column of the Utils")
@@ -1,37 +1,177 @@
 import os
 import sys
+import numpy as np
 from networksecurity.entity.artifact_entity import ClassificationMetricArtifact
 from networksecurity.logger.customlogger import Custom_Logger
 from networksecurity.exception.exception import CustomException
-from sklearn.metrics import (
-    precision_score,
-    recall_score,
-    f1_score,
-    r2_score
-)
+
+
+def _safe_divide(numerator: float, denominator: float) -> float:
+    # sklearn's zero_division default: an undefined ratio scores 0.0
+    return float(numerator / denominator) if denominator else 0.0
+
+
+class ConfusionMatrixAccumulator:
+    """
+    Binary confusion matrix built incrementally over label chunks.
+
+    Each update() is one vectorized pass (two comparisons and a bincount) and
+    only the four counts are kept, so metrics over a prediction stream of any
+    length need O(1) memory. Precision, recall and F1 follow sklearn's binary
+    defaults (pos_label=1, zero_division=0.0); r2 is derived from the counts,
+    which is exact as long as the labels take only two values.
+    """
+
+    def __init__(self, positive_label=1):
+        self.positive_label = positive_label
+        # [tn, fp, fn, tp]
+        self.counts = np.zeros(4, dtype=np.int64)
+
+    def update(self, y_true, y_pred) -> "ConfusionMatrixAccumulator":
+        y_true = np.asarray(y_true).ravel()
+        y_pred = np.asarray(y_pred).ravel()
+        if y_true.shape != y_pred.shape:
+            raise ValueError(f"y_true and y_pred have different lengths: {len(y_true)} != {len(y_pred)}")
+        cells = 2 * (y_true == self.positive_label).astype(np.intp) + (y_pred == self.positive_label)
+        self.counts += np.bincount(cells, minlength=4)
+        return self
+
+    def merge(self, other: "ConfusionMatrixAccumulator") -> "ConfusionMatrixAccumulator":
+        """Adds another accumulator's counts, e.g. from a parallel worker."""
+        self.counts += other.counts
+        return self
+
+    @property
+    def tn(self) -> int:
+        return int(self.counts[0])
+
+    @property
+    def fp(self) -> int:
+        return int(self.counts[1])
+
+    @property
+    def fn(self) -> int:
+        return int(self.counts[2])
+
+    @property
+    def tp(self) -> int:
+        return int(self.counts[3])
+
+    @property
+    def n_samples(self) -> int:
+        return int(self.counts.sum())
+
+    @property
+    def confusion_matrix(self) -> np.ndarray:
+        """[[tn, fp], [fn, tp]], the layout of sklearn.metrics.confusion_matrix."""
+        return self.counts.reshape(2, 2).copy()
+
+    @property
+    def precision(self) -> float:
+        return _safe_divide(self.tp, self.tp + self.fp)
+
+    @property
+    def recall(self) -> float:
+        return _safe_divide(self.tp, self.tp + self.fn)
+
+    @property
+    def f1_score(self) -> float:
+        return _safe_divide(2 * self.tp, 2 * self.tp + self.fp + self.fn)
+
+    @property
+    def accuracy(self) -> float:
+        return _safe_divide(self.tp + self.tn, self.n_samples)
+
+    @property
+    def r2_score(self) -> float:
+        # Both sums of squares scale with (positive - negative)^2, which cancels in the ratio
+        n_samples = self.n_samples
+        residual = self.fp + self.fn
+        positive_rate = _safe_divide(self.tp + self.fn, n_samples)
+        total = n_samples * positive_rate * (1 - positive_rate)
+        if total == 0:
+            # Constant y_true: sklearn's force_finite convention
+            return 1.0 if residual == 0 else 0.0
+        return float(1 - residual / total)
+
+    def to_artifact(self) -> ClassificationMetricArtifact:
+        return ClassificationMetricArtifact(
+            precision=self.precision,
+            recall=self.recall,
+            f1_score=self.f1_score,
+            r2_score=self.r2_score
+        )
+
+
+class ThresholdSweepAccumulator:
+    """
+    Confusion matrices of a score stream at many decision thresholds at once.
+
+    A row is predicted positive at threshold t when its score is >= t. Each
+    update() bins the scores between the sorted thresholds (one searchsorted)
+    and counts positives and negatives per bin; a reverse cumulative sum then
+    gives tp and fp at every threshold, so a sweep costs O(n log k) time and
+    O(k) memory however many rows stream through.
+    """
+
+    def __init__(self, thresholds, positive_label=1):
+        self.thresholds = np.unique(np.asarray(thresholds, dtype=np.float64))
+        self.positive_label = positive_label
+        n_bins = len(self.thresholds) + 1
+        self._positive_bins = np.zeros(n_bins, dtype=np.int64)
+        self._negative_bins = np.zeros(n_bins, dtype=np.int64)
+
+    def update(self, y_true, scores) -> "ThresholdSweepAccumulator":
+        y_true = np.asarray(y_true).ravel()
+        scores = np.asarray(scores, dtype=np.float64).ravel()
+        if y_true.shape != scores.shape:
+            raise ValueError(f"y_true and scores have different lengths: {len(y_true)} != {len(scores)}")
+        # Bin b holds scores that clear exactly the first b thresholds
+        bins = np.searchsorted(self.thresholds, scores, side="right")
+        positive = y_true == self.positive_label
+        n_bins = len(self._positive_bins)
+        self._positive_bins += np.bincount(bins[positive], minlength=n_bins)
+        self._negative_bins += np.bincount(bins[~positive], minlength=n_bins)
+        return self
+
+    def accumulators(self) -> list:
+        """One ConfusionMatrixAccumulator per threshold, in ascending threshold order."""
+        # Rows in bins above index j clear threshold j
+        tp = np.cumsum(self._positive_bins[::-1])[::-1][1:]
+        fp = np.cumsum(self._negative_bins[::-1])[::-1][1:]
+        n_positive, n_negative = self._positive_bins.sum(), self._negative_bins.sum()
+        results = []
+        for index in range(len(self.thresholds)):
+            accumulator = ConfusionMatrixAccumulator(positive_label=self.positive_label)
+            accumulator.counts[:] = [n_negative - fp[index], fp[index], n_positive - tp[index], tp[index]]
+            results.append(accumulator)
+        return results
+
+    def metrics(self) -> list:
+        """[{threshold, precision, recall, f1_score, tp, fp, fn, tn}] per threshold."""
+        return [{"threshold": float(threshold), "precision": accumulator.precision, "recall": accumulator.recall,
+                 "f1_score": accumulator.f1_score, "tp": accumulator.tp, "fp": accumulator.fp,
+                 "fn": accumulator.fn, "tn": accumulator.tn}
+                for threshold, accumulator in zip(self.thresholds, self.accumulators())]
+
+    def best_threshold(self, metric: str = "f1_score") -> dict:
+        """The sweep entry maximizing metric (the lowest such threshold on ties)."""
+        return max(self.metrics(), key=lambda row: row[metric])
+
 
 def get_classification_score(y_true, y_pred) -> ClassificationMetricArtifact:
     """
     Calculate classification metrics: precision, recall, f1-score, and r2-score.
-    
+
     Args:
         y_true (list or array): True labels.
         y_pred (list or array): Predicted labels.
-    
+
     Returns:
         ClassificationMetricArtifact: An artifact containing the classification metrics.
     """
     try:
-        model_precision = precision_score(y_true, y_pred)
-        model_recall = recall_score(y_true, y_pred)
-        model_f1 = f1_score(y_true, y_pred)
-        model_r2 = r2_score(y_true, y_pred)
-
-        return ClassificationMetricArtifact(
-            precision=model_precision,
-            recall=model_recall,
-            f1_score=model_f1,
-            r2_score=model_r2
-        )
+        # One confusion-matrix pass instead of a validation and scan per metric
+        return ConfusionMatrixAccumulator().update(y_true, y_pred).to_artifact()
     except Exception as e:
         raise CustomException(e, sys) from e
@@ -0,0 +1,140 @@
+import os
+import sys
+import json
+
+import numpy as np
+import pandas as pd
+from scipy.stats import chi2
+
+from networksecurity.exception.exception import CustomException
+from networksecurity.utils.feature_store import encode_int8_column
+
+# One bucket per int8 value; bucket 0 (the feature store null sentinel -128) counts missing values
+N_BUCKETS = 256
+# Rows binned per bincount call; bounds the temporary bucket-index array
+_ROW_BLOCK_SIZE = 65_536
+# Added to empty buckets before PSI / Jensen-Shannon so log ratios stay finite
+_SMOOTHING = 1e-6
+
+
+def _int8_matrix(df: pd.DataFrame, columns: list) -> np.ndarray:
+    return np.column_stack([
+        df[column].to_numpy() if df[column].dtype == np.int8 else encode_int8_column(df[column])
+        for column in columns
+    ]) if columns else np.empty((len(df), 0), dtype=np.int8)
+
+
+class HistogramSketch:
+    """
+    Per-column value counts of small-integer features, shape (n_columns, 256).
+
+    Built in one bincount pass over the int8 matrix: every value is offset into
+    its column's block of 256 buckets. Sketches with the same columns merge by
+    adding counts, so a reference can grow incrementally without rescanning data.
+    """
+
+    def __init__(self, columns: list, counts: np.ndarray = None):
+        self.columns = list(columns)
+        self.counts = counts if counts is not None else np.zeros((len(self.columns), N_BUCKETS), dtype=np.int64)
+
+    @property
+    def n_rows(self) -> int:
+        return int(self.counts[0].sum()) if len(self.columns) else 0
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, columns: list = None) -> "HistogramSketch":
+        sketch = cls(columns if columns is not None else df.columns.tolist())
+        sketch.update(df)
+        return sketch
+
+    def update(self, df: pd.DataFrame) -> "HistogramSketch":
+        try:
+            matrix = _int8_matrix(df, self.columns)
+            self.update_matrix(matrix)
+            return self
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def update_matrix(self, matrix: np.ndarray) -> None:
+        """Adds the rows of an int8 matrix whose columns are in self.columns order."""
+        n_columns = len(self.columns)
+        column_offsets = np.arange(n_columns, dtype=np.intp) * N_BUCKETS
+        for start in range(0, len(matrix), _ROW_BLOCK_SIZE):
+            block = matrix[start:start + _ROW_BLOCK_SIZE]
+            # int8 -> uint8 bucket with -128 at 0, then shift each column into its own 256 buckets
+            buckets = (block.view(np.uint8) ^ 0x80) + column_offsets
+            self.counts += np.bincount(buckets.ravel(), minlength=n_columns * N_BUCKETS).reshape(n_columns, N_BUCKETS)
+
+    def merge(self, other: "HistogramSketch") -> "HistogramSketch":
+        if other.columns != self.columns:
+            raise ValueError("Only sketches over the same columns can be merged.")
+        return HistogramSketch(self.columns, self.counts + other.counts)
+
+    def to_dict(self) -> dict:
+        return {
+            column: {str(int(bucket) - 128): int(self.counts[index, bucket])
+                     for bucket in np.flatnonzero(self.counts[index])}
+            for index, column in enumerate(self.columns)
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "HistogramSketch":
+        sketch = cls(list(data))
+        for index, value_counts in enumerate(data.values()):
+            for value, count in value_counts.items():
+                sketch.counts[index, int(value) + 128] = count
+        return sketch
+
+    def save(self, file_path: str) -> None:
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, "w") as file:
+            json.dump(self.to_dict(), file)
+
+    @classmethod
+    def load(cls, file_path: str) -> "HistogramSketch":
+        with open(file_path, "r") as file:
+            return cls.from_dict(json.load(file))
+
+
+def compute_drift(reference: HistogramSketch, current: HistogramSketch, threshold: float = 0.05) -> dict:
+    """
+    Per-column drift of current against reference, all columns at once:
+    chi-square homogeneity test (p_value, drift when below threshold), population
+    stability index and Jensen-Shannon divergence (base 2, in [0, 1]).
+    """
+    try:
+        columns = [column for column in reference.columns if column in current.columns]
+        ref_counts = reference.counts[[reference.columns.index(column) for column in columns]].astype(np.float64)
+        cur_counts = current.counts[[current.columns.index(column) for column in columns]].astype(np.float64)
+
+        # Chi-square test of the 2 x buckets contingency table, ignoring buckets empty in both samples
+        ref_total = ref_counts.sum(axis=1, keepdims=True)
+        cur_total = cur_counts.sum(axis=1, keepdims=True)
+        bucket_total = ref_counts + cur_counts
+        grand_total = ref_total + cur_total
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ref_expected = bucket_total * ref_total / grand_total
+            cur_expected = bucket_total * cur_total / grand_total
+            statistic = np.nansum((ref_counts - ref_expected) ** 2 / ref_expected
+                                  + (cur_counts - cur_expected) ** 2 / cur_expected, axis=1)
+        dof = np.maximum((bucket_total > 0).sum(axis=1) - 1, 1)
+        p_value = chi2.sf(statistic, dof)
+
+        p = (ref_counts + _SMOOTHING) / (ref_total + _SMOOTHING * N_BUCKETS)
+        q = (cur_counts + _SMOOTHING) / (cur_total + _SMOOTHING * N_BUCKETS)
+        psi = ((q - p) * np.log(q / p)).sum(axis=1)
+        m = (p + q) / 2
+        js_divergence = 0.5 * (p * np.log2(p / m)).sum(axis=1) + 0.5 * (q * np.log2(q / m)).sum(axis=1)
+
+        return {
+            column: {
+                "p_value": float(p_value[index]),
+                "chi2_statistic": float(statistic[index]),
+                "psi": float(psi[index]),
+                "js_divergence": float(js_divergence[index]),
+                "drift_status": bool(p_value[index] < threshold),
+            }
+            for index, column in enumerate(columns)
+        }
+    except Exception as e:
+        raise CustomException(e, sys) from e
@@ -0,0 +1,262 @@
+import os
+import sys
+import json
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from networksecurity.exception.exception import CustomException
+from networksecurity.logger.customlogger import Custom_Logger
+from networksecurity.constants.training_pipeline import TARGET_COLUMN
+from networksecurity.entity.config_entity import DriftMonitorConfigEntity
+from networksecurity.utils.feature_store import NULL_SENTINEL
+from networksecurity.utils.main_utils import write_yaml_file
+from networksecurity.utils.ml_metric.drift_metric import N_BUCKETS, HistogramSketch, compute_drift
+
+
+def _to_int8(values: np.ndarray) -> np.ndarray:
+    """int8 bucket values of scoring input; unlike the feature store, bad values are clipped, never raised."""
+    values = np.asarray(values)
+    if values.dtype == np.int8:
+        return values
+    values = values.astype(np.float64, copy=False)
+    encoded = np.clip(np.rint(values), -127, 127)
+    encoded[np.isnan(values)] = NULL_SENTINEL
+    return encoded.astype(np.int8)
+
+
+def _reference_label_counts(reference: HistogramSketch) -> Optional[np.ndarray]:
+    if TARGET_COLUMN not in reference.columns:
+        return None
+    counts = reference.counts[reference.columns.index(TARGET_COLUMN)].copy()
+    # The trainer learns the target with -1 mapped to 0, so the model predicts 0/1
+    counts[128] += counts[127]
+    counts[127] = 0
+    return counts
+
+
+def _label_rates(counts: np.ndarray) -> dict:
+    total = counts[1:].sum()
+    return {int(bucket) - 128: float(counts[bucket] / total) for bucket in np.flatnonzero(counts[1:]) + 1} if total else {}
+
+
+class DriftMonitor:
+    """
+    Rolling-window drift monitor for scoring traffic.
+
+    observe() bins every scored batch into the open slot with one bincount over the
+    int8 feature matrix and one over the predicted labels. The window is the last
+    window_slots closed slots of slot_rows rows plus the open slot, kept as running
+    totals, so memory is fixed however much traffic goes through. Comparing the
+    window with the training reference sketch happens in evaluate(), which the
+    background thread started by start() runs every summary_interval_seconds: it
+    logs an alert when a feature or the prediction rate crosses the PSI threshold
+    and rewrites the summary file (JSON for a .json path, YAML otherwise).
+    """
+
+    def __init__(self, reference: HistogramSketch, feature_columns: list = None, window_slots: int = 12,
+                 slot_rows: int = 10_000, min_rows: int = 1_000, psi_threshold: float = 0.2,
+                 summary_file_path: str = None, summary_interval_seconds: float = 60.0, max_alerts: int = 100):
+        try:
+            self.logger = Custom_Logger().get_logger()
+            self.feature_columns = list(feature_columns) if feature_columns is not None else [
+                column for column in reference.columns if column != TARGET_COLUMN
+            ]
+            unknown_cols = [col for col in self.feature_columns if col not in reference.columns]
+            if unknown_cols:
+                raise ValueError(f"Columns not in the reference histograms: {unknown_cols}")
+            self.reference = HistogramSketch(
+                self.feature_columns,
+                reference.counts[[reference.columns.index(column) for column in self.feature_columns]]
+            )
+            self.reference_label_counts = _reference_label_counts(reference)
+            self.window_slots = window_slots
+            self.slot_rows = slot_rows
+            self.min_rows = min_rows
+            self.psi_threshold = psi_threshold
+            self.summary_file_path = summary_file_path
+            self.summary_interval_seconds = summary_interval_seconds
+
+            self._lock = threading.Lock()
+            self._slot_features = HistogramSketch(self.feature_columns)
+            self._slot_labels = np.zeros(N_BUCKETS, dtype=np.int64)
+            self._slot_row_count = 0
+            self._closed_slots = deque()
+            self._window_features = np.zeros((len(self.feature_columns), N_BUCKETS), dtype=np.int64)
+            self._window_labels = np.zeros(N_BUCKETS, dtype=np.int64)
+            self._window_row_count = 0
+            self.total_rows = 0
+
+            self.alerts = deque(maxlen=max_alerts)
+            self._drifted = set()
+            self.last_summary = {}
+            self._stop_event = threading.Event()
+            self._thread = None
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def __enter__(self) -> "DriftMonitor":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+    def observe(self, features, predictions) -> None:
+        """
+        Adds one scored batch. features is a DataFrame holding the feature columns or a
+        matrix whose columns are in feature_columns order.
+        """
+        if isinstance(features, pd.DataFrame):
+            features = features[self.feature_columns].to_numpy()
+        matrix = _to_int8(features)
+        label_buckets = _to_int8(np.asarray(predictions).ravel()).view(np.uint8) ^ 0x80
+        label_counts = np.bincount(label_buckets, minlength=N_BUCKETS)
+        with self._lock:
+            self._slot_features.update_matrix(matrix)
+            self._slot_labels += label_counts
+            self._slot_row_count += len(matrix)
+            self.total_rows += len(matrix)
+            if self._slot_row_count >= self.slot_rows:
+                self._close_slot()
+
+    def _close_slot(self) -> None:
+        slot = (self._slot_features.counts, self._slot_labels, self._slot_row_count)
+        self._closed_slots.append(slot)
+        self._window_features += slot[0]
+        self._window_labels += slot[1]
+        self._window_row_count += slot[2]
+        if len(self._closed_slots) > self.window_slots:
+            expired_features, expired_labels, expired_rows = self._closed_slots.popleft()
+            self._window_features -= expired_features
+            self._window_labels -= expired_labels
+            self._window_row_count -= expired_rows
+        self._slot_features = HistogramSketch(self.feature_columns)
+        self._slot_labels = np.zeros(N_BUCKETS, dtype=np.int64)
+        self._slot_row_count = 0
+
+    def _alert(self, name: str, report: dict, now: str) -> None:
+        self.alerts.append({"time": now, "column": name, "psi": report["psi"], "p_value": report["p_value"]})
+        self.logger.warning(f"🚨 Drift alert: '{name}' PSI {report['psi']:.3f} >= {self.psi_threshold} "
+                            f"(p-value {report['p_value']:.2e})")
+
+    def evaluate(self) -> dict:
+        """Compares the current window with the reference and returns the summary."""
+        try:
+            with self._lock:
+                window_features = self._window_features + self._slot_features.counts
+                window_labels = self._window_labels + self._slot_labels
+                window_rows = self._window_row_count + self._slot_row_count
+                total_rows = self.total_rows
+            now = datetime.now().isoformat(timespec="seconds")
+            summary = {
+                "time": now,
+                "total_rows": total_rows,
+                "window_rows": window_rows,
+                "psi_threshold": self.psi_threshold,
+                "prediction_rates": _label_rates(window_labels),
+            }
+            if window_rows < self.min_rows:
+                summary["status"] = "warming_up"
+                summary["recent_alerts"] = list(self.alerts)
+                self.last_summary = summary
+                return summary
+
+            reports = compute_drift(self.reference, HistogramSketch(self.feature_columns, window_features))
+            if self.reference_label_counts is not None:
+                summary["reference_prediction_rates"] = _label_rates(self.reference_label_counts)
+                reports["prediction_rate"] = compute_drift(
+                    HistogramSketch([TARGET_COLUMN], self.reference_label_counts[np.newaxis]),
+                    HistogramSketch([TARGET_COLUMN], window_labels[np.newaxis])
+                )[TARGET_COLUMN]
+
+            # Chi-square p-values reject almost anything on large windows; alerts go by PSI
+            drifted = set()
+            for name, report in reports.items():
+                report["drift_status"] = report["psi"] >= self.psi_threshold
+                if report["drift_status"]:
+                    drifted.add(name)
+                    if name not in self._drifted:
+                        self._alert(name, report, now)
+            for name in self._drifted - drifted:
+                self.logger.info(f"✅ Drift cleared: '{name}' PSI {reports[name]['psi']:.3f}")
+            self._drifted = drifted
+
+            summary["status"] = "drift" if drifted else "ok"
+            summary["drifted"] = sorted(drifted)
+            summary["prediction_drift"] = reports.pop("prediction_rate", None)
+            summary["columns"] = reports
+            summary["recent_alerts"] = list(self.alerts)
+            self.last_summary = summary
+            return summary
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def write_summary(self, summary: dict = None) -> None:
+        try:
+            if not self.summary_file_path:
+                return
+            summary = summary if summary is not None else self.last_summary
+            if self.summary_file_path.endswith(".json"):
+                os.makedirs(os.path.dirname(self.summary_file_path), exist_ok=True)
+                with open(self.summary_file_path, "w") as file:
+                    json.dump(summary, file, indent=2)
+            else:
+                write_yaml_file(file_path=self.summary_file_path, content=summary, replace=True)
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.summary_interval_seconds):
+            try:
+                self.write_summary(self.evaluate())
+            except Exception as e:
+                self.logger.error(f"❌ Drift monitor evaluation failed: {e}")
+
+    def start(self) -> None:
+        """Starts the periodic evaluation thread (no-op when summary_interval_seconds <= 0)."""
+        if self._thread is not None or self.summary_interval_seconds <= 0:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="drift-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> dict:
+        """Stops the thread and writes a final summary, which is returned."""
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+        summary = self.evaluate()
+        self.write_summary(summary)
+        return summary
+
+
+def load_drift_monitor(drift_monitor_config: DriftMonitorConfigEntity,
+                       feature_columns: list = None) -> Optional[DriftMonitor]:
+    """The configured monitor, or None when it is disabled or training has not saved reference histograms."""
+    try:
+        logger = Custom_Logger().get_logger()
+        if not drift_monitor_config.enabled:
+            return None
+        if not os.path.exists(drift_monitor_config.reference_histogram_file_path):
+            logger.warning(f"⚠️ Drift monitoring disabled: no reference histograms at "
+                           f"{drift_monitor_config.reference_histogram_file_path}")
+            return None
+        return DriftMonitor(
+            reference=HistogramSketch.load(drift_monitor_config.reference_histogram_file_path),
+            feature_columns=feature_columns,
+            window_slots=drift_monitor_config.window_slots,
+            slot_rows=drift_monitor_config.slot_rows,
+            min_rows=drift_monitor_config.min_rows,
+            psi_threshold=drift_monitor_config.psi_threshold,
+            summary_file_path=drift_monitor_config.summary_file_path,
+            summary_interval_seconds=drift_monitor_config.summary_interval_seconds,
+            max_alerts=drift_monitor_config.max_alerts
+        )
+    except Exception as e:
+        raise CustomException(e, sys) from e
@@ -0,0 +1,208 @@
+import sys
+import numpy as np
+
+from networksecurity.exception.exception import CustomException
+
+# Rows scored per traversal block; bounds the n_trees * block index arrays
+_ROW_BLOCK_SIZE = 4096
+
+
+class CompiledEnsemble:
+    """
+    Array-backed evaluator for fitted sklearn tree ensembles.
+
+    All trees are concatenated into contiguous node arrays (split feature,
+    threshold, child indices, leaf value) with tree_roots marking where each
+    tree starts. A batch is scored level by level for every (tree, row) pair at
+    once, advancing only the pairs that have not reached a leaf yet, so there is
+    no Python loop per estimator. Only NumPy is needed to load and evaluate it,
+    but rows still pass through the NetworkModel's preprocessor
+    (SampledKNNImputer), which imports sklearn. It beats sklearn on small
+    batches only, so ScoringModel routes larger batches to the sklearn model.
+
+    kind:
+        "forest"   - averaged leaf class probabilities (RandomForest, DecisionTree)
+        "boosting" - base score plus learning-rate scaled leaf values (GradientBoosting)
+        "vote"     - weighted SAMME class votes (AdaBoost)
+    """
+
+    def __init__(self, kind: str, tree_roots: np.ndarray, feature: np.ndarray, threshold: np.ndarray,
+                 children_left: np.ndarray, children_right: np.ndarray, missing_go_to_left: np.ndarray,
+                 leaf_value: np.ndarray, classes: np.ndarray, base_score: np.ndarray):
+        self.kind = kind
+        self.tree_roots = tree_roots
+        self.feature = feature
+        self.threshold = threshold
+        self.children_left = children_left
+        self.children_right = children_right
+        self.missing_go_to_left = missing_go_to_left
+        self.leaf_value = leaf_value
+        self.classes = classes
+        self.base_score = base_score
+        self.is_leaf = children_left == -1
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.tree_roots)
+
+    def _leaf_index(self, X: np.ndarray) -> np.ndarray:
+        """Returns the leaf reached by every (tree, row) pair, shape (n_trees * n_rows,)."""
+        n_rows, n_features = X.shape
+        flat_X = X.ravel()
+        node = np.repeat(self.tree_roots, n_rows)
+        row_offset = np.tile(np.arange(n_rows, dtype=np.intp) * n_features, self.n_trees)
+        active = np.flatnonzero(~self.is_leaf[node])
+        while active.size:
+            current = node[active]
+            values = flat_X[row_offset[active] + self.feature[current]]
+            go_left = (values <= self.threshold[current]) | (np.isnan(values) & self.missing_go_to_left[current])
+            current = np.where(go_left, self.children_left[current], self.children_right[current])
+            node[active] = current
+            active = active[~self.is_leaf[current]]
+        return node
+
+    def aggregate(self, X) -> np.ndarray:
+        """Returns the summed leaf values of all trees, shape (n_samples, n_outputs)."""
+        # sklearn trees compare float32 features against their thresholds
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        n_outputs = self.leaf_value.shape[1]
+        out = np.empty((X.shape[0], n_outputs), dtype=np.float64)
+        for start in range(0, X.shape[0], _ROW_BLOCK_SIZE):
+            block = X[start:start + _ROW_BLOCK_SIZE]
+            leaves = self.leaf_value[self._leaf_index(block)].reshape(self.n_trees, len(block), n_outputs)
+            out[start:start + len(block)] = leaves.sum(axis=0)
+        return out
+
+    def predict(self, X) -> np.ndarray:
+        try:
+            aggregated = self.aggregate(X)
+            if self.kind == "forest":
+                encoded_classes = np.argmax(aggregated, axis=1)
+            elif self.kind == "boosting":
+                raw_predictions = aggregated + self.base_score
+                if raw_predictions.shape[1] == 1:
+                    encoded_classes = (raw_predictions[:, 0] >= 0).astype(int)
+                else:
+                    encoded_classes = np.argmax(raw_predictions, axis=1)
+            elif self.kind == "vote":
+                if len(self.classes) == 2:
+                    encoded_classes = (aggregated[:, 1] - aggregated[:, 0] > 0).astype(int)
+                else:
+                    encoded_classes = np.argmax(aggregated, axis=1)
+            else:
+                raise ValueError(f"Unknown compiled ensemble kind: {self.kind}")
+            return self.classes[encoded_classes]
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def save(self, file_path: str) -> None:
+        np.savez(
+            file_path,
+            kind=np.array(self.kind),
+            tree_roots=self.tree_roots,
+            feature=self.feature,
+            threshold=self.threshold,
+            children_left=self.children_left,
+            children_right=self.children_right,
+            missing_go_to_left=self.missing_go_to_left,
+            leaf_value=self.leaf_value,
+            classes=self.classes,
+            base_score=self.base_score,
+        )
+
+    @classmethod
+    def load(cls, file_path: str) -> "CompiledEnsemble":
+        try:
+            with np.load(file_path, allow_pickle=False) as data:
+                arrays = {name: data[name] for name in data.files}
+            arrays["kind"] = str(arrays["kind"])
+            return cls(**arrays)
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+
+def _flatten_trees(trees: list, leaf_values: list) -> dict:
+    """Concatenates per-tree node arrays, rebasing child indices onto the shared arrays."""
+    node_counts = np.array([tree.node_count for tree in trees], dtype=np.intp)
+    tree_roots = np.concatenate([[0], np.cumsum(node_counts)[:-1]]).astype(np.intp)
+
+    feature, threshold, children_left, children_right, missing_go_to_left = [], [], [], [], []
+    for tree, root in zip(trees, tree_roots):
+        is_split = tree.children_left != -1
+        feature.append(np.where(is_split, tree.feature, 0))
+        threshold.append(np.where(is_split, tree.threshold, np.inf))
+        children_left.append(np.where(is_split, tree.children_left + root, -1))
+        children_right.append(np.where(is_split, tree.children_right + root, -1))
+        if hasattr(tree, "missing_go_to_left"):
+            missing_go_to_left.append(np.asarray(tree.missing_go_to_left, dtype=bool) & is_split)
+        else:
+            missing_go_to_left.append(np.zeros(tree.node_count, dtype=bool))
+
+    return {
+        "tree_roots": tree_roots,
+        "feature": np.concatenate(feature).astype(np.intp),
+        "threshold": np.concatenate(threshold).astype(np.float64),
+        "children_left": np.concatenate(children_left).astype(np.intp),
+        "children_right": np.concatenate(children_right).astype(np.intp),
+        "missing_go_to_left": np.concatenate(missing_go_to_left),
+        "leaf_value": np.concatenate(leaf_values).astype(np.float64),
+    }
+
+
+def compile_ensemble(model) -> CompiledEnsemble:
+    """
+    Flattens a fitted RandomForestClassifier, GradientBoostingClassifier,
+    AdaBoostClassifier (SAMME) or DecisionTreeClassifier into a CompiledEnsemble.
+    sklearn is only imported here, at export time.
+    """
+    try:
+        from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier, AdaBoostClassifier
+        from sklearn.tree import DecisionTreeClassifier
+
+        classes = np.asarray(model.classes_)
+        n_classes = len(classes)
+
+        if isinstance(model, (RandomForestClassifier, DecisionTreeClassifier)):
+            estimators = model.estimators_ if isinstance(model, RandomForestClassifier) else [model]
+            trees = [estimator.tree_ for estimator in estimators]
+            leaf_values = []
+            for tree in trees:
+                value = tree.value[:, 0, :]
+                totals = value.sum(axis=1, keepdims=True)
+                leaf_values.append(value / np.where(totals == 0, 1.0, totals) / len(trees))
+            arrays = _flatten_trees(trees, leaf_values)
+            return CompiledEnsemble(kind="forest", classes=classes, base_score=np.zeros(n_classes), **arrays)
+
+        if isinstance(model, GradientBoostingClassifier):
+            n_outputs = model.estimators_.shape[1]
+            trees, leaf_values = [], []
+            for stage in model.estimators_:
+                for k, estimator in enumerate(stage):
+                    value = np.zeros((estimator.tree_.node_count, n_outputs))
+                    value[:, k] = model.learning_rate * estimator.tree_.value[:, 0, 0]
+                    trees.append(estimator.tree_)
+                    leaf_values.append(value)
+            arrays = _flatten_trees(trees, leaf_values)
+            compiled = CompiledEnsemble(kind="boosting", classes=classes, base_score=np.zeros(n_outputs), **arrays)
+            # The init estimator contributes a constant raw score; recover it from one reference row
+            reference_row = np.zeros((1, model.n_features_in_))
+            raw_reference = np.asarray(model.decision_function(reference_row), dtype=np.float64).reshape(1, n_outputs)
+            compiled.base_score = (raw_reference - compiled.aggregate(reference_row))[0]
+            return compiled
+
+        if isinstance(model, AdaBoostClassifier):
+            if getattr(model, "algorithm", "SAMME") not in ("SAMME", "deprecated"):
+                raise ValueError(f"Only the SAMME AdaBoost algorithm can be compiled, got {model.algorithm}")
+            trees, leaf_values = [], []
+            for estimator, weight in zip(model.estimators_, model.estimator_weights_):
+                predicted = np.argmax(estimator.tree_.value[:, 0, :], axis=1)
+                value = np.full((estimator.tree_.node_count, n_classes), -weight / (n_classes - 1))
+                value[np.arange(len(predicted)), predicted] = weight
+                trees.append(estimator.tree_)
+                leaf_values.append(value)
+            arrays = _flatten_trees(trees, leaf_values)
+            return CompiledEnsemble(kind="vote", classes=classes, base_score=np.zeros(n_classes), **arrays)
+
+        raise TypeError(f"Cannot compile model of type {type(model).__name__}")
+    except Exception as e:
+        raise CustomException(e, sys) from e
@@ -5,6 +5,8 @@ import os , sys
 from networksecurity.logger.customlogger import Custom_Logger
 from networksecurity.exception.exception import CustomException
 
+hot_path_logger = Custom_Logger().get_hot_path_logger()
+
 class NetworkModel:
     def __init__(self, preprocessor , model):
         try:
@@ -18,13 +20,12 @@ class NetworkModel:
     
     def predict(self, X):
         try:
-            self.logger.info("Starting prediction process.")
             # Transform the input data using the preprocessor
             X_transformed = self.preprocessor.transform(X)
-            self.logger.info("Input data transformed successfully.")
             # Make predictions using the model
             predictions = self.model.predict(X_transformed)
-            self.logger.info("Predictions made successfully.")
+            # Runs once per scoring batch: one sampled line instead of three synchronous ones
+            hot_path_logger.info("Predictions made successfully.", extra={"rows": len(predictions)})
             return predictions
         except Exception as e:
             raise CustomException(e, sys)
\ No newline at end of file
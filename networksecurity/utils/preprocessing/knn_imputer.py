@@ -0,0 +1,131 @@
+import numpy as np
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.neighbors import KDTree
+
+# Missing-value patterns shared by at least this many rows get their own cached KDTree
+KDTREE_MIN_PATTERN_ROWS = 256
+# Upper bound on the (rows x reference rows) distance block computed at once
+BRUTE_FORCE_BLOCK_ELEMENTS = 1 << 22
+
+
+class SampledKNNImputer(TransformerMixin, BaseEstimator):
+    """
+    KNN imputer whose cost does not grow with the training set.
+
+    Donors come from a bounded random sample of complete training rows
+    (max_reference_rows). Rows without missing values are returned untouched
+    without any distance computation. Missing-value patterns shared by many
+    rows query a KDTree built over the observed columns of the reference
+    sample; the remaining rows are matched in blocks with BLAS partial
+    distances. Both rank donors on the observed columns only, which gives the
+    same neighbours as KNNImputer's nan_euclidean distance up to ties.
+    """
+
+    def __init__(self, missing_values=np.nan, n_neighbors: int = 3, weights: str = "uniform",
+                 max_reference_rows: int = 50_000, random_state: int = 42):
+        self.missing_values = missing_values
+        self.n_neighbors = n_neighbors
+        self.weights = weights
+        self.max_reference_rows = max_reference_rows
+        self.random_state = random_state
+
+    def _as_float_array(self, X) -> np.ndarray:
+        X = np.array(X, dtype=np.float64)
+        if not (isinstance(self.missing_values, float) and np.isnan(self.missing_values)):
+            X[X == self.missing_values] = np.nan
+        return X
+
+    def fit(self, X, y=None):
+        if hasattr(X, "columns"):
+            self.feature_names_in_ = np.asarray(X.columns, dtype=object)
+        X = self._as_float_array(X)
+        self.n_features_in_ = X.shape[1]
+
+        reference = X[~np.isnan(X).any(axis=1)]
+        if len(reference) > self.max_reference_rows:
+            rng = np.random.default_rng(self.random_state)
+            reference = reference[np.sort(rng.choice(len(reference), self.max_reference_rows, replace=False))]
+        self.reference_ = reference
+        # Used when there are no complete donor rows or a row has no observed features
+        self.column_means_ = np.nanmean(X, axis=0) if len(X) else np.full(X.shape[1], np.nan)
+        self._neighbor_indexes = {}
+        return self
+
+    def __getstate__(self):
+        # KDTrees are rebuilt lazily; keep saved imputers small
+        state = self.__dict__.copy()
+        state["_neighbor_indexes"] = {}
+        return state
+
+    def _neighbor_index(self, observed: np.ndarray) -> KDTree:
+        key = observed.tobytes()
+        if key not in self._neighbor_indexes:
+            self._neighbor_indexes[key] = KDTree(self.reference_[:, observed])
+        return self._neighbor_indexes[key]
+
+    def _donor_weights(self, distances: np.ndarray) -> np.ndarray:
+        if self.weights != "distance":
+            return np.ones_like(distances)
+        # Same convention as sklearn: exact matches take all the weight
+        with np.errstate(divide="ignore"):
+            weights = 1.0 / distances
+        exact_match = np.isinf(weights)
+        exact_rows = exact_match.any(axis=1)
+        weights[exact_rows] = exact_match[exact_rows]
+        return weights
+
+    def _impute_rows(self, X: np.ndarray, rows: np.ndarray, distances: np.ndarray, donors: np.ndarray) -> None:
+        weights = self._donor_weights(distances)
+        donor_values = self.reference_[donors]
+        imputed = (donor_values * weights[:, :, None]).sum(axis=1) / weights.sum(axis=1)[:, None]
+        X[rows] = np.where(np.isnan(X[rows]), imputed, X[rows])
+
+    def _brute_force_neighbors(self, X_rows: np.ndarray, n_neighbors: int):
+        missing = np.isnan(X_rows)
+        filled = np.where(missing, 0.0, X_rows)
+        observed = (~missing).astype(np.float64)
+        # sum over observed j of (x_j - r_j)^2, expanded so it runs as matrix products
+        squared = (filled ** 2).sum(axis=1)[:, None] - 2.0 * filled @ self.reference_.T \
+            + observed @ (self.reference_ ** 2).T
+        np.maximum(squared, 0.0, out=squared)
+        donors = np.argpartition(squared, n_neighbors - 1, axis=1)[:, :n_neighbors]
+        return np.sqrt(np.take_along_axis(squared, donors, axis=1)), donors
+
+    def transform(self, X) -> np.ndarray:
+        X = self._as_float_array(X)
+        missing = np.isnan(X)
+        rows_with_gaps = np.flatnonzero(missing.any(axis=1))
+        if rows_with_gaps.size == 0:
+            return X
+
+        n_neighbors = min(self.n_neighbors, len(self.reference_))
+        fully_missing = ~(~missing[rows_with_gaps]).any(axis=1)
+        if n_neighbors == 0 or fully_missing.any():
+            unmatched = rows_with_gaps if n_neighbors == 0 else rows_with_gaps[fully_missing]
+            X[unmatched] = np.where(np.isnan(X[unmatched]), self.column_means_, X[unmatched])
+            rows_with_gaps = np.setdiff1d(rows_with_gaps, unmatched)
+            if rows_with_gaps.size == 0:
+                return X
+
+        patterns, pattern_of_row, pattern_counts = np.unique(
+            missing[rows_with_gaps], axis=0, return_inverse=True, return_counts=True
+        )
+        pattern_of_row = pattern_of_row.ravel()
+        sporadic_rows = []
+        for pattern_index, pattern in enumerate(patterns):
+            rows = rows_with_gaps[pattern_of_row == pattern_index]
+            if pattern_counts[pattern_index] < KDTREE_MIN_PATTERN_ROWS:
+                sporadic_rows.append(rows)
+                continue
+            observed = ~pattern
+            distances, donors = self._neighbor_index(observed).query(X[np.ix_(rows, observed)], k=n_neighbors)
+            self._impute_rows(X, rows, distances, donors)
+
+        if sporadic_rows:
+            sporadic_rows = np.sort(np.concatenate(sporadic_rows))
+            block_size = max(1, BRUTE_FORCE_BLOCK_ELEMENTS // len(self.reference_))
+            for start in range(0, len(sporadic_rows), block_size):
+                rows = sporadic_rows[start:start + block_size]
+                distances, donors = self._brute_force_neighbors(X[rows], n_neighbors)
+                self._impute_rows(X, rows, distances, donors)
+        return X
@@ -0,0 +1,128 @@
+import sys
+
+import numpy as np
+import pandas as pd
+
+from networksecurity.exception.exception import CustomException
+from networksecurity.utils.ml_metric.drift_metric import HistogramSketch
+
+# Bucket values of HistogramSketch buckets 1..255 (bucket 0 holds nulls)
+_BUCKET_VALUES = np.arange(1, 256) - 128
+
+
+def _quantiles_from_counts(value_counts: np.ndarray, quantiles: tuple) -> list:
+    """Exact linearly interpolated quantiles (pandas' default) of the values behind a count vector."""
+    cumulative = np.cumsum(value_counts)
+    n_values = cumulative[-1]
+    if n_values == 0:
+        return [np.nan] * len(quantiles)
+    results = []
+    for q in quantiles:
+        position = (n_values - 1) * q
+        lower_rank = int(np.floor(position))
+        upper_rank = min(lower_rank + 1, n_values - 1)
+        lower = _BUCKET_VALUES[np.searchsorted(cumulative, lower_rank, side="right")]
+        upper = _BUCKET_VALUES[np.searchsorted(cumulative, upper_rank, side="right")]
+        results.append(float(lower + (position - lower_rank) * (upper - lower)))
+    return results
+
+
+class OutlierProfiler:
+    """
+    IQR outlier bounds and counts for every numeric column of a DataFrame.
+
+    int8 columns (the feature store format) are profiled from one HistogramSketch
+    pass: their quartiles and out-of-bounds counts are exact and read off the value
+    counts, with no per-column masking. Other numeric columns use nanquantile over
+    one matrix, on a random sample of sample_size rows when the input is larger.
+    The handling strategy is "none" (report only), "cap" or "remove"; both edit
+    the frame in place and never copy it.
+    """
+
+    def __init__(self, iqr_multiplier: float = 1.5, exclude_columns: tuple = (), sample_size: int = 100_000,
+                 strategy: str = "none", random_state: int = 42):
+        if strategy not in ("none", "cap", "remove"):
+            raise ValueError(f"Unknown outlier strategy '{strategy}', expected 'none', 'cap' or 'remove'")
+        self.iqr_multiplier = iqr_multiplier
+        self.exclude_columns = tuple(exclude_columns)
+        self.sample_size = sample_size
+        self.strategy = strategy
+        self.random_state = random_state
+
+    def _split_columns(self, df: pd.DataFrame) -> tuple:
+        numeric_columns = [column for column in df.select_dtypes(include="number").columns
+                           if column not in self.exclude_columns]
+        int8_columns = [column for column in numeric_columns if df[column].dtype == np.int8]
+        other_columns = [column for column in numeric_columns if df[column].dtype != np.int8]
+        return int8_columns, other_columns
+
+    def fit(self, df: pd.DataFrame) -> "OutlierProfiler":
+        try:
+            int8_columns, other_columns = self._split_columns(df)
+            self.bounds_ = {}
+            if int8_columns:
+                sketch = HistogramSketch.from_frame(df, columns=int8_columns)
+                for column, counts in zip(int8_columns, sketch.counts):
+                    q1, q3 = _quantiles_from_counts(counts[1:], (0.25, 0.75))
+                    self.bounds_[column] = (q1, q3)
+            if other_columns:
+                matrix = df[other_columns]
+                if len(matrix) > self.sample_size:
+                    rows = np.random.default_rng(self.random_state).choice(len(matrix), self.sample_size, replace=False)
+                    matrix = matrix.iloc[np.sort(rows)]
+                q1, q3 = np.nanquantile(matrix.to_numpy(dtype=np.float64), [0.25, 0.75], axis=0)
+                self.bounds_.update({column: (q1[index], q3[index]) for index, column in enumerate(other_columns)})
+            for column, (q1, q3) in self.bounds_.items():
+                iqr = q3 - q1
+                self.bounds_[column] = (float(q1 - self.iqr_multiplier * iqr), float(q3 + self.iqr_multiplier * iqr))
+            return self
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def count_outliers(self, df: pd.DataFrame) -> dict:
+        """Rows outside the fitted bounds, per column."""
+        try:
+            int8_columns, other_columns = self._split_columns(df)
+            int8_columns = [column for column in int8_columns if column in self.bounds_]
+            other_columns = [column for column in other_columns if column in self.bounds_]
+            outlier_counts = {}
+            if int8_columns:
+                sketch = HistogramSketch.from_frame(df, columns=int8_columns)
+                for column, counts in zip(int8_columns, sketch.counts):
+                    lower_bound, upper_bound = self.bounds_[column]
+                    outside = (_BUCKET_VALUES < lower_bound) | (_BUCKET_VALUES > upper_bound)
+                    outlier_counts[column] = int(counts[1:][outside].sum())
+            if other_columns:
+                matrix = df[other_columns].to_numpy(dtype=np.float64)
+                lower_bounds = np.array([self.bounds_[column][0] for column in other_columns])
+                upper_bounds = np.array([self.bounds_[column][1] for column in other_columns])
+                counts = ((matrix < lower_bounds) | (matrix > upper_bounds)).sum(axis=0)
+                outlier_counts.update({column: int(count) for column, count in zip(other_columns, counts)})
+            return {column: outlier_counts[column] for column in self.bounds_ if column in outlier_counts}
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def transform(self, df: pd.DataFrame, outlier_counts: dict = None) -> pd.DataFrame:
+        """Applies the strategy in place, touching only columns that have outliers, and returns df."""
+        try:
+            if self.strategy == "none":
+                return df
+            outlier_counts = outlier_counts if outlier_counts is not None else self.count_outliers(df)
+            columns = [column for column, count in outlier_counts.items() if count > 0]
+            if self.strategy == "cap":
+                for column in columns:
+                    lower_bound, upper_bound = self.bounds_[column]
+                    if df[column].dtype == np.int8:
+                        # No integer lies between a bound and its ceil/floor, so the column stays int8
+                        lower_bound, upper_bound = np.ceil(lower_bound), np.floor(upper_bound)
+                    df[column] = df[column].clip(lower_bound, upper_bound).astype(df[column].dtype)
+            elif columns:
+                is_outlier = np.zeros(len(df), dtype=bool)
+                for column in columns:
+                    lower_bound, upper_bound = self.bounds_[column]
+                    values = df[column].to_numpy()
+                    is_outlier |= (values < lower_bound) | (values > upper_bound)
+                df.drop(index=df.index[is_outlier], inplace=True)
+            return df
+        except Exception as e:
+            raise CustomException(e, sys) from e
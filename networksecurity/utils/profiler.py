@@ -0,0 +1,193 @@
+import os
+import sys
+import json
+import time
+import resource
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterator, Optional
+
+from networksecurity.exception.exception import CustomException
+from networksecurity.logger.customlogger import Custom_Logger
+
+_IO_FIELDS = ("rchar", "wchar", "read_bytes", "write_bytes")
+
+
+def _read_proc_io() -> Optional[dict]:
+    """Process I/O counters: rchar/wchar count every read/write call, read_bytes/write_bytes only storage I/O."""
+    try:
+        with open("/proc/self/io") as file:
+            counters = dict(line.split(":") for line in file.read().splitlines())
+        return {field: int(counters[field]) for field in _IO_FIELDS}
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _read_peak_rss_bytes() -> Optional[int]:
+    """VmHWM, the peak resident set size since the last _reset_peak_rss()."""
+    try:
+        with open("/proc/self/status") as file:
+            for line in file:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _reset_peak_rss() -> bool:
+    # Writing 5 to clear_refs resets VmHWM to the current RSS (Linux >= 4.0)
+    try:
+        with open("/proc/self/clear_refs", "w") as file:
+            file.write("5")
+        return True
+    except OSError:
+        return False
+
+
+class StageProfiler:
+    """
+    Per-stage performance instrumentation.
+
+    Each span() records wall time, CPU time of this process (all threads) and of
+    reaped child processes, peak RSS, rows and rows/sec, and the /proc/self/io
+    byte counters. Spans nest per thread and may be opened from several threads
+    at once (the DAG executor's workers); peak RSS is tracked by resetting the kernel's
+    high-water mark at every span boundary and folding each reading into all open
+    spans, so an outer stage's peak covers its inner spans. Where the reset is not
+    permitted, peak RSS falls back to the process lifetime peak (peak_rss_scope).
+    Worker processes (joblib/loky) are not part of RSS and only count towards
+    children_cpu_seconds once they exit. Model families fitted in one shared pool
+    have no span of their own; record_family() adds their totals to the report.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.spans = []
+        self.families = {}
+        self.logger = Custom_Logger().get_logger()
+        self._lock = threading.Lock()
+        self._open_spans = []
+        self._origin = time.perf_counter()
+        self._started_at = datetime.now().isoformat(timespec="seconds")
+        self._peak_resettable = enabled and _reset_peak_rss() and _read_peak_rss_bytes() is not None
+
+    def _fold_peak_rss(self) -> None:
+        """Folds the high-water mark since the last boundary into every open span, then resets it."""
+        if self._peak_resettable:
+            peak = _read_peak_rss_bytes()
+            for span in self._open_spans:
+                span["_peak_rss_bytes"] = max(span["_peak_rss_bytes"], peak)
+            _reset_peak_rss()
+
+    @contextmanager
+    def span(self, name: str, category: str = "stage", rows: int = None) -> Iterator[dict]:
+        """
+        Profiles the with-block. The yielded dict is the span record; set
+        record["rows"] (or any other key) inside the block to attach it.
+        """
+        record = {"name": name, "category": category, "rows": rows}
+        if not self.enabled:
+            yield record
+            return
+        with self._lock:
+            self._fold_peak_rss()
+            # Innermost open span of this thread; spans opened on pool threads nest under the outermost one
+            thread_id = threading.get_ident()
+            same_thread = [span for span in self._open_spans if span["_thread_id"] == thread_id]
+            parent = same_thread[-1] if same_thread else (self._open_spans[0] if self._open_spans else None)
+            record["parent"] = parent["name"] if parent is not None else None
+            record["_thread_id"] = thread_id
+            record["_peak_rss_bytes"] = 0
+            self._open_spans.append(record)
+        io_start = _read_proc_io()
+        times_start = os.times()
+        wall_start = time.perf_counter()
+        record["status"] = "failed"
+        try:
+            yield record
+            record["status"] = "ok"
+        finally:
+            wall_seconds = time.perf_counter() - wall_start
+            times_end = os.times()
+            io_end = _read_proc_io()
+            with self._lock:
+                self._fold_peak_rss()
+                self._open_spans.remove(record)
+            peak_rss_bytes = record.pop("_peak_rss_bytes")
+            record.pop("_thread_id")
+            if not self._peak_resettable:
+                peak_rss_bytes = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+            record.update({
+                "start_seconds": round(wall_start - self._origin, 6),
+                "wall_seconds": round(wall_seconds, 6),
+                "cpu_seconds": round((times_end.user - times_start.user) + (times_end.system - times_start.system), 6),
+                "children_cpu_seconds": round((times_end.children_user - times_start.children_user)
+                                              + (times_end.children_system - times_start.children_system), 6),
+                "peak_rss_mb": round(peak_rss_bytes / 2 ** 20, 2),
+                "peak_rss_scope": "span" if self._peak_resettable else "process",
+                "rows_per_second": round(record["rows"] / wall_seconds, 2) if record["rows"] and wall_seconds > 0 else None,
+                "thread": threading.current_thread().name,
+            })
+            if io_start is not None and io_end is not None:
+                record.update({field: io_end[field] - io_start[field] for field in _IO_FIELDS})
+            self.spans.append(record)
+            self.logger.info(f"⏱️ {category} '{name}': {record['wall_seconds']:.2f}s wall, "
+                             f"{record['cpu_seconds']:.2f}s CPU, peak RSS {record['peak_rss_mb']:.0f} MB")
+
+    def record_family(self, name: str, rows: int = None, **totals) -> None:
+        """Records one model family's search totals (fit seconds, fit count, best score, refit seconds)."""
+        if not self.enabled:
+            return
+        record = {"rows": rows, **totals}
+        with self._lock:
+            self.families[name] = record
+        self.logger.info(f"⏱️ model_family '{name}': {totals.get('n_fits', 0)} fits in "
+                         f"{totals.get('fit_seconds', 0.0):.2f}s, refit {totals.get('refit_seconds') or 0.0:.2f}s")
+
+    def report(self) -> dict:
+        return {
+            "started_at": self._started_at,
+            "pid": os.getpid(),
+            "total_wall_seconds": round(time.perf_counter() - self._origin, 6),
+            "process_peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 2),
+            "spans": sorted(self.spans, key=lambda span: span["start_seconds"]),
+            "families": self.families,
+        }
+
+    def save_report(self, file_path: str) -> None:
+        try:
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(file_path, "w") as file:
+                json.dump(self.report(), file, indent=2)
+            self.logger.info(f"Run report saved at {file_path}")
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def save_chrome_trace(self, file_path: str) -> None:
+        """Complete ("X") events in the Trace Event Format, viewable in chrome://tracing or Perfetto."""
+        try:
+            pid = os.getpid()
+            thread_ids = {}
+            events = []
+            for span in self.spans:
+                events.append({
+                    "name": span["name"],
+                    "cat": span["category"],
+                    "ph": "X",
+                    "ts": span["start_seconds"] * 1e6,
+                    "dur": span["wall_seconds"] * 1e6,
+                    "pid": pid,
+                    "tid": thread_ids.setdefault(span["thread"], len(thread_ids)),
+                    "args": {key: value for key, value in span.items()
+                             if key not in ("name", "category", "start_seconds", "wall_seconds", "thread")},
+                })
+            events.extend({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread}}
+                          for thread, tid in thread_ids.items())
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(file_path, "w") as file:
+                json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+            self.logger.info(f"Chrome trace saved at {file_path}")
+        except Exception as e:
+            raise CustomException(e, sys) from e
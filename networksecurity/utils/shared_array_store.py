@@ -0,0 +1,61 @@
+import os
+import sys
+import shutil
+import tempfile
+
+import numpy as np
+from sklearn.model_selection import StratifiedKFold
+
+from networksecurity.exception.exception import CustomException
+from networksecurity.logger.customlogger import Custom_Logger
+
+
+class SharedArrayStore:
+    """
+    Scratch directory of .npy files that are handed out as read-only memmaps.
+
+    joblib pickles an np.memmap as its file name and offset, so CV workers map
+    the same pages instead of receiving a copy of the array with every task, and
+    every model family reuses the same files. The directory lives under root_dir
+    (tmpfs such as /dev/shm when it exists) and is removed when the context exits.
+    """
+
+    def __init__(self, root_dir: str = None):
+        self.root_dir = root_dir if root_dir and os.path.isdir(root_dir) and os.access(root_dir, os.W_OK) else None
+        self.store_dir = None
+        self.logger = Custom_Logger().get_logger()
+
+    def __enter__(self) -> "SharedArrayStore":
+        try:
+            self.store_dir = tempfile.mkdtemp(prefix="networksecurity_", dir=self.root_dir)
+            return self
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        # Live memmaps stay valid after their files are unlinked
+        shutil.rmtree(self.store_dir, ignore_errors=True)
+        self.store_dir = None
+
+    def put(self, name: str, array) -> np.memmap:
+        """Writes array once and returns a C-contiguous read-only memmap of it."""
+        try:
+            file_path = os.path.join(self.store_dir, f"{name}.npy")
+            np.save(file_path, np.asarray(array))
+            shared_array = np.load(file_path, mmap_mode="r")
+            self.logger.info(f"Shared {name} {shared_array.shape} ({shared_array.nbytes / 1e6:.1f} MB) at {file_path}")
+            return shared_array
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+
+def precompute_folds(y, n_splits: int) -> list:
+    """
+    Stratified (train_index, test_index) pairs that GridSearchCV and cross_val_score
+    accept as cv=. Unshuffled StratifiedKFold, i.e. the same split as cv=n_splits.
+    """
+    try:
+        return [(np.asarray(train_index, dtype=np.intp), np.asarray(test_index, dtype=np.intp))
+                for train_index, test_index in StratifiedKFold(n_splits=n_splits).split(np.zeros(len(y)), y)]
+    except Exception as e:
+        raise CustomException(e, sys) from e
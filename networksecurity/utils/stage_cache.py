@@ -0,0 +1,197 @@
+import os
+import ast
+import sys
+import json
+import inspect
+import hashlib
+import importlib.util
+import dataclasses
+from typing import Callable, Optional
+
+from networksecurity.exception.exception import CustomException
+from networksecurity.logger.customlogger import Custom_Logger
+from networksecurity.utils.main_utils import json_default
+
+_HASH_CHUNK_BYTES = 1024 * 1024
+
+
+def hash_path(path: str) -> str:
+    """Content hash of a file, or of every file below a directory in sorted order."""
+    digest = hashlib.sha256()
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for file_name in sorted(files):
+                file_path = os.path.join(root, file_name)
+                digest.update(os.path.relpath(file_path, path).encode("utf-8"))
+                digest.update(hash_path(file_path).encode("utf-8"))
+        return digest.hexdigest()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(_HASH_CHUNK_BYTES), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _find_source(module_name: str) -> Optional[str]:
+    try:
+        spec = importlib.util.find_spec(module_name)
+    except (ImportError, ValueError):
+        # e.g. "package.module.function": the parent is not a package
+        return None
+    return spec.origin if spec is not None and spec.origin and spec.origin.endswith(".py") else None
+
+
+def _imported_modules(source_file: str, module_name: str, package: str) -> set:
+    """Names of the package modules a source file imports anywhere (function-level imports included)."""
+    with open(source_file, "r", encoding="utf-8") as file:
+        tree = ast.parse(file.read(), filename=source_file)
+    is_package = os.path.basename(source_file) == "__init__.py"
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ""
+            if node.level:
+                anchor = module_name if is_package else module_name.rpartition(".")[0]
+                base = importlib.util.resolve_name("." * node.level + base, anchor)
+            names.add(base)
+            # "from package.sub import name" may import the submodule package.sub.name
+            names.update(f"{base}.{alias.name}" for alias in node.names)
+    imported = set()
+    for name in names:
+        parts = name.split(".")
+        if parts[0] != package:
+            continue
+        # Importing a.b.c also runs a/__init__.py and a/b/__init__.py
+        imported.update(".".join(parts[:index]) for index in range(1, len(parts) + 1))
+    return imported
+
+
+def module_source_files(*objects, package: str = "networksecurity") -> list:
+    """
+    Source files of the modules defining objects (modules, classes or functions) and
+    of every package module they import, directly or indirectly, including the
+    __init__.py of each package on the way. Sorted, so the list is stable across runs.
+    """
+    try:
+        pending = [inspect.getmodule(obj).__name__ for obj in objects]
+        seen, source_files = set(), set()
+        while pending:
+            module_name = pending.pop()
+            if module_name in seen:
+                continue
+            seen.add(module_name)
+            source_file = _find_source(module_name)
+            if source_file is None:
+                continue
+            source_files.add(source_file)
+            pending.extend(_imported_modules(source_file, module_name, package) - seen)
+        return sorted(source_files)
+    except Exception as e:
+        raise CustomException(e, sys) from e
+
+
+def _artifact_from_dict(artifact_cls, data: dict):
+    kwargs = {}
+    for field in dataclasses.fields(artifact_cls):
+        value = data.get(field.name)
+        if dataclasses.is_dataclass(field.type) and isinstance(value, dict):
+            value = _artifact_from_dict(field.type, value)
+        kwargs[field.name] = value
+    return artifact_cls(**kwargs)
+
+
+def _artifact_output_paths(artifact) -> list:
+    """Files and '.arrays' directories an artifact points at through its *_file_path fields."""
+    paths = []
+    for field in dataclasses.fields(artifact):
+        value = getattr(artifact, field.name)
+        if field.name.endswith("_file_path") and isinstance(value, str):
+            paths.append(value)
+            if os.path.isdir(f"{value}.arrays"):
+                paths.append(f"{value}.arrays")
+    return paths
+
+
+class StageCache:
+    """
+    Content-addressed cache of pipeline stage results.
+
+    A stage fingerprint hashes its input data files, its config and the source
+    of the code that implements it. When a manifest with the same fingerprint
+    exists and every output it recorded is still on disk unchanged, the stage is
+    skipped and its artifact dataclass is rebuilt from the manifest.
+    """
+
+    def __init__(self, cache_dir: str, enabled: bool = True):
+        self.cache_dir = cache_dir
+        self.enabled = enabled
+        self.logger = Custom_Logger().get_logger()
+
+    def _manifest_path(self, stage_name: str) -> str:
+        return os.path.join(self.cache_dir, f"{stage_name}.json")
+
+    @staticmethod
+    def fingerprint(input_paths: list, config: dict, source_files: list) -> str:
+        digest = hashlib.sha256()
+        for path in input_paths:
+            digest.update(f"input:{os.path.basename(path)}:{hash_path(path)}\n".encode("utf-8"))
+            # Arrays that save_obj(mmap_arrays=True) wrote beside a pickle are part of its content
+            if os.path.isdir(f"{path}.arrays"):
+                digest.update(f"arrays:{hash_path(f'{path}.arrays')}\n".encode("utf-8"))
+        digest.update(json.dumps(config, sort_keys=True, default=json_default).encode("utf-8"))
+        for path in source_files:
+            digest.update(f"source:{os.path.basename(path)}:{hash_path(path)}\n".encode("utf-8"))
+        return digest.hexdigest()
+
+    @staticmethod
+    def _output_signature(path: str) -> list:
+        stat = os.stat(path)
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def load(self, stage_name: str, fingerprint: str, artifact_cls) -> Optional[object]:
+        manifest_path = self._manifest_path(stage_name)
+        if not os.path.exists(manifest_path):
+            return None
+        with open(manifest_path, "r") as file:
+            manifest = json.load(file)
+        if manifest.get("fingerprint") != fingerprint:
+            return None
+        for path, signature in manifest["outputs"].items():
+            if not os.path.exists(path) or self._output_signature(path) != signature:
+                self.logger.info(f"Stage cache for '{stage_name}' is stale: {path} changed.")
+                return None
+        return _artifact_from_dict(artifact_cls, manifest["artifact"])
+
+    def save(self, stage_name: str, fingerprint: str, artifact) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        manifest = {
+            "stage": stage_name,
+            "fingerprint": fingerprint,
+            "artifact": dataclasses.asdict(artifact),
+            "outputs": {path: self._output_signature(path) for path in _artifact_output_paths(artifact)
+                        if os.path.exists(path)},
+        }
+        # Write then rename so an interrupted run never leaves a half-written manifest
+        manifest_path = self._manifest_path(stage_name)
+        with open(f"{manifest_path}.tmp", "w") as file:
+            json.dump(manifest, file, indent=2, default=json_default)
+        os.replace(f"{manifest_path}.tmp", manifest_path)
+
+    def run(self, stage_name: str, run_stage: Callable[[], object], artifact_cls,
+            input_paths: list, config: dict, source_files: list):
+        """Returns the cached artifact for an unchanged stage, otherwise runs and records it."""
+        try:
+            if not self.enabled:
+                return run_stage()
+            fingerprint = self.fingerprint(input_paths, config, source_files)
+            artifact = self.load(stage_name, fingerprint, artifact_cls)
+            if artifact is not None:
+                self.logger.info(f"⏭️ Skipping '{stage_name}': inputs unchanged (fingerprint {fingerprint[:12]}).")
+                return artifact
+            artifact = run_stage()
+            self.save(stage_name, fingerprint, artifact)
+            return artifact
+        except Exception as e:
+            raise CustomException(e, sys) from e
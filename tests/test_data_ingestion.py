@@ -0,0 +1,67 @@
+import os
+import shutil
+from datetime import datetime, timedelta, timezone
+
+import mongomock
+import pandas as pd
+import pytest
+from bson import ObjectId
+
+from networksecurity.components.data_ingestion import DataIngestion
+from networksecurity.entity.config_entity import DataIngestionConfigEntity, TrainingPipelineConfigEntity
+from networksecurity.utils.main_utils import read_dataframe
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE_FILE_PATH = os.path.join(REPO_DIR, "Network_Data", "phisingData.csv")
+
+
+@pytest.fixture
+def rows():
+    return pd.read_csv(SOURCE_FILE_PATH).to_dict("records")
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    # Schema and artifact paths are relative to the working directory
+    shutil.copytree(os.path.join(REPO_DIR, "config"), tmp_path / "config")
+    monkeypatch.chdir(tmp_path)
+    config = DataIngestionConfigEntity(TrainingPipelineConfigEntity())
+    config.ingestion_source = "mongodb"
+    os.makedirs(config.data_ingestion_dir, exist_ok=True)
+    return config
+
+
+def object_id(seconds_ago: float) -> ObjectId:
+    """An ObjectId generated seconds_ago, as a writer that started its insert then would have."""
+    generation_time = datetime.now(timezone.utc) - timedelta(seconds=seconds_ago)
+    return ObjectId(ObjectId.from_datetime(generation_time).binary[:4] + ObjectId().binary[4:])
+
+
+def test_stream_mongodb_ingests_a_late_commit_below_the_watermark_once(config, rows):
+    client = mongomock.MongoClient()
+    collection = client[config.mongo_database_name][config.mongo_collection_name]
+    collection.insert_many([{"_id": object_id(10), **row} for row in rows[:100]])
+    ingestion = DataIngestion(config, mongo_client=client)
+
+    ingestion.stream_mongodb_into_feature_store()
+    # Committed after the first run read past it: its _id sorts below the watermark
+    collection.insert_one({"_id": object_id(60), **rows[100]})
+    ingestion.stream_mongodb_into_feature_store()
+    ingestion.stream_mongodb_into_feature_store()
+
+    assert len(read_dataframe(config.feature_store_file_path)) == 101
+
+
+def test_stream_mongodb_without_a_lag_skips_a_late_commit(config, rows):
+    config.mongo_watermark_lag_seconds = 0
+    client = mongomock.MongoClient()
+    collection = client[config.mongo_database_name][config.mongo_collection_name]
+    collection.insert_many([{"_id": object_id(10), **row} for row in rows[:100]])
+    ingestion = DataIngestion(config, mongo_client=client)
+
+    ingestion.stream_mongodb_into_feature_store()
+    collection.insert_one({"_id": object_id(60), **rows[100]})
+    collection.insert_one({"_id": object_id(0), **rows[101]})
+    ingestion.stream_mongodb_into_feature_store()
+
+    assert len(read_dataframe(config.feature_store_file_path)) == 101
@@ -0,0 +1,93 @@
+import os
+
+import mongomock
+import pytest
+from bson import ObjectId
+from pymongo.errors import BulkWriteError, ConnectionFailure
+
+from networksecurity.configuration.mongodb_connection import MongoDBConnection
+
+SOURCE_FILE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "Network_Data", "phisingData.csv")
+
+
+class FlakyCollection:
+    """
+    Wraps a collection so the first insert_many stores only its first landed documents and
+    then loses the connection, as a dropped connection mid-batch does against a real server.
+    """
+
+    def __init__(self, collection, landed: int):
+        self.collection = collection
+        self.landed = landed
+        self.attempts = 0
+
+    def insert_many(self, records, ordered=True):
+        self.attempts += 1
+        if self.attempts == 1:
+            # pymongo assigns every _id before sending the batch
+            for record in records:
+                record.setdefault("_id", ObjectId())
+            try:
+                self.collection.insert_many(records[:self.landed], ordered=False)
+            except BulkWriteError:
+                # Documents already in the collection; the rest of the landed slice is stored
+                pass
+            raise ConnectionFailure("connection reset by peer")
+        return self.collection.insert_many(records, ordered=ordered)
+
+
+@pytest.fixture
+def client():
+    return mongomock.MongoClient()
+
+
+def test_bulk_insert_csv_loads_every_row(client):
+    loader = MongoDBConnection(client=client, batch_size=1_000, max_workers=4)
+
+    load_artifact = loader.bulk_insert_csv(SOURCE_FILE_PATH, database="network_security", collection="NetworkData")
+
+    assert load_artifact.records_read == 11_055
+    assert load_artifact.inserted_count == 11_055
+    assert load_artifact.duplicate_count == 0
+    assert load_artifact.failed_count == 0
+    assert client["network_security"]["NetworkData"].count_documents({}) == 11_055
+
+
+def test_bulk_insert_counts_existing_ids_as_duplicates(client):
+    client["db"]["collection"].insert_many([{"_id": index, "value": index} for index in range(10)])
+    loader = MongoDBConnection(client=client, batch_size=7, max_workers=2)
+
+    load_artifact = loader.bulk_insert([[{"_id": index, "value": index} for index in range(start, start + 5)]
+                                        for start in range(0, 25, 5)], database="db", collection="collection")
+
+    assert load_artifact.records_read == 25
+    assert load_artifact.inserted_count == 15
+    assert load_artifact.duplicate_count == 10
+    assert load_artifact.failed_count == 0
+    assert client["db"]["collection"].count_documents({}) == 25
+
+
+def test_insert_batch_counts_documents_landed_before_a_connection_failure_as_inserted(client):
+    client["db"]["collection"].insert_one({"_id": "existing"})
+    collection = FlakyCollection(client["db"]["collection"], landed=4)
+    loader = MongoDBConnection(client=client, max_retries=2)
+    records = [{"_id": "existing"}] + [{"value": index} for index in range(9)]
+
+    inserted, duplicates, failed = loader._insert_batch(collection, records)
+
+    # The retry sees duplicate _ids for the 3 new documents that landed; only "existing" was there before
+    assert collection.attempts == 2
+    assert (inserted, duplicates, failed) == (9, 1, 0)
+    assert client["db"]["collection"].count_documents({}) == 10
+
+
+def test_bulk_insert_retries_after_a_connection_failure(client):
+    collection = FlakyCollection(client["db"]["collection"], landed=3)
+    loader = MongoDBConnection(client={"db": {"collection": collection}}, batch_size=10, max_workers=1)
+
+    load_artifact = loader.bulk_insert([[{"value": index} for index in range(10)]], database="db",
+                                       collection="collection")
+
+    assert (load_artifact.inserted_count, load_artifact.duplicate_count, load_artifact.failed_count) == (10, 0, 0)
+    assert client["db"]["collection"].count_documents({}) == 10